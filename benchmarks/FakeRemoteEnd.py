@@ -0,0 +1,789 @@
+import itertools
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.selenium_wrapper.wait import conditions
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+# Part of Condition's wrapper for conditions of child Elements
+_IN_PARENT_MARKER = "args[0][i][2] ? parent.shadowRoot"
+
+# The subset of the W3C WebDriver protocol the wrapper uses, named like selenium's Command constants
+_ROUTES = [
+    ("POST", r"/session", "newSession"),
+    ("DELETE", r"/session/{sid}", "quit"),
+    ("POST", r"/session/{sid}/timeouts", "setTimeouts"),
+    ("POST", r"/session/{sid}/url", "get"),
+    ("GET", r"/session/{sid}/url", "getCurrentUrl"),
+    ("GET", r"/session/{sid}/title", "getTitle"),
+    ("POST", r"/session/{sid}/refresh", "refresh"),
+    ("POST", r"/session/{sid}/back", "goBack"),
+    ("POST", r"/session/{sid}/forward", "goForward"),
+    ("GET", r"/session/{sid}/window", "w3cGetCurrentWindowHandle"),
+    ("POST", r"/session/{sid}/window", "switchToWindow"),
+    ("DELETE", r"/session/{sid}/window", "close"),
+    ("GET", r"/session/{sid}/window/handles", "w3cGetWindowHandles"),
+    ("POST", r"/session/{sid}/window/new", "newWindow"),
+    ("POST", r"/session/{sid}/window/maximize", "w3cMaximizeWindow"),
+    ("GET", r"/session/{sid}/window/rect", "getWindowRect"),
+    ("POST", r"/session/{sid}/window/rect", "setWindowRect"),
+    ("POST", r"/session/{sid}/frame", "switchToFrame"),
+    ("POST", r"/session/{sid}/frame/parent", "switchToParentFrame"),
+    ("POST", r"/session/{sid}/element", "findElement"),
+    ("POST", r"/session/{sid}/elements", "findElements"),
+    ("POST", r"/session/{sid}/element/{eid}/element", "findChildElement"),
+    ("POST", r"/session/{sid}/element/{eid}/elements", "findChildElements"),
+    ("POST", r"/session/{sid}/element/{eid}/click", "clickElement"),
+    ("POST", r"/session/{sid}/element/{eid}/clear", "clearElement"),
+    ("POST", r"/session/{sid}/element/{eid}/value", "sendKeysToElement"),
+    ("GET", r"/session/{sid}/element/{eid}/text", "getElementText"),
+    ("GET", r"/session/{sid}/element/{eid}/name", "getElementTagName"),
+    ("GET", r"/session/{sid}/element/{eid}/attribute/{name}", "getElementAttribute"),
+    ("GET", r"/session/{sid}/element/{eid}/property/{name}", "getElementProperty"),
+    ("GET", r"/session/{sid}/element/{eid}/css/{name}", "getElementValueOfCssProperty"),
+    ("GET", r"/session/{sid}/element/{eid}/enabled", "isElementEnabled"),
+    ("GET", r"/session/{sid}/element/{eid}/selected", "isElementSelected"),
+    ("GET", r"/session/{sid}/element/{eid}/rect", "getElementRect"),
+    ("POST", r"/session/{sid}/execute/sync", "w3cExecuteScript"),
+    ("POST", r"/session/{sid}/execute/async", "w3cExecuteScriptAsync"),
+    ("POST", r"/session/{sid}/actions", "actions"),
+    ("DELETE", r"/session/{sid}/actions", "clearActionState"),
+    ("GET", r"/session/{sid}/cookie", "getCookies"),
+    ("DELETE", r"/session/{sid}/cookie", "deleteAllCookies"),
+    ("GET", r"/session/{sid}/screenshot", "screenshot"),
+    ("GET", r"/session/{sid}/alert/text", "w3cGetAlertText"),
+    ("POST", r"/session/{sid}/alert/accept", "w3cAcceptAlert"),
+    ("POST", r"/session/{sid}/alert/dismiss", "w3cDismissAlert"),
+    ("GET", r"/session/{sid}/element/{eid}/screenshot", "elementScreenshot"),
+]
+_COMPILED_ROUTES = [
+    (method, re.compile("^" + pattern.replace("{sid}", "(?P<sid>[^/]+)").replace("{eid}", "(?P<eid>[^/]+)")
+                        .replace("{name}", "(?P<name>[^/]+)") + "$"), command)
+    for method, pattern, command in _ROUTES
+]
+
+# Compound CSS selectors (tag#id.class[attribute="value"]) and //tag[@attribute='value'] / //tag[text()='value'] XPaths
+_SIMPLE_SELECTOR = re.compile(
+    r"""^(?P<tag>[\w*-]+)?(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:="[^"]*"|='[^']*')?\])*)$""")
+_SELECTOR_PART = re.compile(
+    r"""#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)(?:=["'](?P<value>[^"']*)["'])?\]""")
+_SIMPLE_XPATH = re.compile(
+    r"""^//(?P<tag>[\w*-]+)(?:\[(?:@(?P<attr>[\w-]+)|(?P<text>text\(\)))=["'](?P<value>[^"']*)["']\])?$""")
+
+_ONE_PIXEL_PNG = ("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=")
+
+
+def node(tag: str, text: str = "", *children: dict, displayed: bool = True, enabled: bool = True,
+         selected: bool = False, **attributes) -> dict:
+    # Keyword arguments become attributes. Use class_ for the class attribute
+    attributes = {name.rstrip("_"): str(value) for name, value in attributes.items()}
+    return {"tag": tag, "text": text, "children": list(children), "attributes": attributes,
+            "displayed": displayed, "enabled": enabled, "selected": selected, "value": attributes.get("value", "")}
+
+
+class WebDriverError(Exception):
+
+    def __init__(self, status: int, error: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+
+
+class _Document:
+
+    def __init__(self, url: str, title: str, body: list, generation: int):
+        self.url = url
+        self.title = title
+        self.root = node("html", "", node("body", "", *_copy_nodes(body)))
+        self.generation = generation
+        self.scroll_position = 0
+        self.__ids = {}
+        self.__nodes = {}
+        self.__parents = {}
+        for parent, child in _walk(self.root, into_frames=True):
+            self.__parents[id(child)] = parent
+
+    def get_reference(self, element: dict) -> dict:
+        element_id = self.__ids.get(id(element))
+        if element_id is None:
+            element_id = f"{self.generation}-{len(self.__ids)}"
+            self.__ids[id(element)] = element_id
+            self.__nodes[element_id] = element
+        return {ELEMENT_KEY: element_id}
+
+    def get_node(self, element_id: str) -> dict:
+        element = self.__nodes.get(element_id)
+        if element is None:
+            raise WebDriverError(404, "stale element reference", f"Element {element_id} is not attached to the page")
+        return element
+
+    def is_displayed(self, element: dict) -> bool:
+        while element is not None:
+            if not element["displayed"]:
+                return False
+            element = self.__parents.get(id(element))
+        return True
+
+
+class _Session:
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.windows = {}
+        self.current_window: Optional["_Window"] = None
+
+
+class _Window:
+
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.history: list = []
+        self.position = -1
+        self.frame_path: list = []
+
+    @property
+    def document(self) -> Optional[_Document]:
+        return self.history[self.position] if self.position >= 0 else None
+
+
+# In-process stand-in for a browser driver speaking the W3C WebDriver protocol over HTTP. Pages are static node trees
+# registered up front. Scripts are not evaluated; the handful the wrapper and selenium send are recognized by their text
+class FakeRemoteEnd:
+
+    def __init__(self, latency: float = 0.0, command_latencies: Optional[dict] = None):
+        self.latency = latency
+        # Per-command overrides keyed by the command names of _ROUTES, e.g. {"findElement": 0.005}
+        self.command_latencies = dict(command_latencies or {})
+        self.__pages = {}
+        self.__lock = threading.Lock()
+        self.__counts = Counter()
+        self.__generations = itertools.count(1)
+        self.__handles = itertools.count(1)
+        self.__sessions = {}
+        # Session of the command being handled. Commands are handled one at a time under the lock
+        self.__session: Optional[_Session] = None
+        self.__server = None
+        self.__thread = None
+
+    # Lifecycle
+
+    def start(self) -> "FakeRemoteEnd":
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="fake-remote-end", daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def __enter__(self) -> "FakeRemoteEnd":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Content
+
+    def add_page(self, url: str, title: str, *body: dict):
+        self.__pages[url] = (title, body)
+
+    # Command counts
+
+    def get_counts(self) -> Counter:
+        with self.__lock:
+            return Counter(self.__counts)
+
+    def get_total_commands(self) -> int:
+        with self.__lock:
+            return sum(self.__counts.values())
+
+    def reset_counts(self):
+        with self.__lock:
+            self.__counts.clear()
+
+    # Protocol
+
+    def handle(self, method: str, path: str, body: dict) -> (int, object):
+        for route_method, pattern, command in _COMPILED_ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return 404, {"error": "unknown command", "message": f"{method} {path}", "stacktrace": ""}
+        time.sleep(self.command_latencies.get(command, self.latency))
+        with self.__lock:
+            self.__counts[command] += 1
+            try:
+                if command != "newSession":
+                    self.__session = self.__sessions.get(match.group("sid"))
+                    if self.__session is None:
+                        raise WebDriverError(404, "invalid session id", "Session is not active")
+                return 200, getattr(self, "_FakeRemoteEnd__" + command)(body, **match.groupdict())
+            except WebDriverError as error:
+                return error.status, {"error": error.error, "message": str(error), "stacktrace": ""}
+
+    # Sessions and navigation
+
+    def __newSession(self, body, **_):
+        self.__session = _Session(f"fake-session-{next(self.__handles)}")
+        self.__sessions[self.__session.session_id] = self.__session
+        self.__session.current_window = self.__open_window()
+        return {"sessionId": self.__session.session_id,
+                "capabilities": {"browserName": "fake", "browserVersion": "1.0", "platformName": "any",
+                                 "timeouts": {"implicit": 0, "pageLoad": 300000, "script": 30000}}}
+
+    def __quit(self, body, **_):
+        del self.__sessions[self.__session.session_id]
+        return None
+
+    def __setTimeouts(self, body, **_):
+        return None
+
+    def __get(self, body, **_):
+        window = self.__get_current_window()
+        del window.history[window.position + 1:]
+        window.history.append(self.__load(body["url"]))
+        window.position += 1
+        window.frame_path = []
+        return None
+
+    def __getCurrentUrl(self, body, **_):
+        document = self.__get_current_window().document
+        return document.url if document else "about:blank"
+
+    def __getTitle(self, body, **_):
+        document = self.__get_current_window().document
+        return document.title if document else ""
+
+    def __refresh(self, body, **_):
+        window = self.__get_current_window()
+        if window.document:
+            window.history[window.position] = self.__load(window.document.url)
+        window.frame_path = []
+        return None
+
+    def __goBack(self, body, **_):
+        return self.__traverse(-1)
+
+    def __goForward(self, body, **_):
+        return self.__traverse(1)
+
+    # Windows and frames
+
+    def __w3cGetCurrentWindowHandle(self, body, **_):
+        return self.__get_current_window().handle
+
+    def __switchToWindow(self, body, **_):
+        window = self.__session.windows.get(body["handle"])
+        if window is None:
+            raise WebDriverError(404, "no such window", f"No window with handle {body['handle']}")
+        self.__session.current_window = window
+        return None
+
+    def __close(self, body, **_):
+        del self.__session.windows[self.__get_current_window().handle]
+        self.__session.current_window = None
+        return list(self.__session.windows)
+
+    def __w3cGetWindowHandles(self, body, **_):
+        return list(self.__session.windows)
+
+    def __newWindow(self, body, **_):
+        return {"handle": self.__open_window().handle, "type": body.get("type", "tab")}
+
+    def __w3cMaximizeWindow(self, body, **_):
+        return {"x": 0, "y": 0, "width": 1920, "height": 1080}
+
+    def __getWindowRect(self, body, **_):
+        return {"x": 0, "y": 0, "width": 1920, "height": 1080}
+
+    def __setWindowRect(self, body, **_):
+        return {"x": body.get("x") or 0, "y": body.get("y") or 0,
+                "width": body.get("width") or 1920, "height": body.get("height") or 1080}
+
+    def __switchToFrame(self, body, **_):
+        window = self.__get_current_window()
+        frame = body.get("id")
+        if frame is None:
+            window.frame_path = []
+        elif isinstance(frame, dict):
+            window.frame_path.append(self.__get_document().get_node(frame[ELEMENT_KEY]))
+        else:
+            raise WebDriverError(404, "no such frame", f"Frames can only be switched to by element, not {frame!r}")
+        return None
+
+    def __switchToParentFrame(self, body, **_):
+        self.__get_current_window().frame_path[-1:] = []
+        return None
+
+    # Elements
+
+    def __findElement(self, body, **_):
+        return self.__find_one(self.__get_search_root(), body)
+
+    def __findElements(self, body, **_):
+        return self.__find_all(self.__get_search_root(), body)
+
+    def __findChildElement(self, body, eid, **_):
+        return self.__find_one(self.__get_document().get_node(eid), body)
+
+    def __findChildElements(self, body, eid, **_):
+        return self.__find_all(self.__get_document().get_node(eid), body)
+
+    def __clickElement(self, body, eid, **_):
+        element = self.__get_interactable(eid)
+        if element["tag"] == "input" and element["attributes"].get("type") in ("checkbox", "radio"):
+            element["selected"] = not element["selected"]
+        return None
+
+    def __clearElement(self, body, eid, **_):
+        self.__get_interactable(eid)["value"] = ""
+        return None
+
+    def __sendKeysToElement(self, body, eid, **_):
+        self.__get_interactable(eid)["value"] += body.get("text", "")
+        return None
+
+    def __getElementText(self, body, eid, **_):
+        document = self.__get_document()
+        element = document.get_node(eid)
+        return _text_of(element) if document.is_displayed(element) else ""
+
+    def __getElementTagName(self, body, eid, **_):
+        return self.__get_document().get_node(eid)["tag"]
+
+    def __getElementAttribute(self, body, eid, name, **_):
+        return _attribute_of(self.__get_document().get_node(eid), name)
+
+    def __getElementProperty(self, body, eid, name, **_):
+        element = self.__get_document().get_node(eid)
+        return element["value"] if name == "value" else element["attributes"].get(name)
+
+    def __getElementValueOfCssProperty(self, body, eid, name, **_):
+        element = self.__get_document().get_node(eid)
+        if name == "display":
+            return "block" if element["displayed"] else "none"
+        return element["attributes"].get(f"style-{name}", "")
+
+    def __isElementEnabled(self, body, eid, **_):
+        return self.__get_document().get_node(eid)["enabled"]
+
+    def __isElementSelected(self, body, eid, **_):
+        return self.__get_document().get_node(eid)["selected"]
+
+    def __getElementRect(self, body, eid, **_):
+        displayed = self.__get_document().is_displayed(self.__get_document().get_node(eid))
+        return {"x": 0, "y": 0, "width": 100 if displayed else 0, "height": 20 if displayed else 0}
+
+    # Scripts
+
+    def __w3cExecuteScript(self, body, **_):
+        return self.__run_script(body.get("script", ""), body.get("args", []))
+
+    def __w3cExecuteScriptAsync(self, body, **_):
+        return self.__run_script(body.get("script", ""), body.get("args", []))
+
+    def __run_script(self, script: str, args: list):
+        document = self.__get_document()
+
+        def resolve(value):
+            if isinstance(value, dict) and ELEMENT_KEY in value:
+                return document.get_node(value[ELEMENT_KEY])
+            if isinstance(value, list):
+                return [resolve(item) for item in value]
+            return value
+
+        args = [resolve(argument) for argument in args]
+        # Page.prefetch(): [element reference or None, visible] of every locator
+        if "/* prefetch */" in script:
+            results = []
+            for by, locator in args[0]:
+                matcher = _get_matcher(by, locator)
+                element = next((element for _, element in _walk(self.__get_search_root()) if matcher(element)), None)
+                results.append([document.get_reference(element) if element is not None else None,
+                                element is not None and document.is_displayed(element)])
+            return results
+        # RowStream: renders only the rows near the scroll position, like a virtualized list of 20 px rows in a 400 px
+        # viewport. The scroll position is kept by the document
+        if "/* stream rows */" in script:
+            container, by, locator, key_attribute, attributes, previous_keys, scroll, _, scroll_step = args[:9]
+            matcher = _get_matcher(by, locator)
+            rows = [element for _, element in _walk(container or self.__get_search_root()) if matcher(element)]
+            max_position = max(len(rows) * 20 - 400, 0)
+            if scroll:
+                document.scroll_position = min(document.scroll_position + (scroll_step or 320), max_position)
+            rendered = rows[max(document.scroll_position // 20 - 5, 0):(document.scroll_position + 400) // 20 + 5]
+            keys = [(_attribute_of(row, key_attribute) if key_attribute else None) or _text_of(row) for row in rendered]
+            return {"rows": [[key, _text_of(row), {name: _attribute_of(row, name) for name in attributes}]
+                             for key, row in zip(keys, rendered) if key not in previous_keys],
+                    "keys": keys, "position": document.scroll_position,
+                    "atEnd": document.scroll_position >= max_position}
+        # Page.take_snapshot(): every element in document order, block layout for everything but inline tags
+        if "/* snapshot */" in script:
+            root = document.root
+            indexes = {id(root): 0}
+            elements = [root] + [element for _, element in _walk(root)]
+            for index, element in enumerate(elements):
+                indexes[id(element)] = index
+            nodes = [[element["tag"], dict(element["attributes"]), document.is_displayed(element),
+                      0 if element["tag"] in ("a", "span", "input", "button", "label", "select", "textarea") else
+                      2 if element["tag"] == "td" else 1, [100, 20],
+                      element["value"] if element["tag"] in ("input", "textarea", "select") else None,
+                      (1 if element["selected"] else 0) | (0 if element["enabled"] else 4),
+                      ([element["text"]] if element["text"] else []) + [indexes[id(child)]
+                                                                        for child in element["children"]
+                                                                        if id(child) in indexes]]
+                     for element in elements]
+            return {"url": document.url, "title": document.title, "nodes": nodes}
+        # Page.fill_form(): sets the value (or checks) every field, reports a status per field
+        if "/* fill form */" in script:
+            statuses = []
+            for target, value in args[0]:
+                if isinstance(target, list):
+                    matcher = _get_matcher(*target)
+                    target = next((element for _, element in _walk(self.__get_search_root()) if matcher(element)),
+                                  None)
+                if target is None:
+                    statuses.append("keystrokes")
+                elif not target["enabled"]:
+                    statuses.append("disabled")
+                elif target["attributes"].get("type") in ("checkbox", "radio"):
+                    target["selected"] = bool(value)
+                    statuses.append("filled")
+                else:
+                    target["value"] = "" if value is None else str(value)
+                    statuses.append("filled")
+            return statuses
+        # In-browser wait conditions (BrowserWait's check and watch scripts). Pages don't change by themselves, so an
+        # unmet condition is reported after a short pause instead of after the watched slice
+        if "__CONDITION__" not in script and "return {value: (" in script:
+            return {"value": self.__evaluate_condition(script, args)}
+        if "__CONDITION__" not in script and "finish({met: true" in script:
+            value = self.__evaluate_condition(script, args)
+            if not value:
+                time.sleep(0.01)
+                return {"met": False}
+            return {"met": True, "value": value}
+        # Atoms selenium itself sends for is_displayed() and get_attribute()
+        if "/* isDisplayed */" in script:
+            return document.is_displayed(args[0])
+        if "/* getAttribute */" in script:
+            return _attribute_of(args[0], args[1])
+        # Bulk reads of ElementCollection
+        if "e.innerText" in script:
+            return [_text_of(element) if document.is_displayed(element) else "" for element in args[0]]
+        if "getAttribute(name)" in script:
+            return [_attribute_of(element, args[1]) for element in args[0]]
+        if "getBoundingClientRect" in script and isinstance(args[0], list):
+            return {"x": [0] * len(args[0]), "y": [20 * index for index in range(len(args[0]))],
+                    "width": [100] * len(args[0]), "height": [20] * len(args[0])}
+        if "getClientRects().length > 0" in script:
+            return [document.is_displayed(element) for element in args[0]]
+        if "window.open(" in script:
+            match = re.search(r"window\.open\('([^']*)'", script)
+            window = self.__open_window()
+            if match and match.group(1):
+                window.history.append(self.__load(match.group(1)))
+                window.position = 0
+            return None
+        if "window.location.origin" in script:
+            document = self.__get_current_window().document
+            return re.match(r"^\w+://[^/]+", document.url).group(0) if document else "null"
+        return None
+
+    def __evaluate_condition(self, script: str, args: list):
+        if "var conditions = " not in script:
+            return self.__evaluate_single_condition(script, args[0])
+        # Condition.compose_any() / compose_all(): the condition functions appear in the script in the order of args
+        found, position = [], 0
+        while True:
+            matches = [(script.find(condition, position), condition) for condition in self.__get_condition_scripts()]
+            matches = [match for match in matches if match[0] != -1]
+            if not matches:
+                break
+            start, condition = min(matches, key=lambda match: (match[0], -len(match[1])))
+            found.append((condition, _IN_PARENT_MARKER in script[position:start]))
+            position = start + len(condition)
+        results = []
+        for (condition, in_parent), condition_args in zip(found, args[0]):
+            if in_parent:
+                # Like find() in the browser, nothing is found when an ancestor is missing
+                root = self.__find_ancestor(condition_args[0]) or {"children": []}
+                results.append(self.__evaluate_single_condition(condition, condition_args[1], root))
+            else:
+                results.append(self.__evaluate_single_condition(condition, condition_args))
+        if "return {index: i}" in script:
+            return next(({"index": index} for index, result in enumerate(results) if result), None)
+        return {"index": -1} if all(results) else None
+
+    # Walks the [by, locator, in shadow root] chain of Condition._IN_PARENT. The fake has no shadow roots
+    def __find_ancestor(self, ancestors: list) -> Optional[dict]:
+        root = self.__get_search_root()
+        for by, locator, _ in ancestors:
+            matcher = _get_matcher(by, locator)
+            root = next((element for _, element in _walk(root) if matcher(element)), None)
+            if root is None:
+                return None
+        return root
+
+    @staticmethod
+    def __get_condition_scripts() -> list:
+        return [value for name, value in vars(conditions).items() if name.isupper() and isinstance(value, str)]
+
+    def __evaluate_single_condition(self, script: str, args: list, root: Optional[dict] = None):
+        document = self.__get_document()
+
+        def find_all():
+            matcher = _get_matcher(args[0], args[1])
+            return [element for _, element in _walk(root or self.__get_search_root()) if matcher(element)]
+
+        def find():
+            matches = find_all()
+            return matches[0] if matches else None
+
+        def reference(element):
+            return document.get_reference(element) if element is not None else None
+
+        def is_visible(element):
+            return element is not None and document.is_displayed(element)
+
+        evaluators = [
+            (conditions.PRESENCE_OF_ELEMENT, lambda: reference(find())),
+            (conditions.VISIBILITY_OF_ELEMENT, lambda: reference(find()) if is_visible(find()) else None),
+            (conditions.INVISIBILITY_OF_ELEMENT, lambda: not is_visible(find())),
+            (conditions.ABSENCE_OF_ELEMENT, lambda: find() is None),
+            (conditions.ELEMENT_TO_BE_CLICKABLE,
+             lambda: reference(find()) if is_visible(find()) and find()["enabled"] else None),
+            (conditions.ELEMENT_TO_BE_SELECTED, lambda: find() is not None and find()["selected"]),
+            (conditions.TEXT_IN_ELEMENT, lambda: find() is not None and args[2] in _text_of(find())),
+            (conditions.TEXT_IN_VALUE, lambda: find() is not None and args[2] in find()["value"]),
+            (conditions.ATTRIBUTE_IN_ELEMENT, lambda: find() is not None and args[2] in find()["attributes"]),
+            (conditions.TEXT_IN_ATTRIBUTE,
+             lambda: find() is not None and args[3] in find()["attributes"].get(args[2], chr(0))),
+            (conditions.PRESENCE_OF_ALL_ELEMENTS, lambda: [reference(element) for element in find_all()] or None),
+            (conditions.VISIBILITY_OF_ALL_ELEMENTS,
+             lambda: [reference(element) for element in find_all()]
+             if find_all() and all(map(is_visible, find_all())) else None),
+            (conditions.VISIBILITY_OF_ANY_ELEMENTS,
+             lambda: [reference(element) for element in find_all() if is_visible(element)] or None),
+            (conditions.TITLE_IS, lambda: document.title == args[0]),
+            (conditions.TITLE_CONTAINS, lambda: args[0] in document.title),
+            (conditions.URL_TO_BE, lambda: document.url == args[0]),
+            (conditions.URL_CHANGES, lambda: document.url != args[0]),
+            (conditions.URL_CONTAINS, lambda: args[0] in document.url),
+            (conditions.URL_MATCHES, lambda: re.search(args[0], document.url) is not None),
+        ]
+        for condition, evaluate in evaluators:
+            if condition in script:
+                return evaluate()
+        raise WebDriverError(500, "javascript error", "The fake remote end does not evaluate this condition")
+
+    # Actions and the rest
+
+    def __actions(self, body, **_):
+        for source in body.get("actions", []):
+            for action in source.get("actions", []):
+                origin = action.get("origin")
+                if isinstance(origin, dict) and ELEMENT_KEY in origin:
+                    self.__get_document().get_node(origin[ELEMENT_KEY])
+        return None
+
+    def __clearActionState(self, body, **_):
+        return None
+
+    def __getCookies(self, body, **_):
+        return []
+
+    def __deleteAllCookies(self, body, **_):
+        return None
+
+    def __screenshot(self, body, **_):
+        return _ONE_PIXEL_PNG
+
+    def __elementScreenshot(self, body, eid, **_):
+        self.__get_document().get_node(eid)
+        return _ONE_PIXEL_PNG
+
+    # Pages never open alerts
+    def __w3cGetAlertText(self, body, **_):
+        raise WebDriverError(404, "no such alert", "No alert is open")
+
+    def __w3cAcceptAlert(self, body, **_):
+        raise WebDriverError(404, "no such alert", "No alert is open")
+
+    def __w3cDismissAlert(self, body, **_):
+        raise WebDriverError(404, "no such alert", "No alert is open")
+
+    # Helpers
+
+    def __open_window(self) -> _Window:
+        window = _Window(f"window-{next(self.__handles)}")
+        self.__session.windows[window.handle] = window
+        return window
+
+    def __get_current_window(self) -> _Window:
+        if self.__session.current_window is None:
+            raise WebDriverError(404, "no such window", "The current window was closed")
+        return self.__session.current_window
+
+    def __get_document(self) -> _Document:
+        document = self.__get_current_window().document
+        if document is None:
+            raise WebDriverError(404, "no such element", "No page is open")
+        return document
+
+    def __get_search_root(self) -> dict:
+        window = self.__get_current_window()
+        return window.frame_path[-1] if window.frame_path else self.__get_document().root
+
+    def __get_interactable(self, element_id: str) -> dict:
+        document = self.__get_document()
+        element = document.get_node(element_id)
+        if not document.is_displayed(element) or not element["enabled"]:
+            raise WebDriverError(400, "element not interactable", "Element is not visible or disabled")
+        return element
+
+    def __load(self, url: str) -> _Document:
+        title, body = self.__pages.get(url, ("", ()))
+        return _Document(url, title, body, next(self.__generations))
+
+    def __traverse(self, step: int):
+        window = self.__get_current_window()
+        if 0 <= window.position + step < len(window.history):
+            window.position += step
+            window.history[window.position] = self.__load(window.document.url)
+        window.frame_path = []
+        return None
+
+    def __find_one(self, root: dict, body: dict) -> dict:
+        matches = self.__find_all(root, body)
+        if not matches:
+            raise WebDriverError(404, "no such element", f"No element matches {body['using']}: {body['value']}")
+        return matches[0]
+
+    def __find_all(self, root: dict, body: dict) -> list:
+        document = self.__get_document()
+        matcher = _get_matcher(body["using"], body["value"])
+        return [document.get_reference(element) for _, element in _walk(root) if matcher(element)]
+
+
+def _make_handler(remote_end: FakeRemoteEnd):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately. With Nagle's algorithm every response would wait for a delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.__respond("GET")
+
+        def do_POST(self):
+            self.__respond("POST")
+
+        def do_DELETE(self):
+            self.__respond("DELETE")
+
+        def __respond(self, method: str):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            status, value = remote_end.handle(method, self.path.rstrip("/") or "/", body)
+            payload = json.dumps({"value": value}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _copy_nodes(nodes) -> list:
+    return [dict(element, children=_copy_nodes(element["children"]), attributes=dict(element["attributes"]))
+            for element in nodes]
+
+
+def _walk(root: dict, into_frames: bool = False):
+    # Yields (parent, element) for every descendant of root in document order. Like in a browser, the content of a
+    # frame is only searched from the frame itself
+    stack = [(root, child) for child in reversed(root["children"])]
+    while stack:
+        parent, element = stack.pop()
+        yield parent, element
+        if into_frames or element["tag"] != "iframe":
+            stack.extend((element, child) for child in reversed(element["children"]))
+
+
+def _text_of(element: dict) -> str:
+    return " ".join(part for part in [element["text"]] + [_text_of(child) for child in element["children"]] if part)
+
+
+def _attribute_of(element: dict, name: str):
+    if name == "value":
+        return element["value"]
+    if name in ("checked", "selected"):
+        return "true" if element["selected"] else None
+    return element["attributes"].get(name)
+
+
+def _get_matcher(strategy: str, value: str):
+    if strategy == "css selector":
+        alternatives = [_compile_simple_selector(part.strip()) for part in value.split(",")]
+        return lambda element: any(matches(element) for matches in alternatives)
+    if strategy == "id":
+        return lambda element: element["attributes"].get("id") == value
+    if strategy == "name":
+        return lambda element: element["attributes"].get("name") == value
+    if strategy == "class name":
+        return lambda element: value in element["attributes"].get("class", "").split()
+    if strategy == "tag name":
+        return lambda element: element["tag"] == value
+    if strategy in ("link text", "partial link text"):
+        exact = strategy == "link text"
+        return lambda element: element["tag"] == "a" and (
+            _text_of(element) == value if exact else value in _text_of(element))
+    if strategy == "xpath":
+        match = _SIMPLE_XPATH.match(value)
+        if match is None:
+            raise WebDriverError(400, "invalid selector", f"Unsupported XPath: {value}")
+        tag, attribute, text, expected = match.group("tag", "attr", "text", "value")
+        return lambda element: (tag in ("*", element["tag"])
+                                and (attribute is None or element["attributes"].get(attribute) == expected)
+                                and (text is None or element["text"] == expected))
+    raise WebDriverError(400, "invalid argument", f"Unsupported locator strategy: {strategy}")
+
+
+def _compile_simple_selector(selector: str):
+    match = _SIMPLE_SELECTOR.match(selector)
+    if match is None:
+        raise WebDriverError(400, "invalid selector", f"Unsupported CSS selector: {selector}")
+    tag = match.group("tag")
+    checks = []
+    for part in _SELECTOR_PART.finditer(match.group("rest")):
+        if part.group("id"):
+            checks.append(lambda element, value=part.group("id"): element["attributes"].get("id") == value)
+        elif part.group("cls"):
+            checks.append(lambda element, value=part.group("cls"):
+                          value in element["attributes"].get("class", "").split())
+        elif part.group("value") is not None:
+            checks.append(lambda element, name=part.group("attr"), value=part.group("value"):
+                          element["attributes"].get(name) == value)
+        else:
+            checks.append(lambda element, name=part.group("attr"): name in element["attributes"])
+    return lambda element: tag in (None, "*", element["tag"]) and all(check(element) for check in checks)
@@ -0,0 +1,231 @@
+from selenium.webdriver import Keys
+from selenium.webdriver.common.by import By
+
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from benchmarks.FakeRemoteEnd import FakeRemoteEnd, node
+
+FORM_URL = "http://benchmark.local/form"
+TABLE_URL = "http://benchmark.local/table"
+FRAME_URL = "http://benchmark.local/frame"
+TABLE_ROWS = 500
+
+# name -> setup function. A setup function prepares the page and returns the operation to measure
+FLOWS = {}
+
+
+def flow(name: str):
+    def register(setup):
+        FLOWS[name] = setup
+        return setup
+    return register
+
+
+def add_pages(remote_end: FakeRemoteEnd):
+    remote_end.add_page(
+        FORM_URL, "Form",
+        node("form", "",
+             node("input", id="username", name="username", type="text"),
+             node("input", id="password", name="password", type="password"),
+             node("input", id="remember", name="remember", type="checkbox"),
+             node("button", "Sign in", id="submit", type="submit")),
+        node("div", "Welcome", id="message", class_="message"),
+        node("div", "Loading", id="spinner", displayed=False))
+    remote_end.add_page(
+        TABLE_URL, "Table",
+        node("table", "", *[node("tr", "", node("td", f"Row {index}", class_="cell"), class_="row")
+                             for index in range(TABLE_ROWS)]))
+    remote_end.add_page(
+        FRAME_URL, "Frame",
+        node("iframe", "",
+             node("textarea", id="editor", name="editor"),
+             node("button", "Save", id="save", type="button"),
+             id="editor-frame"))
+
+
+@flow("click")
+def click(page: Page):
+    page.open_page(FORM_URL)
+    button = Element.by_id("submit")
+    return button.click
+
+
+@flow("send_keys")
+def send_keys(page: Page):
+    page.open_page(FORM_URL)
+    field = Element.by_id("username")
+    return lambda: field.send_keys("user")
+
+
+@flow("get_text")
+def get_text(page: Page):
+    page.open_page(FORM_URL)
+    message = Element.by_css(".message")
+    return message.get_text
+
+
+@flow("wait_for_visibility")
+def wait_for_visibility(page: Page):
+    page.open_page(FORM_URL)
+    message = Element.by_id("message")
+    return message.wait_for_visibility
+
+
+@flow("wait_for_invisibility")
+def wait_for_invisibility(page: Page):
+    page.open_page(FORM_URL)
+    spinner = Element.by_id("spinner")
+    return spinner.wait_for_invisibility
+
+
+@flow("sign_in")
+def sign_in(page: Page):
+    username, password, submit = Element.by_id("username"), Element.by_id("password"), Element.by_id("submit")
+    message = Element.by_id("message")
+
+    def operation():
+        page.open_page(FORM_URL)
+        username.send_keys("user")
+        password.send_keys("secret")
+        submit.click()
+        message.wait_for_visibility().get_text()
+    return operation
+
+
+@flow("stale_element_recovery")
+def stale_element_recovery(page: Page):
+    page.open_page(FORM_URL)
+    button = Element.by_id("submit")
+
+    def operation():
+        page.refresh_page()
+        button.click()
+    return operation
+
+
+@flow(f"get_all_elements_{TABLE_ROWS}_texts")
+def get_all_elements_texts(page: Page):
+    page.open_page(TABLE_URL)
+    cells = Element.by_css("td.cell")
+    return lambda: [cell.get_text() for cell in cells.get_all_elements()]
+
+
+@flow(f"element_collection_{TABLE_ROWS}_texts")
+def element_collection_texts(page: Page):
+    page.open_page(TABLE_URL)
+    cells = Element.by_css("td.cell")
+    return lambda: cells.get_element_collection().texts()
+
+
+@flow("stream_500_rows")
+def stream_rows(page: Page):
+    page.open_page(TABLE_URL)
+    table = Element.by_tag_name("table")
+
+    def operation():
+        page.refresh_page()
+        rows = table.stream_rows(By.CSS_SELECTOR, "tr.row", settle_ms=0)
+        assert sum(1 for _ in rows) == TABLE_ROWS
+    return operation
+
+
+@flow("window_switching")
+def window_switching(page: Page):
+    page.open_page(FORM_URL)
+
+    def operation():
+        page.open_page_in_new_tab(TABLE_URL)
+        page.switch_to_last_window()
+        page.switch_to_first_window()
+        page.close_last_tab()
+    return operation
+
+
+@flow("frame_elements")
+def frame_elements(page: Page):
+    page.open_page(FRAME_URL)
+    frame = Element.by_id("editor-frame")
+    editor, save = Element.by_id("editor").in_frame(frame), Element.by_id("save").in_frame(frame)
+
+    def operation():
+        editor.send_keys("text")
+        save.click()
+        page.switch_to_default_content()
+        page.switch_to_default_content()
+    return operation
+
+
+@flow("child_lookups")
+def child_lookups(page: Page):
+    page.open_page(FORM_URL)
+    form = Element.by_tag_name("form")
+
+    def operation():
+        form.child(id="username").send_keys("user")
+        form.child(css="input[type='password']").send_keys("secret")
+        form.child(xpath="//button").click()
+    return operation
+
+
+@flow("queued_gesture")
+def queued_gesture(page: Page):
+    page.open_page(FORM_URL)
+    username, submit = Element.by_id("username"), Element.by_id("submit")
+
+    def operation():
+        username.key_down(Keys.SHIFT)
+        username.mouse_down()
+        username.move_to_element_with_offset(submit, 5, 5)
+        submit.mouse_up()
+        username.key_up(Keys.SHIFT)
+        username.perform()
+    return operation
+
+
+class SignInPage(Page):
+    username = Element.by_id("username")
+    password = Element.by_id("password")
+    submit = Element.by_id("submit")
+    message = Element.by_id("message")
+
+
+@flow("sign_in_prefetched")
+def sign_in_prefetched(_: Page):
+    page = SignInPage()
+
+    def operation():
+        page.open_page(FORM_URL)
+        page.username.send_keys("user")
+        page.password.send_keys("secret")
+        page.submit.click()
+        page.message.wait_for_visibility().get_text()
+    return operation
+
+
+class SignInFormPage(SignInPage):
+    remember = Element.by_id("remember")
+
+
+@flow("fill_form")
+def fill_form(_: Page):
+    page = SignInFormPage()
+    page.open_page(FORM_URL)
+
+    def operation():
+        page.fill_form({"username": "user", "password": "secret", "remember": True})
+    return operation
+
+
+@flow("snapshot_reads")
+def snapshot_reads(_: Page):
+    page = SignInFormPage()
+    page.open_page(FORM_URL)
+
+    def operation():
+        snapshot = page.take_snapshot()
+        snapshot.get(page.message).get_text()
+        snapshot.get(page.submit).get_text()
+        snapshot.get(page.username).get_attribute("type")
+        snapshot.get(page.remember).is_selected()
+        snapshot.find(By.CSS_SELECTOR, "#spinner").is_visible()
+    return operation
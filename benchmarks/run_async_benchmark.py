@@ -0,0 +1,94 @@
+# Compares the throughput of many concurrent sessions driven by threads (Page / WrappedElement, one thread per
+# session) and by one event loop (AsyncPage / AsyncWrappedElement, one task per session) against FakeRemoteEnd:
+#
+#   python -m benchmarks.run_async_benchmark --sessions 50 --latency-ms 20
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DEFAULT_TIME_OUT_SECONDS", "5")
+
+from selenium import webdriver
+
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.aio.AsyncElement import AsyncElement
+from src.selenium_wrapper.aio.AsyncPage import AsyncPage
+from src.selenium_wrapper.aio.AsyncWebDriverFactory import AsyncWebDriverFactory
+from src.selenium_wrapper.aio.AsyncWebDriverSingleton import AsyncWebDriverSingleton
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+from benchmarks.FakeRemoteEnd import FakeRemoteEnd
+from benchmarks.flows import FORM_URL, add_pages, sign_in
+
+
+def run_threaded(remote_end: FakeRemoteEnd, sessions: int, operations: int) -> float:
+    def run_session():
+        driver = webdriver.Remote(command_executor=remote_end.url, options=webdriver.ChromeOptions())
+        token = WebDriverSingleton.bind_driver(driver)
+        try:
+            operation = sign_in(Page())
+            for _ in range(operations):
+                operation()
+        finally:
+            WebDriverSingleton.unbind_driver(token)
+            driver.quit()
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        for future in [executor.submit(run_session) for _ in range(sessions)]:
+            future.result()
+    return time.perf_counter() - started_at
+
+
+def run_async(remote_end: FakeRemoteEnd, sessions: int, operations: int) -> float:
+    async def run_session():
+        AsyncWebDriverSingleton.bind_driver(await AsyncWebDriverFactory.connect(remote_end.url,
+                                                                                webdriver.ChromeOptions()))
+        page = AsyncPage()
+        username, password = AsyncElement.by_id("username"), AsyncElement.by_id("password")
+        submit, message = AsyncElement.by_id("submit"), AsyncElement.by_id("message")
+        try:
+            for _ in range(operations):
+                await page.open_page(FORM_URL)
+                await username.send_keys("user")
+                await password.send_keys("secret")
+                await submit.click()
+                await (await message.wait_for_visibility()).get_text()
+        finally:
+            await AsyncPage.close_browser()
+
+    async def run_sessions():
+        await asyncio.gather(*[run_session() for _ in range(sessions)])
+
+    started_at = time.perf_counter()
+    asyncio.run(run_sessions())
+    return time.perf_counter() - started_at
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Threaded vs asyncio throughput of concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=10, help="sign-in flows per session")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated latency of every WebDriver command")
+    arguments = parser.parse_args(argv)
+
+    total_operations = arguments.sessions * arguments.operations
+    with FakeRemoteEnd(latency=arguments.latency_ms / 1000) as remote_end:
+        add_pages(remote_end)
+        results = {}
+        for name, run in (("threads", run_threaded), ("asyncio", run_async)):
+            remote_end.reset_counts()
+            elapsed = run(remote_end, arguments.sessions, arguments.operations)
+            results[name] = (elapsed, remote_end.get_total_commands())
+    print(f"{arguments.sessions} sessions x {arguments.operations} sign-in flows, "
+          f"{arguments.latency_ms} ms per WebDriver command")
+    print(f"{'path':<10} {'seconds':>9} {'flows/s':>9} {'commands':>9}")
+    for name, (elapsed, commands) in results.items():
+        print(f"{name:<10} {elapsed:>9.2f} {total_operations / elapsed:>9.1f} {commands:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# Runs the wrapper flows against FakeRemoteEnd and compares WebDriver round trips per operation with baseline.json.
+# Needs no browser or network:
+#
+#   python -m benchmarks.run_benchmarks                      # fails with exit code 1 on a round trip regression
+#   python -m benchmarks.run_benchmarks --latency-ms 5       # simulate a slower remote end
+#   python -m benchmarks.run_benchmarks --update-baseline    # accept the current numbers
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("DEFAULT_TIME_OUT_SECONDS", "5")
+
+from selenium import webdriver
+
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.webdriver.CommandProfiler import instrument_command_executor
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+from benchmarks.FakeRemoteEnd import FakeRemoteEnd
+from benchmarks.flows import FLOWS, add_pages
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def run_flow(remote_end: FakeRemoteEnd, name: str, iterations: int) -> dict:
+    driver = webdriver.Remote(command_executor=remote_end.url, options=webdriver.ChromeOptions())
+    instrument_command_executor(driver)
+    WebDriverSingleton.driver = driver
+    try:
+        operation = FLOWS[name](Page())
+        # The first call locates elements that later calls reuse, so it is left out of the steady state numbers
+        operation()
+        remote_end.reset_counts()
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        elapsed = time.perf_counter() - started_at
+        counts = remote_end.get_counts()
+    finally:
+        WebDriverSingleton.close_driver()
+    return {
+        "round_trips_per_operation": sum(counts.values()) / iterations,
+        "milliseconds_per_operation": elapsed * 1000 / iterations,
+        "commands": {command: count / iterations for command, count in sorted(counts.items())},
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get("round_trips_per_operation")
+        if expected is not None and result["round_trips_per_operation"] > expected * (1 + tolerance) + 1e-9:
+            grown = {command: count for command, count in result["commands"].items()
+                     if count > baseline[name].get("commands", {}).get(command, 0) + 1e-9}
+            regressions.append((name, expected, result["round_trips_per_operation"], grown))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks of selenium_wrapper flows")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated latency of every WebDriver command")
+    parser.add_argument("--iterations", type=int, default=10, help="measured operations per flow")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="allowed relative increase of round trips per operation over the baseline")
+    parser.add_argument("--flow", action="append", choices=sorted(FLOWS), help="run only these flows")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to baseline.json")
+    parser.add_argument("--output", help="also write the full results as JSON to this file")
+    arguments = parser.parse_args(argv)
+
+    with open(BASELINE_FILE) as baseline_file:
+        baseline = json.load(baseline_file)
+    results = {}
+    with FakeRemoteEnd(latency=arguments.latency_ms / 1000) as remote_end:
+        add_pages(remote_end)
+        for name in arguments.flow or FLOWS:
+            results[name] = run_flow(remote_end, name, arguments.iterations)
+
+    print(f"{'flow':<32} {'trips/op':>9} {'baseline':>9} {'ms/op':>9}")
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get("round_trips_per_operation")
+        print(f"{name:<32} {result['round_trips_per_operation']:>9.2f} "
+              f"{'-' if expected is None else format(expected, '.2f'):>9} {result['milliseconds_per_operation']:>9.2f}")
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    if arguments.update_baseline:
+        baseline.update({name: {"round_trips_per_operation": result["round_trips_per_operation"],
+                                "commands": result["commands"]} for name, result in results.items()})
+        with open(BASELINE_FILE, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"Updated {BASELINE_FILE}")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, arguments.tolerance)
+    for name, expected, actual, grown in regressions:
+        print(f"REGRESSION {name}: {actual:.2f} round trips per operation, baseline {expected:.2f}. "
+              f"More calls of: {grown}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,6 @@ setup(
    description='Wrapper for Selenium Webdriver',
    author='Fedor Nesterovich',
    author_email='fnesterovich@mfsadmin.com',
-   packages=find_packages(),
+   packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
    install_requires=['selenium', 'webdriver-manager']
 )
@@ -1,177 +1,448 @@
-import logging
 import os
+import time
+from concurrent.futures import Future
 
-from selenium.webdriver import ActionChains
+from selenium.common import WebDriverException
 from selenium.webdriver.common.alert import Alert
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.element.DomSnapshot import DomSnapshot
+from src.selenium_wrapper.element.RowStream import RowStream
+from src.selenium_wrapper.element.WrappedElement import WrappedElement
+from src.selenium_wrapper.scripts import FILL_FORM_JS, LOCATOR_HELPERS_JS, SNAPSHOT_JS
+from src.selenium_wrapper.webdriver.ActionBatch import ActionBatch
+from src.selenium_wrapper.webdriver.DownloadManager import Download
+from src.selenium_wrapper.webdriver.ScreenshotPipeline import ScreenshotPipeline
+from src.selenium_wrapper.webdriver.WebDriverFactory import WebDriverFactory
 from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+from src.selenium_wrapper.wait import conditions
+from src.selenium_wrapper.wait.BrowserWait import BrowserWait
+from src.selenium_wrapper.wait.Condition import Condition
 
+_PREFETCH_SCRIPT = "/* prefetch */" + LOCATOR_HELPERS_JS + """
+return arguments[0].map(function (locator) {
+    var element = find(locator[0], locator[1]);
+    return [element, isVisible(element)];
+});
+"""
 
+
+@log.traced
 class Page:
     __DEFAULT_TIME_OUT_SECONDS = float(os.getenv("DEFAULT_TIME_OUT_SECONDS"))
-
-    def __init__(self):
-        self.__driver = WebDriverSingleton.get_driver()
+    # Page subclass -> {attribute name: WrappedElement} of the Elements declared as class attributes
+    __declared_elements: dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        declared_elements = {}
+        for klass in reversed(cls.__mro__):
+            declared_elements.update({name: value for name, value in vars(klass).items()
+                                      if isinstance(value, WrappedElement)})
+        Page.__declared_elements[cls] = declared_elements
+
+    # Resolved on every use so that a Page follows the driver bound to the current thread (see WebDriverPool)
+    @property
+    def __driver(self) -> WebDriver:
+        return WebDriverSingleton.get_driver()
 
     # Actions
     def open_page(self, url: str):
-        logging.info(f"Opening page with URL: {url}")
+        log.info("Opening page with URL: %s", url)
+        page_load_profile = WebDriverFactory.get_page_load_profile(self.__driver)
+        started_at = time.perf_counter()
         self.__driver.get(url)
-        self.__driver.maximize_window()
+        page_load_profile.record_navigation(self.__driver, url, time.perf_counter() - started_at)
+        WebDriverSingleton.remember_url(url)
+        WebDriverSingleton.get_context_tracker().on_navigation()
+        # Profiles with a fixed window size set it once, when the browser starts
+        if page_load_profile.maximizes_on_navigation():
+            self.__driver.maximize_window()
+        if self.get_declared_elements():
+            self.prefetch()
+
+    # Elements declared by the page object, as class attributes or in __init__
+    def get_declared_elements(self) -> dict:
+        declared_elements = dict(Page.__declared_elements.get(type(self), {}))
+        declared_elements.update({name: value for name, value in vars(self).items()
+                                  if isinstance(value, WrappedElement)})
+        return declared_elements
+
+    # Locates every declared Element in a single script call and hands the located WebElements to the Elements and the
+    # element cache. Returns the presence and visibility of each Element by attribute name
+    def prefetch(self) -> dict:
+        # Elements in a frame or inside another Element are located from there, on first use
+        declared_elements = {name: element for name, element in self.get_declared_elements().items()
+                             if not element.get_frame_chain() and element.get_parent() is None}
+        if not declared_elements:
+            return {}
+        WebDriverSingleton.get_context_tracker().enter_frames(())
+        results = self.__driver.execute_script(
+            _PREFETCH_SCRIPT, [list(element.get_by_and_locator()) for element in declared_elements.values()])
+        report = {}
+        cache_entries = []
+        for (name, element), (web_element, visible) in zip(declared_elements.items(), results):
+            if web_element is not None:
+                element.adopt_web_element(web_element)
+                cache_entries.append((*element.get_by_and_locator(), web_element))
+            report[name] = {"present": web_element is not None, "visible": bool(visible)}
+        WebDriverSingleton.get_element_cache().put_all(cache_entries)
+        log.info("Prefetched %s of %s declared Elements of %s", len(cache_entries), len(declared_elements),
+                 type(self).__name__)
+        return report
+
+    # Pulls the current document in a single script call. Read queries on the snapshot cost no round trips, until the
+    # next navigation or action makes it stale. See DomSnapshot
+    def take_snapshot(self) -> DomSnapshot:
+        context_tracker = WebDriverSingleton.get_context_tracker()
+        page_version = context_tracker.get_page_version()
+        snapshot = DomSnapshot(self.__driver.execute_script(SNAPSHOT_JS), context_tracker, page_version)
+        log.info("Took a snapshot of %s with %s Elements", snapshot.get_url(), snapshot.get_node_count())
+        return snapshot
+
+    # Forms
+
+    # Fills many fields in a single script call: text inputs and textareas get the value, selects the option(s) with
+    # the value or text, checkboxes and radio buttons are checked when the value is True. mapping is {declared Element
+    # name or Element: value}. Fields that need real key presses (file inputs, rich text editors, input masks, Elements
+    # in a frame, fields not rendered yet, the ones in type_fields) are typed into one by one. Returns the names of the
+    # filled and typed fields and the reason every other field failed
+    def fill_form(self, mapping: dict, type_fields: tuple = ()) -> dict:
+        fields = [(self.__get_field_label(field), self.__get_field_element(field), value)
+                  for field, value in mapping.items()]
+        typed_elements = [self.__get_field_element(field) for field in type_fields]
+        scripted = [index for index, (_, element, _) in enumerate(fields)
+                    if element not in typed_elements and not element.get_frame_chain()]
+        report = {"filled": [], "typed": [], "failed": {}}
+        statuses = {}
+        if scripted:
+            log.info("Filling %s fields in a single script call", len(scripted))
+            WebDriverSingleton.get_context_tracker().enter_frames(())
+            results = self.__driver.execute_script(
+                FILL_FORM_JS, [[Page.__get_field_target(fields[index][1]), fields[index][2]] for index in scripted])
+            statuses = dict(zip(scripted, results))
+            WebDriverSingleton.get_context_tracker().on_page_changed()
+        for index, (label, element, value) in enumerate(fields):
+            status = statuses.get(index, "keystrokes")
+            if status == "filled":
+                report["filled"].append(label)
+            elif status == "keystrokes":
+                Page.__type_into_field(label, element, value, report)
+            else:
+                report["failed"][label] = status
+        if report["failed"]:
+            log.warning("Filling the form failed for %s of %s fields: %s", len(report["failed"]), len(fields),
+                        report["failed"])
+        log.info("Filled %s fields by script and typed into %s", len(report["filled"]), len(report["typed"]))
+        return report
+
+    def __get_field_element(self, field) -> WrappedElement:
+        if isinstance(field, WrappedElement):
+            return field
+        declared_elements = self.get_declared_elements()
+        if field not in declared_elements:
+            raise RuntimeError(f"{type(self).__name__} declares no Element named '{field}'. "
+                               f"Declared Elements: {sorted(declared_elements)}")
+        return declared_elements[field]
+
+    @staticmethod
+    def __get_field_label(field) -> str:
+        if isinstance(field, WrappedElement):
+            by, locator = field.get_by_and_locator()
+            return f"{by}: '{locator}'"
+        return field
+
+    # Children are searched from their parent, so the script gets their WebElement instead of a locator
+    @staticmethod
+    def __get_field_target(element: WrappedElement):
+        if element.get_parent() is None:
+            return list(element.get_by_and_locator())
+        return element.get_web_element()
+
+    @staticmethod
+    def __type_into_field(label: str, element: WrappedElement, value, report: dict):
+        try:
+            if isinstance(value, bool):
+                if element.is_selected() != value:
+                    element.click()
+            else:
+                element.clear_text()
+                element.send_keys(str(value))
+            report["typed"].append(label)
+        except WebDriverException as error:
+            report["failed"][label] = f"{type(error).__name__}: {error.msg}" if error.msg else type(error).__name__
+
+    # Downloads
+
+    # Call before the action that starts the download, the new file that completes after it is the download.
+    # See DownloadManager
+    def expect_download(self, file_name_pattern: str = None) -> Download:
+        download_manager = WebDriverSingleton.get_download_manager()
+        log.info("Expecting a download%s in %s", f" matching {file_name_pattern}" if file_name_pattern else "",
+                 download_manager.get_directory())
+        return download_manager.expect(file_name_pattern)
 
     @staticmethod
     def close_browser():
-        logging.info(f"Closing browser")
+        if os.getenv("CLOSE_BROWSER_MODE", "quit").lower() == "reset":
+            Page.reset_browser()
+            return
+        log.info("Closing browser")
         WebDriverSingleton.close_driver()
 
+    @staticmethod
+    def reset_browser():
+        log.info("Resetting browser to a clean session")
+        WebDriverSingleton.reset_session()
+
     def refresh_page(self):
-        logging.info(f"Refreshing the current page with URL: {self.get_url()}")
+        log.info("Refreshing the current page with URL: %s", WebDriverSingleton.get_last_known_url())
         self.__driver.refresh()
+        WebDriverSingleton.get_context_tracker().on_navigation()
 
     def close_page(self):
-        logging.info(f"Closing the current page with URL: {self.get_url()}")
+        log.info("Closing the current page with URL: %s", WebDriverSingleton.get_last_known_url())
         self.__driver.close()
+        WebDriverSingleton.remember_url(None)
+        WebDriverSingleton.get_context_tracker().on_window_closed()
 
     def go_back(self):
-        logging.info("Going back to the previous page")
+        log.info("Going back to the previous page")
         self.__driver.back()
+        WebDriverSingleton.remember_url(None)
+        WebDriverSingleton.get_context_tracker().on_navigation()
 
     def go_forward(self):
-        logging.info("Going forward to the next page")
+        log.info("Going forward to the next page")
         self.__driver.forward()
+        WebDriverSingleton.remember_url(None)
+        WebDriverSingleton.get_context_tracker().on_navigation()
 
     def get_cookies(self) -> list[dict]:
-        logging.info("Getting cookies")
+        log.info("Getting cookies")
         return self.__driver.get_cookies()
 
     def clear_cookies(self):
-        logging.info("Clearing cookies")
+        log.info("Clearing cookies")
         self.__driver.delete_all_cookies()
 
-    def make_screenshot(self, file_path: str):
-        logging.info(f"Making screenshot of the page with URL: {self.get_url()}. Saving the screenshot to {file_path}")
-        return self.__driver.get_screenshot_as_file(file_path)
+    # Returns False when the screenshot could not be written, like WebDriver.get_screenshot_as_file()
+    def make_screenshot(self, file_path: str, full_page: bool = False, image_format: str = None,
+                        quality: int = None) -> bool:
+        try:
+            self.make_screenshot_async(file_path, full_page, image_format, quality).result()
+            return True
+        except OSError:
+            return False
+
+    # Returns once the screenshot is captured. It is written to file_path in the background (see ScreenshotPipeline),
+    # the returned Future resolves to the path when it is on disk
+    def make_screenshot_async(self, file_path: str, full_page: bool = False, image_format: str = None,
+                              quality: int = None) -> Future:
+        log.info("Making screenshot of the page with URL: %s. Saving the screenshot to %s",
+                 WebDriverSingleton.get_last_known_url(), file_path)
+        return ScreenshotPipeline.get_default().capture(self.__driver, file_path, full_page=full_page,
+                                                        image_format=image_format, quality=quality)
+
+    @staticmethod
+    def wait_for_screenshots(timeout: float = None):
+        log.info("Waiting for the screenshots to be written")
+        ScreenshotPipeline.get_default().flush(timeout)
 
     def make_screenshot_as_png(self):
-        logging.info(f"Making screenshot of the page with URL as PNG: {self.get_url()}")
+        log.info("Making screenshot of the page with URL as PNG: %s", WebDriverSingleton.get_last_known_url())
         return self.__driver.get_screenshot_as_png()
 
     def get_url(self):
-        logging.info("Getting the URL of the current page")
-        return self.__driver.current_url
+        url = self.__driver.current_url
+        WebDriverSingleton.remember_url(url)
+        log.info("Getting the URL of the current page. Returning %s", url)
+        return url
+
+    # Windows and frames are switched through the context tracker, which skips switching to where the driver already is
 
     def switch_to_last_window(self):
-        logging.info("Switching to the last window of the browser")
-        current_window = self.__driver.current_window_handle
-        all_windows: list = self.__driver.window_handles
-        if current_window == all_windows[0]:
-            self.__driver.switch_to.window(all_windows[len(all_windows) - 1])
+        log.info("Switching to the last window of the browser")
+        context_tracker = WebDriverSingleton.get_context_tracker()
+        all_windows: list = context_tracker.get_windows()
+        if context_tracker.get_current_window() == all_windows[0]:
+            if context_tracker.switch_to_window(all_windows[-1]):
+                WebDriverSingleton.remember_url(None)
 
     def switch_to_first_window(self):
-        logging.info("Switching to the first window of the browser")
-        all_windows: list = self.__driver.window_handles
-        if len(all_windows) > 1:
-            self.__driver.switch_to.window(all_windows[0])
+        log.info("Switching to the first window of the browser")
+        context_tracker = WebDriverSingleton.get_context_tracker()
+        all_windows: list = context_tracker.get_windows()
+        if len(all_windows) > 1 and context_tracker.switch_to_window(all_windows[0]):
+            WebDriverSingleton.remember_url(None)
+
+    def switch_to_default_content(self):
+        log.info("Switching to the default content of the current window")
+        WebDriverSingleton.get_context_tracker().switch_to_default_content()
+
+    def switch_to_parent_frame(self):
+        log.info("Switching to the parent frame")
+        WebDriverSingleton.get_context_tracker().switch_to_parent_frame()
 
     def execute_javascript(self, script, *args):
-        logging.info(f"Executing javascript: {script} with arguments: {args}")
-        return self.__driver.execute_script(script, *args)
+        log.info("Executing javascript: %s with arguments: %s", script, args)
+        result = self.__driver.execute_script(script, *args)
+        WebDriverSingleton.get_context_tracker().on_page_changed()
+        return result
 
     def scroll_page_to_top(self):
-        logging.info("Scrolling the current page to top")
+        log.info("Scrolling the current page to top")
         return self.execute_javascript("window.scrollTo(0, 0);")
 
     def scroll_page_to_bottom(self):
-        logging.info("Scrolling the current page to bottom")
+        log.info("Scrolling the current page to bottom")
         return self.execute_javascript("window.scrollTo(0, document.body.scrollHeight)")
 
+    # Rows of a long or infinitely scrolling list that scrolls with the page, yielded as they are rendered.
+    # See RowStream
+    def stream_rows(self, by, locator, key_attribute: str = None, attributes: tuple = (), **options) -> RowStream:
+        log.info("Streaming the rows located by %s: '%s' while scrolling the page", by, locator)
+        return RowStream(None, by, locator, key_attribute, attributes, **options)
+
     def scroll_by_offset(self, xoffset: int, yoffset: int):
-        self.__get_web_driver_actions().scroll_by_amount(xoffset, yoffset).perform()
-        logging.info(f"Scrolling the page by X offset: {xoffset}, Y offset: {yoffset}")
+        self.__get_action_batch().add("scroll_by_amount", xoffset, yoffset).perform()
+        log.info("Scrolling the page by X offset: %s, Y offset: %s", xoffset, yoffset)
+
+    # Input queued by the Elements (mouse_down, key_down, ...) and the Page is sent in a single perform actions command
+
+    def queue_action(self, action: str, *args):
+        log.info("Queueing the action: %s with arguments: %s", action, args)
+        self.__get_action_batch().add(action, *args)
+
+    def perform_actions(self):
+        log.info("Performing the queued actions")
+        self.__get_action_batch().perform()
+
+    def release_actions(self):
+        log.info("Releasing all keys and mouse buttons held down in the browser")
+        self.__get_action_batch().release()
+
+    # The steps sent by the last perform. Can be replayed with replay_gesture(), e.g. to repeat a drawing
+    def get_last_gesture(self) -> tuple:
+        return self.__get_action_batch().get_last_gesture()
+
+    def replay_gesture(self, gesture: tuple):
+        log.info("Replaying a gesture of %s actions", len(gesture))
+        self.__get_action_batch().replay(gesture)
 
     def open_page_in_new_tab(self, url: str):
-        logging.info(f"Opening page in new tab with URL: {url}")
-        return self.execute_javascript("window.open('{}');".format(url))
+        log.info("Opening page in new tab with URL: %s", url)
+        result = self.execute_javascript("window.open('{}');".format(url))
+        WebDriverSingleton.get_context_tracker().on_window_opened()
+        WebDriverSingleton.remember_origin(url)
+        return result
 
     def close_last_tab(self):
-        logging.info("Closing last tab of the browser")
-        all_windows: list = self.__driver.window_handles
+        log.info("Closing last tab of the browser")
+        context_tracker = WebDriverSingleton.get_context_tracker()
+        all_windows: list = context_tracker.get_windows()
         if len(all_windows) > 1:
-            self.__driver.switch_to.window(all_windows[len(all_windows) - 1])
+            context_tracker.switch_to_window(all_windows[-1])
             self.__driver.close()
-            self.__driver.switch_to.window(all_windows[len(all_windows) - 2])
+            context_tracker.on_window_closed(all_windows[-1])
+            context_tracker.switch_to_window(all_windows[-2])
+            WebDriverSingleton.remember_url(None)
 
     # Alerts
 
     def accept_alert(self):
-        logging.info("Accepting the alert")
+        log.info("Accepting the alert")
         Alert(self.__driver).accept()
+        WebDriverSingleton.get_context_tracker().on_page_changed()
 
     def dismiss_alert(self):
-        logging.info("Dismissing the alert")
+        log.info("Dismissing the alert")
         Alert(self.__driver).dismiss()
+        WebDriverSingleton.get_context_tracker().on_page_changed()
 
     def send_keys_to_alert(self, text: str):
-        logging.info("Sending keys to the alert")
+        log.info("Sending keys to the alert")
         Alert(self.__driver).send_keys(text)
 
     def get_alert_text(self):
         text = Alert(self.__driver).text
-        logging.info(f"Getting text from the Alert. Returning '{text}'")
+        log.info("Getting text from the Alert. Returning '%s'", text)
         return text
 
     # Waits
     def wait_for_number_of_windows_to_be(self, number_of_windows: int, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting for number of windows to be: {number_of_windows}. Timeout set to {timeout} seconds")
+        log.info("Waiting for number of windows to be: %s. Timeout set to %s seconds", number_of_windows, timeout)
         return self.__get_web_driver_wait(timeout).until(
             ec.number_of_windows_to_be(number_of_windows))
 
     def wait_until_title_contains_text(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting for the title of the current page to contain text: {text}. Timeout set to {timeout} "
-                     f"seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.title_contains(text))
+        log.info("Waiting for the title of the current page to contain text: %s. Timeout set to %s seconds",
+                 text, timeout)
+        return self.__wait_until(timeout, ec.title_contains(text), conditions.TITLE_CONTAINS, text)
 
     def wait_for_title_to_be(self, title: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting for the title of the current page to be: {title}. Timeout set to {timeout} seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.title_is(title))
+        log.info("Waiting for the title of the current page to be: %s. Timeout set to %s seconds", title, timeout)
+        return self.__wait_until(timeout, ec.title_is(title), conditions.TITLE_IS, title)
 
     def wait_until_url_changes(self, expected_url: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting until the URL of the current page changes to: {expected_url}. Timeout set to {timeout}"
-                     f" seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.url_changes(expected_url))
+        log.info("Waiting until the URL of the current page changes to: %s. Timeout set to %s seconds",
+                 expected_url, timeout)
+        return self.__wait_until(timeout, ec.url_changes(expected_url), conditions.URL_CHANGES, expected_url)
 
     def wait_until_url_contains(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting until the URL of the current page contains text: {text}. Timeout set to {timeout} "
-                     f"seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.url_contains(text))
+        log.info("Waiting until the URL of the current page contains text: %s. Timeout set to %s seconds",
+                 text, timeout)
+        return self.__wait_until(timeout, ec.url_contains(text), conditions.URL_CONTAINS, text)
 
     def wait_until_url_matches_pattern(self, pattern: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting until the URL of the current page matches the pattern: {pattern}. Timeout set to "
-                     f"{timeout} seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.url_matches(pattern))
+        log.info("Waiting until the URL of the current page matches the pattern: %s. Timeout set to %s seconds",
+                 pattern, timeout)
+        return self.__wait_until(timeout, ec.url_matches(pattern), conditions.URL_MATCHES, pattern)
 
     def wait_for_url_to_be(self, expected_url: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
-        logging.info(f"Waiting until the URL of the current page is: {expected_url}. Timeout set to {timeout} seconds")
-        return self.__get_web_driver_wait(timeout).until(
-            ec.url_to_be(expected_url))
+        log.info("Waiting until the URL of the current page is: %s. Timeout set to %s seconds", expected_url, timeout)
+        return self.__wait_until(timeout, ec.url_to_be(expected_url), conditions.URL_TO_BE, expected_url)
+
+    def wait_for_any(self, *conditions_list: Condition, timeout=__DEFAULT_TIME_OUT_SECONDS) -> Condition:
+        log.info("Waiting for any of the conditions: %s. Timeout set to %s seconds", list(conditions_list), timeout)
+        self.__enter_frames(*conditions_list)
+        script, args = Condition.compose_any(*conditions_list)
+        fired = BrowserWait(self.__driver, timeout).until(
+            script, *args, message=f"None of the conditions {list(conditions_list)} was met within {timeout} seconds")
+        log.info("Condition met: %s", conditions_list[fired['index']])
+        return conditions_list[fired["index"]]
+
+    def wait_for_all(self, *conditions_list: Condition, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting for all of the conditions: %s. Timeout set to %s seconds", list(conditions_list), timeout)
+        self.__enter_frames(*conditions_list)
+        script, args = Condition.compose_all(*conditions_list)
+        BrowserWait(self.__driver, timeout).until(
+            script, *args,
+            message=f"Not all of the conditions {list(conditions_list)} were met within {timeout} seconds")
+
+    @staticmethod
+    def __enter_frames(*conditions_list: Condition):
+        WebDriverSingleton.get_context_tracker().enter_frames(Condition.get_common_frame_chain(*conditions_list))
 
     # WebDriver related
     @staticmethod
     def __get_web_driver_wait(timeout=__DEFAULT_TIME_OUT_SECONDS) -> WebDriverWait:
         return WebDriverWait(WebDriverSingleton.get_driver(), timeout)
 
+    def __wait_until(self, timeout, condition, browser_condition: str, *browser_args):
+        if BrowserWait.is_enabled():
+            return BrowserWait(self.__driver, timeout).until(
+                browser_condition, *browser_args,
+                message=f"The current page did not meet the condition within {timeout} seconds")
+        return self.__get_web_driver_wait(timeout).until(condition)
+
     @staticmethod
     def _get_web_driver() -> WebDriver:
         return WebDriverSingleton.get_driver()
 
     @staticmethod
-    def __get_web_driver_actions() -> ActionChains:
-        return ActionChains(WebDriverSingleton.get_driver())
+    def __get_action_batch() -> ActionBatch:
+        return WebDriverSingleton.get_action_batch()
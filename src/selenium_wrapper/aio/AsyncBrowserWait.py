@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from selenium.common import JavascriptException, TimeoutException, WebDriverException
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.aio.AsyncWebDriver import AsyncWebDriver
+from src.selenium_wrapper.wait.BrowserWait import BrowserWait, CHECK_SCRIPT, WATCH_SCRIPT
+
+
+# Waits with the semantics of the synchronous wrapper: polls every half second like WebDriverWait, or watches the DOM
+# in the browser when WAIT_ENGINE=event. Conditions are the JavaScript ones of wait.conditions
+class AsyncBrowserWait:
+    __POLL_INTERVAL_SECONDS = 0.5
+
+    def __init__(self, driver: AsyncWebDriver, timeout: float):
+        self.__driver = driver
+        self.__timeout = timeout
+
+    async def until(self, condition: str, *args, message: str = ""):
+        deadline = time.monotonic() + self.__timeout
+        if BrowserWait.is_enabled():
+            return await self.__watch_until(condition, args, deadline, message)
+        return await self.until_true(lambda: self.__check(condition, args), message, deadline)
+
+    async def until_true(self, predicate, message: str = "", deadline: float = None):
+        deadline = deadline if deadline is not None else time.monotonic() + self.__timeout
+        while True:
+            value = await predicate()
+            if value:
+                return value
+            if time.monotonic() + AsyncBrowserWait.__POLL_INTERVAL_SECONDS > deadline:
+                raise TimeoutException(message)
+            await asyncio.sleep(AsyncBrowserWait.__POLL_INTERVAL_SECONDS)
+
+    async def __check(self, condition: str, args: tuple):
+        try:
+            outcome = await self.__driver.execute_script(CHECK_SCRIPT.replace("__CONDITION__", condition), list(args))
+        except WebDriverException as error:
+            if not BrowserWait.is_interrupted(error):
+                raise
+            log.debug("In-browser check was interrupted: %s", error.msg)
+            return None
+        if outcome and outcome.get("error"):
+            raise JavascriptException(outcome["error"])
+        return outcome and outcome.get("value")
+
+    async def __watch_until(self, condition: str, args: tuple, deadline: float, message: str):
+        while True:
+            slice_seconds = min(max(deadline - time.monotonic(), 0), BrowserWait.get_slice_seconds())
+            try:
+                outcome = await self.__driver.execute_async_script(
+                    WATCH_SCRIPT.replace("__CONDITION__", condition), list(args), int(slice_seconds * 1000))
+            except WebDriverException as error:
+                if not BrowserWait.is_interrupted(error):
+                    raise
+                log.debug("In-browser wait was interrupted: %s", error.msg)
+                outcome = None
+                await asyncio.sleep(AsyncBrowserWait.__POLL_INTERVAL_SECONDS / 10)
+            if outcome and outcome.get("met"):
+                return outcome["value"]
+            if outcome and outcome.get("error"):
+                raise JavascriptException(outcome["error"])
+            if time.monotonic() >= deadline:
+                raise TimeoutException(message)
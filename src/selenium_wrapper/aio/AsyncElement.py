@@ -0,0 +1,40 @@
+from selenium.webdriver.common.by import By
+
+from src.selenium_wrapper.aio.AsyncWrappedElement import AsyncWrappedElement
+
+
+class AsyncElement:
+
+    # Instantiation Strategies
+
+    @staticmethod
+    def by_xpath(xpath: str):
+        return AsyncWrappedElement(By.XPATH, xpath)
+
+    @staticmethod
+    def by_css(css: str):
+        return AsyncWrappedElement(By.CSS_SELECTOR, css)
+
+    @staticmethod
+    def by_class_name(class_name: str):
+        return AsyncWrappedElement(By.CLASS_NAME, class_name)
+
+    @staticmethod
+    def by_id(element_id: str):
+        return AsyncWrappedElement(By.ID, element_id)
+
+    @staticmethod
+    def by_name(name: str):
+        return AsyncWrappedElement(By.NAME, name)
+
+    @staticmethod
+    def by_link_text(link_text: str):
+        return AsyncWrappedElement(By.LINK_TEXT, link_text)
+
+    @staticmethod
+    def by_partial_link_text(partial_link_text: str):
+        return AsyncWrappedElement(By.PARTIAL_LINK_TEXT, partial_link_text)
+
+    @staticmethod
+    def by_tag_name(tag_name: str):
+        return AsyncWrappedElement(By.TAG_NAME, tag_name)
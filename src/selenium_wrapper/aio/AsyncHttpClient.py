@@ -0,0 +1,100 @@
+import asyncio
+import json
+import ssl
+from typing import Optional
+from urllib.parse import urlparse
+
+_IDEMPOTENT_METHODS = ("GET", "DELETE")
+
+
+# Minimal HTTP/1.1 JSON client on asyncio streams with a pool of keep-alive connections. WebDriver remote ends only
+# need GET/POST/DELETE with small JSON bodies, which keeps this free of third party dependencies
+class AsyncHttpClient:
+
+    def __init__(self, url: str, max_connections: int = 4, timeout: float = 120):
+        parsed_url = urlparse(url)
+        self.__host = parsed_url.hostname
+        self.__port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        self.__ssl = ssl.create_default_context() if parsed_url.scheme == "https" else None
+        self.__base_path = parsed_url.path.rstrip("/")
+        self.__timeout = timeout
+        self.__idle_connections = []
+        self.__connection_slots = asyncio.Semaphore(max_connections)
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None) -> (int, str):
+        payload = json.dumps(body).encode() if body is not None and method == "POST" else b""
+        request = (f"{method} {self.__base_path}{path} HTTP/1.1\r\n"
+                   f"Host: {self.__host}:{self.__port}\r\n"
+                   "Accept: application/json\r\n"
+                   "Content-Type: application/json;charset=UTF-8\r\n"
+                   "Connection: keep-alive\r\n"
+                   f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+        async with self.__connection_slots:
+            while self.__idle_connections:
+                connection = self.__idle_connections.pop()
+                if connection[0].at_eof():
+                    # The remote end closed the idle connection. Try the next one
+                    connection[1].close()
+                    continue
+                try:
+                    return await self.__send(connection, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The connection broke while the request was on its way. A POST (a click, a new session) may
+                    # have been executed already, so only requests that are safe to repeat are sent again
+                    if method not in _IDEMPOTENT_METHODS:
+                        raise
+                    continue
+            return await self.__send(await self.__connect(), request)
+
+    async def close(self):
+        while self.__idle_connections:
+            _, writer = self.__idle_connections.pop()
+            writer.close()
+
+    async def __connect(self):
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.__host, self.__port, ssl=self.__ssl), self.__timeout)
+
+    async def __send(self, connection, request: bytes) -> (int, str):
+        reader, writer = connection
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive, body = await asyncio.wait_for(self.__read_response(reader), self.__timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self.__idle_connections.append(connection)
+        else:
+            writer.close()
+        return status, body.decode("utf-8")
+
+    @staticmethod
+    async def __read_response(reader: asyncio.StreamReader) -> (int, bool, bytes):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the remote end")
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return int(status), keep_alive, body
@@ -0,0 +1,201 @@
+import os
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.aio.AsyncBrowserWait import AsyncBrowserWait
+from src.selenium_wrapper.aio.AsyncWebDriver import AsyncWebDriver
+from src.selenium_wrapper.aio.AsyncWebDriverSingleton import AsyncWebDriverSingleton
+from src.selenium_wrapper.wait import conditions
+from src.selenium_wrapper.webdriver.PageLoadProfile import PageLoadProfile
+
+
+# Async counterpart of Page. Works on the driver of the current asyncio task (see AsyncWebDriverSingleton)
+@log.traced
+class AsyncPage:
+    __DEFAULT_TIME_OUT_SECONDS = float(os.getenv("DEFAULT_TIME_OUT_SECONDS"))
+
+    # Actions
+    async def open_page(self, url: str):
+        log.info("Opening page with URL: %s", url)
+        driver = await self.__get_driver()
+        await driver.get(url)
+        # Profiles with a fixed window size set it once, through the options the browser starts with
+        if PageLoadProfile.get_configured().maximizes_on_navigation():
+            await driver.maximize_window()
+
+    @staticmethod
+    async def close_browser():
+        log.info("Closing browser")
+        await AsyncWebDriverSingleton.close_driver()
+
+    async def refresh_page(self):
+        log.info("Refreshing the current page")
+        await (await self.__get_driver()).refresh()
+
+    async def close_page(self):
+        log.info("Closing the current page")
+        await (await self.__get_driver()).close()
+
+    async def go_back(self):
+        log.info("Going back to the previous page")
+        await (await self.__get_driver()).back()
+
+    async def go_forward(self):
+        log.info("Going forward to the next page")
+        await (await self.__get_driver()).forward()
+
+    async def get_cookies(self) -> list[dict]:
+        log.info("Getting cookies")
+        return await (await self.__get_driver()).get_cookies()
+
+    async def clear_cookies(self):
+        log.info("Clearing cookies")
+        await (await self.__get_driver()).delete_all_cookies()
+
+    async def make_screenshot(self, file_path: str):
+        log.info("Making screenshot of the current page. Saving the screenshot to %s", file_path)
+        png = await self.make_screenshot_as_png()
+        with open(file_path, "wb") as screenshot_file:
+            screenshot_file.write(png)
+        return True
+
+    async def make_screenshot_as_png(self):
+        log.info("Making screenshot of the current page as PNG")
+        return await (await self.__get_driver()).get_screenshot_as_png()
+
+    async def get_url(self):
+        url = await (await self.__get_driver()).get_current_url()
+        log.info("Getting the URL of the current page. Returning %s", url)
+        return url
+
+    async def switch_to_last_window(self):
+        log.info("Switching to the last window of the browser")
+        driver = await self.__get_driver()
+        current_window = await driver.get_current_window_handle()
+        all_windows: list = await driver.get_window_handles()
+        if current_window == all_windows[0]:
+            await driver.switch_to_window(all_windows[len(all_windows) - 1])
+
+    async def switch_to_first_window(self):
+        log.info("Switching to the first window of the browser")
+        driver = await self.__get_driver()
+        all_windows: list = await driver.get_window_handles()
+        if len(all_windows) > 1:
+            await driver.switch_to_window(all_windows[0])
+
+    async def switch_to_default_content(self):
+        log.info("Switching to the default content of the current window")
+        await (await self.__get_driver()).switch_to_default_content()
+
+    async def switch_to_parent_frame(self):
+        log.info("Switching to the parent frame")
+        await (await self.__get_driver()).switch_to_parent_frame()
+
+    async def execute_javascript(self, script, *args):
+        log.info("Executing javascript: %s with arguments: %s", script, args)
+        return await (await self.__get_driver()).execute_script(script, *args)
+
+    async def scroll_page_to_top(self):
+        log.info("Scrolling the current page to top")
+        return await self.execute_javascript("window.scrollTo(0, 0);")
+
+    async def scroll_page_to_bottom(self):
+        log.info("Scrolling the current page to bottom")
+        return await self.execute_javascript("window.scrollTo(0, document.body.scrollHeight)")
+
+    async def scroll_by_offset(self, xoffset: int, yoffset: int):
+        driver = await self.__get_driver()
+        driver.queue_actions("wheel", {"type": "scroll", "duration": 0, "x": 0, "y": 0, "deltaX": xoffset,
+                                       "deltaY": yoffset, "origin": "viewport"})
+        await driver.perform_queued_actions()
+        log.info("Scrolling the page by X offset: %s, Y offset: %s", xoffset, yoffset)
+
+    # Input queued by the Elements (mouse_down, key_down, ...) is sent in a single perform actions command
+
+    async def perform_actions(self):
+        log.info("Performing the queued actions")
+        await (await self.__get_driver()).perform_queued_actions()
+
+    async def release_actions(self):
+        log.info("Releasing all keys and mouse buttons held down in the browser")
+        await (await self.__get_driver()).release_actions()
+
+    async def open_page_in_new_tab(self, url: str):
+        log.info("Opening page in new tab with URL: %s", url)
+        return await self.execute_javascript("window.open('{}');".format(url))
+
+    async def close_last_tab(self):
+        log.info("Closing last tab of the browser")
+        driver = await self.__get_driver()
+        all_windows: list = await driver.get_window_handles()
+        if len(all_windows) > 1:
+            await driver.switch_to_window(all_windows[len(all_windows) - 1])
+            await driver.close()
+            await driver.switch_to_window(all_windows[len(all_windows) - 2])
+
+    # Alerts
+
+    async def accept_alert(self):
+        log.info("Accepting the alert")
+        await (await self.__get_driver()).accept_alert()
+
+    async def dismiss_alert(self):
+        log.info("Dismissing the alert")
+        await (await self.__get_driver()).dismiss_alert()
+
+    async def send_keys_to_alert(self, text: str):
+        log.info("Sending keys to the alert")
+        await (await self.__get_driver()).send_keys_to_alert(text)
+
+    async def get_alert_text(self):
+        text = await (await self.__get_driver()).get_alert_text()
+        log.info("Getting text from the Alert. Returning '%s'", text)
+        return text
+
+    # Waits
+    async def wait_for_number_of_windows_to_be(self, number_of_windows: int, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting for number of windows to be: %s. Timeout set to %s seconds", number_of_windows, timeout)
+        driver = await self.__get_driver()
+
+        async def has_number_of_windows():
+            return len(await driver.get_window_handles()) == number_of_windows
+        return await AsyncBrowserWait(driver, timeout).until_true(
+            has_number_of_windows, f"The number of windows did not become {number_of_windows} within {timeout} seconds")
+
+    async def wait_until_title_contains_text(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting for the title of the current page to contain text: %s. Timeout set to %s seconds",
+                 text, timeout)
+        return await self.__wait_until(timeout, conditions.TITLE_CONTAINS, text)
+
+    async def wait_for_title_to_be(self, title: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting for the title of the current page to be: %s. Timeout set to %s seconds", title, timeout)
+        return await self.__wait_until(timeout, conditions.TITLE_IS, title)
+
+    async def wait_until_url_changes(self, expected_url: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting until the URL of the current page changes to: %s. Timeout set to %s seconds",
+                 expected_url, timeout)
+        return await self.__wait_until(timeout, conditions.URL_CHANGES, expected_url)
+
+    async def wait_until_url_contains(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting until the URL of the current page contains text: %s. Timeout set to %s seconds",
+                 text, timeout)
+        return await self.__wait_until(timeout, conditions.URL_CONTAINS, text)
+
+    async def wait_until_url_matches_pattern(self, pattern: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting until the URL of the current page matches the pattern: %s. Timeout set to %s seconds",
+                 pattern, timeout)
+        return await self.__wait_until(timeout, conditions.URL_MATCHES, pattern)
+
+    async def wait_for_url_to_be(self, expected_url: str, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        log.info("Waiting until the URL of the current page is: %s. Timeout set to %s seconds", expected_url, timeout)
+        return await self.__wait_until(timeout, conditions.URL_TO_BE, expected_url)
+
+    # WebDriver related
+
+    @staticmethod
+    async def __get_driver() -> AsyncWebDriver:
+        return await AsyncWebDriverSingleton.get_driver()
+
+    async def __wait_until(self, timeout, browser_condition: str, *browser_args):
+        return await AsyncBrowserWait(await self.__get_driver(), timeout).until(
+            browser_condition, *browser_args,
+            message=f"The current page did not meet the condition within {timeout} seconds")
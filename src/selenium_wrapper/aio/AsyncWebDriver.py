@@ -0,0 +1,287 @@
+import asyncio
+import base64
+import json
+import pkgutil
+from string import Template
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.utils import keys_to_typing
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.remote_connection import remote_commands
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.aio.AsyncHttpClient import AsyncHttpClient
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+_atoms = {}
+
+# The input sources ActionChains sends
+_INPUT_SOURCES = {
+    "pointer": {"type": "pointer", "id": "mouse", "parameters": {"pointerType": "mouse"}},
+    "key": {"type": "key", "id": "key"},
+    "wheel": {"type": "wheel", "id": "wheel"},
+}
+
+
+# Counterpart of selenium's WebDriver for one session, speaking the same W3C commands through AsyncHttpClient.
+# Results are unwrapped into AsyncWebElement objects and errors raised as the usual selenium exceptions
+class AsyncWebDriver:
+
+    def __init__(self, client: AsyncHttpClient, session_id: str, capabilities: dict, service=None):
+        self.__client = client
+        self.session_id = session_id
+        self.caps = capabilities
+        self.__service = service
+        self.__error_handler = ErrorHandler()
+        # (input source type, W3C action) queued until perform_queued_actions(), like ActionBatch does for WebDriver
+        self.__queued_actions: list = []
+
+    @staticmethod
+    async def start_session(url: str, capabilities: dict, service=None, max_connections: int = 4) \
+            -> "AsyncWebDriver":
+        client = AsyncHttpClient(url, max_connections)
+        driver = AsyncWebDriver(client, None, {}, service)
+        session = await driver.execute(Command.NEW_SESSION,
+                                       {"capabilities": {"firstMatch": [{}], "alwaysMatch": capabilities}})
+        driver.session_id = session["sessionId"]
+        driver.caps = session.get("capabilities", {})
+        return driver
+
+    async def execute(self, command: str, params: Optional[dict] = None):
+        params = dict(self.__wrap_value(params or {}))
+        if self.session_id:
+            params["sessionId"] = self.session_id
+        method, path_template = remote_commands[command]
+        path = Template(path_template).substitute(params)
+        for name in [name[1:] for name in path_template.split("/") if name.startswith("$")]:
+            params.pop(name, None)
+        params.pop("sessionId", None)
+        log.count_round_trip()
+        status, body = await self.__client.request(method, path, params)
+        response = {"status": status, "value": body} if status >= 400 else json.loads(body or "{}")
+        self.__error_handler.check_response(response)
+        return self.__unwrap_value(response.get("value"))
+
+    # Session
+
+    async def quit(self):
+        try:
+            await self.execute(Command.QUIT)
+        finally:
+            await self.__client.close()
+            if self.__service is not None:
+                await asyncio.to_thread(self.__service.stop)
+
+    # Navigation
+
+    async def get(self, url: str):
+        await self.execute(Command.GET, {"url": url})
+
+    async def refresh(self):
+        await self.execute(Command.REFRESH)
+
+    async def back(self):
+        await self.execute(Command.GO_BACK)
+
+    async def forward(self):
+        await self.execute(Command.GO_FORWARD)
+
+    async def get_title(self) -> str:
+        return await self.execute(Command.GET_TITLE)
+
+    async def get_current_url(self) -> str:
+        return await self.execute(Command.GET_CURRENT_URL)
+
+    # Windows and frames
+
+    async def get_current_window_handle(self) -> str:
+        return await self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)
+
+    async def get_window_handles(self) -> list:
+        return await self.execute(Command.W3C_GET_WINDOW_HANDLES)
+
+    async def switch_to_window(self, handle: str):
+        await self.execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+
+    async def switch_to_frame(self, frame: "AsyncWebElement"):
+        await self.execute(Command.SWITCH_TO_FRAME, {"id": frame})
+
+    async def switch_to_default_content(self):
+        await self.execute(Command.SWITCH_TO_FRAME, {"id": None})
+
+    async def switch_to_parent_frame(self):
+        await self.execute(Command.SWITCH_TO_PARENT_FRAME)
+
+    async def close(self):
+        await self.execute(Command.CLOSE)
+
+    async def maximize_window(self):
+        await self.execute(Command.W3C_MAXIMIZE_WINDOW)
+
+    async def set_window_size(self, width: int, height: int):
+        await self.execute(Command.SET_WINDOW_RECT, {"width": width, "height": height})
+
+    # Elements and scripts
+
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        return await self.execute(Command.FIND_ELEMENT, _to_w3c_locator(by, value))
+
+    async def find_elements(self, by: str, value: str) -> list["AsyncWebElement"]:
+        return await self.execute(Command.FIND_ELEMENTS, _to_w3c_locator(by, value))
+
+    async def execute_script(self, script: str, *args):
+        return await self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})
+
+    async def execute_async_script(self, script: str, *args):
+        return await self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": script, "args": list(args)})
+
+    async def perform_actions(self, actions: list):
+        await self.execute(Command.W3C_ACTIONS, {"actions": actions})
+
+    # Input sources are "pointer", "key" and "wheel". The queued actions of all sources are sent in one command, one
+    # tick per action: the other sources pause during it
+    def queue_actions(self, source_type: str, *actions: dict):
+        self.__queued_actions.extend((source_type, action) for action in actions)
+
+    async def perform_queued_actions(self):
+        queued_actions, self.__queued_actions = self.__queued_actions, []
+        if not queued_actions:
+            return
+        sources = {source_type: [] for source_type, _ in queued_actions}
+        for source_type, action in queued_actions:
+            for other_source_type, source_actions in sources.items():
+                source_actions.append(action if other_source_type == source_type else {"type": "pause", "duration": 0})
+        await self.perform_actions([_INPUT_SOURCES[source_type] | {"actions": source_actions}
+                                    for source_type, source_actions in sources.items()])
+
+    # Drops the queued actions and releases every key and button the browser still holds down
+    async def release_actions(self):
+        self.__queued_actions = []
+        await self.execute(Command.W3C_CLEAR_ACTIONS)
+
+    # Cookies, screenshots and alerts
+
+    async def get_cookies(self) -> list[dict]:
+        return await self.execute(Command.GET_ALL_COOKIES)
+
+    async def delete_all_cookies(self):
+        await self.execute(Command.DELETE_ALL_COOKIES)
+
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self.execute(Command.SCREENSHOT))
+
+    async def accept_alert(self):
+        await self.execute(Command.W3C_ACCEPT_ALERT)
+
+    async def dismiss_alert(self):
+        await self.execute(Command.W3C_DISMISS_ALERT)
+
+    async def get_alert_text(self) -> str:
+        return await self.execute(Command.W3C_GET_ALERT_TEXT)
+
+    async def send_keys_to_alert(self, text: str):
+        await self.execute(Command.W3C_SET_ALERT_VALUE, {"value": keys_to_typing(text), "text": text})
+
+    def __wrap_value(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, dict):
+            return {key: self.__wrap_value(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.__wrap_value(item) for item in value]
+        return value
+
+    def __unwrap_value(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self.__unwrap_value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.__unwrap_value(item) for item in value]
+        return value
+
+
+class AsyncWebElement:
+
+    def __init__(self, parent: AsyncWebDriver, element_id: str):
+        self.parent = parent
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    async def click(self):
+        await self.__execute(Command.CLICK_ELEMENT)
+
+    async def clear(self):
+        await self.__execute(Command.CLEAR_ELEMENT)
+
+    async def send_keys(self, *value):
+        typing = keys_to_typing(value)
+        await self.__execute(Command.SEND_KEYS_TO_ELEMENT, {"text": "".join(typing), "value": typing})
+
+    async def get_text(self) -> str:
+        return await self.__execute(Command.GET_ELEMENT_TEXT)
+
+    async def get_tag_name(self) -> str:
+        return await self.__execute(Command.GET_ELEMENT_TAG_NAME)
+
+    async def get_attribute(self, name: str):
+        # Same atom selenium's WebElement.get_attribute() runs, so attributes and properties resolve identically
+        return await self.parent.execute_script(
+            f"/* getAttribute */return ({_get_atom('getAttribute.js')}).apply(null, arguments);", self, name)
+
+    async def get_property(self, name: str):
+        return await self.__execute(Command.GET_ELEMENT_PROPERTY, {"name": name})
+
+    async def value_of_css_property(self, property_name: str) -> str:
+        return await self.__execute(Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, {"propertyName": property_name})
+
+    async def is_displayed(self) -> bool:
+        return await self.parent.execute_script(
+            f"/* isDisplayed */return ({_get_atom('isDisplayed.js')}).apply(null, arguments);", self)
+
+    async def is_enabled(self) -> bool:
+        return await self.__execute(Command.IS_ELEMENT_ENABLED)
+
+    async def is_selected(self) -> bool:
+        return await self.__execute(Command.IS_ELEMENT_SELECTED)
+
+    async def get_rect(self) -> dict:
+        return await self.__execute(Command.GET_ELEMENT_RECT)
+
+    async def get_size(self) -> dict:
+        rect = await self.get_rect()
+        return {"height": rect["height"], "width": rect["width"]}
+
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        return await self.__execute(Command.FIND_CHILD_ELEMENT, _to_w3c_locator(by, value))
+
+    async def find_elements(self, by: str, value: str) -> list["AsyncWebElement"]:
+        return await self.__execute(Command.FIND_CHILD_ELEMENTS, _to_w3c_locator(by, value))
+
+    async def __execute(self, command: str, params: Optional[dict] = None):
+        return await self.parent.execute(command, dict(params or {}, id=self.id))
+
+
+def _to_w3c_locator(by: str, value: str) -> dict:
+    # The same translation selenium's find_element() applies for strategies W3C dropped
+    if by == By.ID:
+        by, value = By.CSS_SELECTOR, f'[id="{value}"]'
+    elif by == By.CLASS_NAME:
+        by, value = By.CSS_SELECTOR, f".{value}"
+    elif by == By.NAME:
+        by, value = By.CSS_SELECTOR, f'[name="{value}"]'
+    return {"using": by, "value": value}
+
+
+def _get_atom(name: str) -> str:
+    if name not in _atoms:
+        _atoms[name] = pkgutil.get_data("selenium", f"webdriver/remote/{name}").decode("utf8")
+    return _atoms[name]
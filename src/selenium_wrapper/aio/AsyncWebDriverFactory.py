@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from selenium.common import SessionNotCreatedException
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.aio.AsyncWebDriver import AsyncWebDriver
+from src.selenium_wrapper.webdriver.WebDriverFactory import DriverBinaryCache, WebDriverFactory
+
+
+class AsyncWebDriverFactory:
+
+    @staticmethod
+    async def get_web_driver() -> AsyncWebDriver:
+        started_at = time.perf_counter()
+        browser, _, service_class, options = WebDriverFactory.get_browser_setup()
+        try:
+            driver = await AsyncWebDriverFactory.__start(browser, service_class, options)
+        except SessionNotCreatedException as error:
+            # Most likely the browser updated itself past the cached driver binary
+            if not DriverBinaryCache.invalidate(browser):
+                raise
+            log.warning("Starting %s with the cached driver failed: %s. Resolving the driver binary again",
+                        browser, error.msg)
+            driver = await AsyncWebDriverFactory.__start(browser, service_class, options)
+        log.info("Started %s in %.3f seconds", browser, time.perf_counter() - started_at)
+        return driver
+
+    @staticmethod
+    async def __start(browser: str, service_class: type, options) -> AsyncWebDriver:
+        service = service_class(await asyncio.to_thread(DriverBinaryCache.resolve, browser))
+        await asyncio.to_thread(service.start)
+        try:
+            return await AsyncWebDriver.start_session(service.service_url, options.to_capabilities(), service)
+        except BaseException:
+            await asyncio.to_thread(service.stop)
+            raise
+
+    # Opens a session on an already running remote end, e.g. a Selenium Grid or a driver started by hand
+    @staticmethod
+    async def connect(url: str, options=None, max_connections: int = 4) -> AsyncWebDriver:
+        capabilities = (options or WebDriverFactory.get_browser_setup()[3]).to_capabilities()
+        return await AsyncWebDriver.start_session(url, capabilities, max_connections=max_connections)
+
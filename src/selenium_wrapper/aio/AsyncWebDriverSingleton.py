@@ -0,0 +1,33 @@
+from contextvars import ContextVar, Token
+
+from src.selenium_wrapper.aio.AsyncWebDriver import AsyncWebDriver
+from src.selenium_wrapper.aio.AsyncWebDriverFactory import AsyncWebDriverFactory
+
+
+class AsyncWebDriverSingleton:
+    # One driver per asyncio task. Tasks run in a copy of the context they were created in, so a driver started or
+    # bound inside a task is invisible to the other tasks
+    __driver: ContextVar = ContextVar("async_driver", default=None)
+
+    @staticmethod
+    async def get_driver() -> AsyncWebDriver:
+        driver = AsyncWebDriverSingleton.__driver.get()
+        if driver is None:
+            driver = await AsyncWebDriverFactory.get_web_driver()
+            AsyncWebDriverSingleton.__driver.set(driver)
+        return driver
+
+    @staticmethod
+    def bind_driver(driver: AsyncWebDriver) -> Token:
+        return AsyncWebDriverSingleton.__driver.set(driver)
+
+    @staticmethod
+    def unbind_driver(token: Token):
+        AsyncWebDriverSingleton.__driver.reset(token)
+
+    @staticmethod
+    async def close_driver():
+        driver = AsyncWebDriverSingleton.__driver.get()
+        if driver is not None:
+            AsyncWebDriverSingleton.__driver.set(None)
+            await driver.quit()
@@ -0,0 +1,494 @@
+import os
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver import Keys
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.aio.AsyncBrowserWait import AsyncBrowserWait
+from src.selenium_wrapper.aio.AsyncWebDriver import AsyncWebDriver, AsyncWebElement, ELEMENT_KEY
+from src.selenium_wrapper.aio.AsyncWebDriverSingleton import AsyncWebDriverSingleton
+from src.selenium_wrapper.element.Locator import Locator
+from src.selenium_wrapper.generic import (get_control_or_command_for_current_os, get_max_backoff_seconds,
+                                          retry_until_deadline_async)
+from src.selenium_wrapper.wait import conditions
+
+_LEFT_BUTTON = 0
+_RIGHT_BUTTON = 2
+
+
+# Async counterpart of WrappedElement with the same method names and wait semantics. The located element is reused
+# until it goes stale, then located again once. Not mirrored: child and shadow root Elements, frames (use
+# switch_frame), the element cache, collections, row streams, screenshots and downloads
+@log.traced
+class AsyncWrappedElement:
+    __DEFAULT_TIME_OUT_SECONDS = float(os.getenv("DEFAULT_TIME_OUT_SECONDS"))
+    # What one click_until_* attempt may take on top of its retry interval: the click and the round trips of the wait
+    __CLICK_ATTEMPT_OVERHEAD_SECONDS = 0.5
+
+    def __init__(self, by, locator, web_element: AsyncWebElement = None):
+        self.__locator_spec = Locator.of(by, locator)
+        # The compiled form is used for lookups, waits and logs
+        self.__by, self.__locator = self.__locator_spec.get_compiled()
+        self.__web_element = web_element
+        # Elements handed over by get_all_elements() can't be re-located by the locator, so they are never refreshed
+        self.__is_pinned = web_element is not None
+
+    # Actions
+
+    async def click_no_wait(self):
+        await self.__call_on_web_element(lambda web_element: self.__perform_pointer_actions(
+            web_element, _press(_LEFT_BUTTON), _release(_LEFT_BUTTON)))
+        log.info("Clicking the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def click(self):
+        await (await self.wait_for_presence()).click_no_wait()
+
+    async def double_click(self):
+        await self.wait_for_presence()
+        await self.__call_on_web_element(lambda web_element: self.__perform_pointer_actions(
+            web_element, _press(_LEFT_BUTTON), _release(_LEFT_BUTTON), _press(_LEFT_BUTTON), _release(_LEFT_BUTTON)))
+        log.info("Double clicking the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def right_click(self):
+        await self.wait_for_presence()
+        await self.__call_on_web_element(lambda web_element: self.__perform_pointer_actions(
+            web_element, _press(_RIGHT_BUTTON), _release(_RIGHT_BUTTON)))
+        log.info("Right clicking the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def mouse_over(self):
+        await self.wait_for_presence()
+        await self.__call_on_web_element(lambda web_element: self.__perform_pointer_actions(web_element))
+        log.info("Hovering over the Element located by %s: '%s'", self.__by, self.__locator)
+
+    # Queued input. mouse_down, mouse_up, key_down, key_up and the mouse moves are sent with everything queued before
+    # them on any Element of the driver, by perform() or by the next immediate action. Elements are located when the
+    # action is queued
+
+    async def mouse_down(self):
+        await self.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _press(_LEFT_BUTTON))
+        log.info("Clicking and holding LMB on the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def mouse_up(self):
+        await self.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _release(_LEFT_BUTTON))
+        log.info("Releasing LMB from the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def drag_and_drop_to_element(self, element: "AsyncWrappedElement"):
+        await self.wait_for_presence()
+        await element.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _press(_LEFT_BUTTON),
+                             _move_to(element.__web_element), _release(_LEFT_BUTTON))
+        await driver.perform_queued_actions()
+        log.info("Dragging the Element located by %s: '%s' onto the Element located by %s: '%s'",
+                 self.__by, self.__locator, element.__by, element.__locator)
+
+    async def drag_and_drop_by_offset(self, xoffset: int, yoffset: int):
+        await self.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _press(_LEFT_BUTTON),
+                             _move_by(xoffset, yoffset), _release(_LEFT_BUTTON))
+        await driver.perform_queued_actions()
+        log.info("Dragging the Element located by %s: '%s' by X offset: %s, Y offset: %s",
+                 self.__by, self.__locator, xoffset, yoffset)
+
+    # Like ActionChains.key_down(key, element), the Element is clicked first to focus it
+    async def key_down(self, key: Keys):
+        await self.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _press(_LEFT_BUTTON), _release(_LEFT_BUTTON))
+        driver.queue_actions("key", {"type": "keyDown", "value": str(key)})
+        log.info("Pressing and holding the key: '%s' on the Element located by %s: '%s'",
+                 key, self.__by, self.__locator)
+
+    async def key_up(self, key: Keys):
+        await self.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("pointer", _move_to(self.__web_element), _press(_LEFT_BUTTON), _release(_LEFT_BUTTON))
+        driver.queue_actions("key", {"type": "keyUp", "value": str(key)})
+        log.info("Releasing the key: '%s' from the Element located by %s: '%s'", key, self.__by, self.__locator)
+
+    async def perform(self):
+        await (await self.__get_driver()).perform_queued_actions()
+        log.info("Performing the previously queued actions on the Element located by %s: '%s'",
+                 self.__by, self.__locator)
+
+    async def release_actions(self):
+        await (await self.__get_driver()).release_actions()
+        log.info("Releasing all keys and mouse buttons held down in the browser")
+
+    async def move_by_offset(self, xoffset: int, yoffset: int):
+        (await self.__get_driver()).queue_actions("pointer", _move_by(xoffset, yoffset))
+        log.info("Moving the mouse by X offset: %s, Y offset: %s", xoffset, yoffset)
+
+    async def move_to_element_with_offset(self, element: "AsyncWrappedElement", xoffset: int, yoffset: int):
+        await element.wait_for_presence()
+        (await self.__get_driver()).queue_actions("pointer", _move_to(element.__web_element, xoffset, yoffset))
+        log.info("Moving the mouse to the Element located by %s: '%s' with X offset: %s, Y offset: %s",
+                 element.__by, element.__locator, xoffset, yoffset)
+
+    async def scroll_by_offset(self, xoffset: int, yoffset: int):
+        driver = await self.__get_driver()
+        driver.queue_actions("wheel", _scroll(xoffset, yoffset, "viewport"))
+        await driver.perform_queued_actions()
+        log.info("Scrolling the page by X offset: %s, Y offset: %s", xoffset, yoffset)
+
+    async def scroll_to_element(self, element: "AsyncWrappedElement"):
+        await element.wait_for_presence()
+        driver = await self.__get_driver()
+        driver.queue_actions("wheel", _scroll(0, 0, {ELEMENT_KEY: element.__web_element.id}))
+        await driver.perform_queued_actions()
+        log.info("Scrolling the Page to the Element located by %s: '%s'", element.__by, element.__locator)
+
+    async def click_invisible_element(self):
+        script: str = ("var object = arguments[0];var theEvent = document.createEvent(\"MouseEvent\");"
+                       "theEvent.initMouseEvent(\"click\", true, true, window, 0, 0, 0, 0, 0, false, false, false, "
+                       "false, 0, null);object.dispatchEvent(theEvent);")
+        await self.__call_on_web_element(lambda web_element: self.execute_javascript(script, web_element))
+        log.info("Clicking the invisible Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def click_js_no_wait(self):
+        await self.__call_on_web_element(
+            lambda web_element: self.execute_javascript("arguments[0].click();", web_element))
+        log.info("JS clicking  the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def click_js(self):
+        await (await self.wait_for_presence()).click_js_no_wait()
+
+    async def clear_text(self):
+        await self.wait_for_presence()
+        await self.__call_on_web_element(lambda web_element: web_element.clear())
+        log.info("Clearing the text from the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def clear_field(self):
+        await self.wait_for_presence()
+        # One key sequence, like WrappedElement.clear_field(). NULL releases the modifier before the backspace
+        await self.send_keys(get_control_or_command_for_current_os() + 'a' + Keys.NULL + Keys.BACKSPACE)
+        log.info("Clearing the text from the Element located by %s: '%s'", self.__by, self.__locator)
+
+    async def send_keys(self, *text):
+        await self.wait_for_presence()
+        await self.__call_on_web_element(lambda web_element: web_element.send_keys(*text))
+        log.info("Typing text: '%s' into the Element located by %s: '%s'",
+                 log.LazyJoin(text), self.__by, self.__locator)
+
+    async def send_keys_no_wait(self, *text):
+        await self.__call_on_web_element(lambda web_element: web_element.send_keys(*text))
+        log.info("Typing text: '%s' into the Element located by %s: '%s'",
+                 log.LazyJoin(text), self.__by, self.__locator)
+
+    async def switch_frame(self):
+        driver = await self.__get_driver()
+        await self.__call_on_web_element(lambda web_element: driver.switch_to_frame(web_element))
+        log.info("Switching to the Frame located by %s: '%s'", self.__by, self.__locator)
+
+    async def execute_javascript(self, script, *args):
+        log.info("Executing javascript: %s with arguments: %s", script, args)
+        return await (await self.__get_driver()).execute_script(script, *args)
+
+    # Get data from element
+
+    async def get_attribute(self, attribute: str):
+        await self.wait_for_presence()
+        element_attribute = await self.__call_on_web_element(lambda web_element: web_element.get_attribute(attribute))
+        log.info("Getting attribute: '%s' from the Element located by %s: '%s'. Returning '%s'",
+                 attribute, self.__by, self.__locator, element_attribute)
+        return element_attribute
+
+    async def get_text(self):
+        await self.wait_for_presence()
+        element_text = await self.__call_on_web_element(lambda web_element: web_element.get_text())
+        log.info("Getting text from the Element located by %s: '%s'. Returning '%s'",
+                 self.__by, self.__locator, element_text)
+        return element_text
+
+    async def get_css_property(self, css_property: str):
+        await self.wait_for_presence()
+        element_css_property = await self.__call_on_web_element(
+            lambda web_element: web_element.value_of_css_property(css_property))
+        log.info("Getting CSS property: '%s' from the Element located by %s: '%s'. Returning '%s'",
+                 css_property, self.__by, self.__locator, element_css_property)
+        return element_css_property
+
+    async def get_class_name(self):
+        return await self.get_attribute("class")
+
+    async def get_id(self):
+        return await self.get_attribute("id")
+
+    async def get_value(self):
+        return await self.get_attribute("value")
+
+    async def get_size(self) -> dict:
+        await self.wait_for_presence()
+        element_size = await self.__call_on_web_element(lambda web_element: web_element.get_size())
+        log.info("Getting size from the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, element_size)
+        return element_size
+
+    async def get_height(self):
+        return (await self.get_size())["height"]
+
+    async def get_width(self):
+        return (await self.get_size())["width"]
+
+    # Check states
+
+    async def is_present(self) -> bool:
+        try:
+            await self.__locate_web_element()
+            log.info("Checking presence of the Element located by %s '%s'. Returning True", self.__by, self.__locator)
+            return True
+        except NoSuchElementException:
+            self.reset_cached_web_element()
+            log.info("Checking presence of the Element located by %s '%s'. Returning False", self.__by, self.__locator)
+            return False
+
+    async def is_visible(self) -> bool:
+        await self.wait_for_presence()
+        is_element_visible = await self.__call_on_web_element(lambda web_element: web_element.is_displayed())
+        log.info("Checking visibility of the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, is_element_visible)
+        return is_element_visible
+
+    async def is_clickable(self) -> bool:
+        await self.wait_for_presence()
+        is_element_clickable = await self.__call_on_web_element(lambda web_element: web_element.is_enabled())
+        log.info("Checking if the Element located by %s '%s' is clickable. Returning %s",
+                 self.__by, self.__locator, is_element_clickable)
+        return is_element_clickable
+
+    async def is_selected(self) -> bool:
+        await self.wait_for_presence()
+        is_element_selected = await self.__call_on_web_element(lambda web_element: web_element.is_selected())
+        log.info("Checking if the Element located by %s '%s' is selected. Returning %s",
+                 self.__by, self.__locator, is_element_selected)
+        return is_element_selected
+
+    # Multiple elements
+
+    async def get_all_elements(self) -> list["AsyncWrappedElement"]:
+        web_elements_list = await (await self.__get_driver()).find_elements(self.__by, self.__locator)
+        elements_list = [AsyncWrappedElement(self.__by, self.__locator, web_element)
+                         for web_element in web_elements_list]
+        log.info("Getting all elements located by %s '%s'. Returning a list of %s Elements",
+                 self.__by, self.__locator, len(elements_list))
+        return elements_list
+
+    # Waits
+
+    async def wait_for_presence(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.debug("Waiting for the Element located by %s: '%s' to be present. Timeout set to %s seconds",
+                  self.__by, self.__locator, timeout)
+        if self.__web_element is None:
+            self.__web_element = await self.__wait_until(timeout, conditions.PRESENCE_OF_ELEMENT)
+        return self
+
+    async def wait_for_attribute_in_element(self, attribute: str, timeout=__DEFAULT_TIME_OUT_SECONDS) \
+            -> "AsyncWrappedElement":
+        log.info("Waiting for the attribute '%s' to be included in the Element located by %s: '%s'. Timeout set to "
+                 "%s seconds", attribute, self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.ATTRIBUTE_IN_ELEMENT, attribute)
+        return self
+
+    async def wait_until_selected(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for the Element located by %s: '%s' to be selected. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.ELEMENT_TO_BE_SELECTED)
+        return self
+
+    async def wait_until_clickable(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for the Element located by %s: '%s' to be clickable. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__web_element = await self.__wait_until(timeout, conditions.ELEMENT_TO_BE_CLICKABLE)
+        return self
+
+    async def wait_for_visibility(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for the Element located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__web_element = await self.__wait_until(timeout, conditions.VISIBILITY_OF_ELEMENT)
+        return self
+
+    async def wait_for_invisibility(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for the Element located by %s: '%s' to be invisible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.INVISIBILITY_OF_ELEMENT)
+        return self
+
+    async def wait_for_absence(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for the Element located by %s: '%s' to be absent. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.ABSENCE_OF_ELEMENT)
+        self.reset_cached_web_element()
+        return self
+
+    async def wait_until_text_is_present_in_element(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS) \
+            -> "AsyncWrappedElement":
+        log.info("Waiting for text '%s' to be present in the Element located by %s: '%s'. Timeout set to %s seconds",
+                 text, self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.TEXT_IN_ELEMENT, text)
+        return self
+
+    async def wait_until_text_is_present_in_attribute(self, attribute: str, text: str,
+                                                      timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for text '%s' to be present in the attribute '%s' of the Element located by %s: '%s'. "
+                 "Timeout set to %s seconds", text, attribute, self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.TEXT_IN_ATTRIBUTE, attribute, text)
+        return self
+
+    async def wait_until_text_is_present_in_value(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS) \
+            -> "AsyncWrappedElement":
+        log.info("Waiting for text '%s' to be present in the value of the Element located by %s: '%s'. Timeout set "
+                 "to %s seconds", text, self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.TEXT_IN_VALUE, text)
+        return self
+
+    async def wait_for_visibility_of_all_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting all Elements located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.VISIBILITY_OF_ALL_ELEMENTS)
+        return self
+
+    async def wait_for_presence_of_all_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "AsyncWrappedElement":
+        log.info("Waiting for all Elements located by %s: '%s' to be present. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.PRESENCE_OF_ALL_ELEMENTS)
+        return self
+
+    async def wait_for_visibility_of_any_of_the_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) \
+            -> "AsyncWrappedElement":
+        log.info("Waiting for all Elements located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        await self.__wait_until(timeout, conditions.VISIBILITY_OF_ANY_ELEMENTS)
+        return self
+
+    async def wait_for_visibility_and_click(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        await (await self.wait_for_visibility(timeout)).click()
+
+    async def wait_until_clickable_and_click(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        await (await self.wait_until_clickable(timeout)).click()
+
+    async def mouse_over_and_click(self):
+        await self.mouse_over()
+        await self.click()
+
+    async def wait_for_visibility_and_click_js(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        await (await self.wait_for_visibility(timeout)).click_js()
+
+    async def wait_until_clickable_and_click_js(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
+        await (await self.wait_until_clickable(timeout)).click_js()
+
+    async def mouse_over_and_click_js(self):
+        await self.mouse_over()
+        await self.click_js()
+
+    async def click_until_other_element_is_visible(self, element_to_be_visible: "AsyncWrappedElement",
+                                                   retry_interval: float, num_retries: int) -> bool:
+        return await self.__click_until(self.click_no_wait, element_to_be_visible.wait_for_visibility,
+                                        retry_interval, num_retries)
+
+    async def click_until_other_element_is_invisible(self, element_to_be_invisible: "AsyncWrappedElement",
+                                                     retry_interval: float, num_retries: int) -> bool:
+        return await self.__click_until(self.click_no_wait, element_to_be_invisible.wait_for_invisibility,
+                                        retry_interval, num_retries)
+
+    async def click_js_until_other_element_is_visible(self, element_to_be_visible: "AsyncWrappedElement",
+                                                      retry_interval: float, num_retries: int) -> bool:
+        return await self.__click_until(self.click_js_no_wait, element_to_be_visible.wait_for_visibility,
+                                        retry_interval, num_retries)
+
+    async def click_js_until_other_element_is_invisible(self, element_to_be_invisible: "AsyncWrappedElement",
+                                                        retry_interval: float, num_retries: int) -> bool:
+        return await self.__click_until(self.click_js_no_wait, element_to_be_invisible.wait_for_invisibility,
+                                        retry_interval, num_retries)
+
+    # Clicks and waits up to retry_interval for the outcome, num_retries times, with the retry policy of
+    # WrappedElement: failed clicks are retried with backoff, other errors are raised, and the whole call has a deadline
+    # of num_retries * (retry_interval + the overhead of an attempt) plus the longest backoff between them
+    async def __click_until(self, click, wait_for_outcome, retry_interval: float, num_retries: int) -> bool:
+        async def click_and_wait_for_outcome(attempt_timeout: float):
+            await click()
+            await wait_for_outcome(attempt_timeout)
+        if num_retries <= 0:
+            return False
+        timeout = (num_retries * (retry_interval + AsyncWrappedElement.__CLICK_ATTEMPT_OVERHEAD_SECONDS)
+                   + get_max_backoff_seconds(num_retries))
+        try:
+            await retry_until_deadline_async(click_and_wait_for_outcome, timeout=timeout,
+                                             attempt_timeout=retry_interval, max_attempts=num_retries,
+                                             name=f"{click.__name__} until outcome")
+            return True
+        except TimeoutException as error:
+            log.info("Clicking the Element located by %s: '%s' did not have the expected outcome. %s",
+                     self.__by, self.__locator, error.msg)
+            return False
+
+    # Located element reuse
+
+    def reset_cached_web_element(self) -> "AsyncWrappedElement":
+        if not self.__is_pinned:
+            self.__web_element = None
+        return self
+
+    def get_by_and_locator(self) -> (str, str):
+        return self.__by, self.__locator
+
+    def get_locator(self) -> Locator:
+        return self.__locator_spec
+
+    async def __locate_web_element(self) -> AsyncWebElement:
+        log.info("Locating Element by %s: %s", self.__by, self.__locator)
+        self.__web_element = await (await self.__get_driver()).find_element(self.__by, self.__locator)
+        return self.__web_element
+
+    async def __call_on_web_element(self, function):
+        try:
+            return await function(self.__web_element or await self.__locate_web_element())
+        except StaleElementReferenceException:
+            if self.__is_pinned:
+                raise
+            log.info("The Element located by %s: '%s' went stale. Locating it again", self.__by, self.__locator)
+            return await function(await self.__locate_web_element())
+
+    # WebDriver related
+
+    @staticmethod
+    async def __get_driver() -> AsyncWebDriver:
+        return await AsyncWebDriverSingleton.get_driver()
+
+    async def __wait_until(self, timeout, browser_condition: str, *browser_args):
+        return await AsyncBrowserWait(await self.__get_driver(), timeout).until(
+            browser_condition, self.__by, self.__locator, *browser_args,
+            message=f"Element located by {self.__by}: '{self.__locator}' did not meet the condition "
+                    f"within {timeout} seconds")
+
+    # Move to the centre of the element, then press / release: what ActionChains sends for the same gesture. Sent
+    # together with the actions queued before
+    @staticmethod
+    async def __perform_pointer_actions(web_element: AsyncWebElement, *pointer_actions: dict):
+        web_element.parent.queue_actions("pointer", _move_to(web_element), *pointer_actions)
+        await web_element.parent.perform_queued_actions()
+
+
+def _move_to(web_element: AsyncWebElement, xoffset: int = 0, yoffset: int = 0) -> dict:
+    return {"type": "pointerMove", "duration": 250, "x": xoffset, "y": yoffset,
+            "origin": {ELEMENT_KEY: web_element.id}}
+
+
+def _move_by(xoffset: int, yoffset: int) -> dict:
+    return {"type": "pointerMove", "duration": 250, "x": xoffset, "y": yoffset, "origin": "pointer"}
+
+
+def _scroll(xoffset: int, yoffset: int, origin) -> dict:
+    return {"type": "scroll", "duration": 0, "x": 0, "y": 0, "deltaX": xoffset, "deltaY": yoffset, "origin": origin}
+
+
+def _press(button: int) -> dict:
+    return {"type": "pointerDown", "duration": 0, "button": button}
+
+
+def _release(button: int) -> dict:
+    return {"type": "pointerUp", "duration": 0, "button": button}
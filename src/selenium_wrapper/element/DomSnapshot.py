@@ -0,0 +1,777 @@
+import re
+from typing import Optional
+
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.element.Locator import Locator
+
+_IDENTIFIER = r"(?:[\w-]|\\[0-9a-fA-F]{1,6}\s?|\\[^0-9a-fA-F])+"
+# One simple selector of a compound selector: tag, #id, .class, [attribute], [attribute op value] or :pseudo-class
+_SIMPLE_SELECTOR = re.compile(
+    r"(?P<tag>\*|[a-zA-Z][\w-]*)"
+    r"|\#(?P<id>" + _IDENTIFIER + r")"
+    r"|\.(?P<class>" + _IDENTIFIER + r")"
+    r"""|\[\s*(?P<attribute>[\w:-]+)\s*(?:(?P<operator>[~|^$*]?=)\s*"""
+    r"""(?:"(?P<double>(?:[^"\\]|\\.)*)"|'(?P<single>(?:[^'\\]|\\.)*)'|(?P<bare>""" + _IDENTIFIER + r""")))?\s*\]"""
+    r"|:(?P<pseudo>[\w-]+)(?:\((?P<argument>[^()]*)\))?")
+_COMBINATOR = re.compile(r"\s*([>+~])\s*|\s+")
+_ESCAPE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?|\\(.)", re.S)
+_NTH = re.compile(r"^(?:(?P<odd>odd)|(?P<even>even)|(?P<a>[+-]?\d*)n(?:(?P<sign>[+-])(?P<b>\d+))?"
+                  r"|(?P<index>[+-]?\d+))$")
+_FLAG_CHECKED, _FLAG_SELECTED, _FLAG_DISABLED = 1, 2, 4
+_LAYOUT_BLOCK, _LAYOUT_CELL = 1, 2
+_SNAPSHOT_STRATEGIES = (By.CSS_SELECTOR, By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT)
+_XPATH_TOKEN = re.compile(r"""\s*(?:(?P<string>"[^"]*"|'[^']*')|(?P<number>\d+(?:\.\d*)?)"""
+                          r"""|(?P<operator>//|::|\.\.|!=|<=|>=|[/.@\[\](),|=<>*])|(?P<name>[A-Za-z_][\w.-]*))""")
+_XPATH_AXES = ("child", "descendant", "descendant-or-self", "parent", "ancestor", "ancestor-or-self",
+               "following-sibling", "preceding-sibling", "self", "attribute")
+
+
+# The current document as it was when Page.take_snapshot() pulled it in a single script call: tags, attributes,
+# current values, visibility, sizes and text. Answers the read queries of WrappedElement (by the same By strategies and
+# locators) in the process, without a round trip. Locators are matched as the CSS selector Locator compiles them into,
+# the XPaths Locator can't compile by the XPath 1.0 subset of _XPathParser. The snapshot goes stale with the next
+# navigation, window or frame switch and action (click, typing, script, ...) of the wrapper, after which every query
+# fails
+@log.traced
+class DomSnapshot:
+
+    def __init__(self, serialized: dict, context_tracker, page_version: int):
+        self.__url = serialized["url"]
+        self.__title = serialized["title"]
+        self.__context_tracker = context_tracker
+        self.__page_version = page_version
+        self.__frame_path = context_tracker.get_frame_path()
+        self.__nodes = [_Node(*entry) for entry in serialized["nodes"]]
+        # Serialized in document order
+        for index, node in enumerate(self.__nodes):
+            node.index = index
+            node.link(self.__nodes)
+        self.__root = self.__nodes[0] if self.__nodes else None
+
+    def is_stale(self) -> bool:
+        return self.__context_tracker.get_page_version() != self.__page_version
+
+    def ensure_fresh(self):
+        if self.is_stale():
+            raise RuntimeError(f"The snapshot of {self.__url} is stale: the page was navigated, switched or acted on "
+                               f"since. Take a new snapshot")
+
+    def get_url(self) -> str:
+        return self.__url
+
+    def get_title(self) -> str:
+        return self.__title
+
+    def get_node_count(self) -> int:
+        return len(self.__nodes)
+
+    # Queries by locator
+
+    def find(self, by, locator) -> "SnapshotElement":
+        return self.__first(self.find_all(by, locator), by, locator)
+
+    def find_all(self, by, locator) -> list["SnapshotElement"]:
+        self.ensure_fresh()
+        by, locator = Locator.of(by, locator).get_compiled()
+        return [SnapshotElement(self, node) for node in _find_all(self.__root, by, locator, include_scope=True)]
+
+    def is_present(self, by, locator) -> bool:
+        return len(self.find_all(by, locator)) > 0
+
+    # Queries by Element: the snapshot counterpart of a WrappedElement, children searched from their parent
+
+    def get(self, element) -> "SnapshotElement":
+        return self.__first(self.get_all(element), *element.get_by_and_locator())
+
+    def get_all(self, element) -> list["SnapshotElement"]:
+        self.ensure_fresh()
+        if tuple(frame.get_by_and_locator() for frame in element.get_frame_chain()) != self.__frame_path:
+            raise RuntimeError(f"The Element located by {element.get_by_and_locator()} is in another frame than the "
+                               f"snapshot. Take the snapshot in its frame")
+        if element.is_in_shadow_root():
+            raise RuntimeError(f"The Element located by {element.get_by_and_locator()} is in a shadow root, which "
+                               f"snapshots don't include")
+        by, locator = element.get_by_and_locator()
+        if element.get_parent() is None:
+            return [SnapshotElement(self, node) for node in _find_all(self.__root, by, locator, include_scope=True)]
+        return self.get(element.get_parent()).find_all(by, locator)
+
+    @staticmethod
+    def __first(elements: list, by, locator) -> "SnapshotElement":
+        if not elements:
+            raise NoSuchElementException(f"No Element located by {by}: '{locator}' in the snapshot")
+        return elements[0]
+
+
+# An element of a DomSnapshot, read like a WrappedElement
+@log.traced
+class SnapshotElement:
+
+    def __init__(self, snapshot: DomSnapshot, node: "_Node"):
+        self.__snapshot = snapshot
+        self.__node = node
+
+    def find(self, by, locator) -> "SnapshotElement":
+        elements = self.find_all(by, locator)
+        if not elements:
+            raise NoSuchElementException(f"No Element located by {by}: '{locator}' inside the <{self.__node.tag}> "
+                                         f"Element in the snapshot")
+        return elements[0]
+
+    def find_all(self, by, locator) -> list["SnapshotElement"]:
+        self.__snapshot.ensure_fresh()
+        by, locator = Locator.of(by, locator).get_compiled(relative=True)
+        if by == By.XPATH and locator.startswith("/"):
+            # Searched inside this element, like the children of a WrappedElement
+            locator = "." + locator
+        return [SnapshotElement(self.__snapshot, node) for node in _find_all(self.__node, by, locator)]
+
+    def get_text(self) -> str:
+        self.__snapshot.ensure_fresh()
+        return _get_text(self.__node)
+
+    def get_attribute(self, attribute: str) -> Optional[str]:
+        self.__snapshot.ensure_fresh()
+        # Like WebElement.get_attribute(): the current value and state of form fields, the attribute otherwise
+        if attribute == "value" and self.__node.value is not None:
+            return self.__node.value
+        if attribute in ("checked", "selected"):
+            return "true" if self.__node.flags & (_FLAG_CHECKED | _FLAG_SELECTED) else None
+        if attribute == "disabled":
+            return "true" if self.__node.flags & _FLAG_DISABLED else None
+        return self.__node.attributes.get(attribute)
+
+    def get_value(self) -> Optional[str]:
+        return self.get_attribute("value")
+
+    def get_class_name(self) -> Optional[str]:
+        return self.get_attribute("class")
+
+    def get_id(self) -> Optional[str]:
+        return self.get_attribute("id")
+
+    def get_tag_name(self) -> str:
+        return self.__node.tag
+
+    def get_size(self) -> dict:
+        self.__snapshot.ensure_fresh()
+        return {"height": self.__node.height, "width": self.__node.width}
+
+    def get_height(self):
+        return self.get_size()["height"]
+
+    def get_width(self):
+        return self.get_size()["width"]
+
+    def is_visible(self) -> bool:
+        self.__snapshot.ensure_fresh()
+        return self.__node.visible
+
+    def is_clickable(self) -> bool:
+        self.__snapshot.ensure_fresh()
+        return not self.__node.flags & _FLAG_DISABLED
+
+    def is_selected(self) -> bool:
+        self.__snapshot.ensure_fresh()
+        return bool(self.__node.flags & (_FLAG_CHECKED | _FLAG_SELECTED))
+
+    def __repr__(self):
+        return f"SnapshotElement(<{self.__node.tag}> {self.__node.attributes})"
+
+
+class _Node:
+    __slots__ = ("tag", "attributes", "visible", "layout", "width", "height", "value", "flags", "content", "parent",
+                 "children", "position", "index")
+
+    def __init__(self, tag: str, attributes: dict, visible: bool, layout: int, size: list, value: Optional[str],
+                 flags: int, content: list):
+        self.tag = tag
+        self.attributes = attributes
+        self.visible = visible
+        self.layout = layout
+        self.width, self.height = size
+        self.value = value
+        self.flags = flags
+        # Text (str) and child element indexes, replaced by the child _Nodes in link()
+        self.content = content
+        self.parent: Optional["_Node"] = None
+        self.children: list = []
+        self.position = 0
+        self.index = 0
+
+    def link(self, nodes: list):
+        self.content = [nodes[item] if isinstance(item, int) else item for item in self.content]
+        self.children = [item for item in self.content if isinstance(item, _Node)]
+        for position, child in enumerate(self.children):
+            child.parent = self
+            child.position = position
+
+
+# Searching
+
+def _find_all(scope: Optional[_Node], by: str, locator: str, include_scope: bool = False) -> list:
+    if scope is None:
+        return []
+    if by not in _SNAPSHOT_STRATEGIES:
+        raise RuntimeError(f"Locators by {by}: '{locator}' can't be evaluated on a snapshot. Supported are CSS "
+                           f"selectors, XPaths, link texts and what Locator compiles into CSS (id, name, class name, "
+                           f"tag name)")
+    if by == By.XPATH:
+        return _find_all_by_xpath(scope, locator, include_scope)
+    candidates = _walk(scope, include_scope)
+    if by == By.LINK_TEXT:
+        return [node for node in candidates if node.tag == "a" and _get_text(node).strip() == locator]
+    if by == By.PARTIAL_LINK_TEXT:
+        return [node for node in candidates if node.tag == "a" and locator in _get_text(node)]
+    selectors = _parse_selector_list(locator)
+    return [node for node in candidates if any(_matches(node, steps, len(steps) - 1) for steps in selectors)]
+
+
+def _walk(scope: _Node, include_scope: bool):
+    stack = [scope] if include_scope else list(reversed(scope.children))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+def _matches(node: _Node, steps: list, index: int) -> bool:
+    combinator, tests = steps[index]
+    if not all(test(node) for test in tests):
+        return False
+    if index == 0:
+        return True
+    if combinator == ">":
+        return node.parent is not None and _matches(node.parent, steps, index - 1)
+    if combinator == " ":
+        ancestor = node.parent
+        while ancestor is not None:
+            if _matches(ancestor, steps, index - 1):
+                return True
+            ancestor = ancestor.parent
+        return False
+    siblings = node.parent.children[:node.position] if node.parent is not None else []
+    if combinator == "+":
+        return bool(siblings) and _matches(siblings[-1], steps, index - 1)
+    return any(_matches(sibling, steps, index - 1) for sibling in siblings)
+
+
+# CSS selectors, parsed into [(combinator to the previous step, [test of a node])] per selector of the list
+
+def _parse_selector_list(selector_list: str) -> list:
+    return [_parse_selector(selector, selector_list) for selector in _split_selector_list(selector_list)]
+
+
+def _split_selector_list(selector_list: str) -> list:
+    selectors, current, quote, depth = [], [], None, 0
+    for character in selector_list:
+        if quote:
+            quote = None if character == quote else quote
+        elif character in "\"'":
+            quote = character
+        elif character in "([":
+            depth += 1
+        elif character in ")]":
+            depth -= 1
+        elif character == "," and depth == 0:
+            selectors.append("".join(current))
+            current = []
+            continue
+        current.append(character)
+    selectors.append("".join(current))
+    return selectors
+
+
+def _parse_selector(selector: str, selector_list: str) -> list:
+    selector = selector.strip()
+    steps = []
+    combinator = None
+    position = 0
+    while True:
+        tests, position = _parse_compound(selector, position, selector_list)
+        steps.append((combinator, tests))
+        if position == len(selector):
+            return steps
+        match = _COMBINATOR.match(selector, position)
+        if match is None:
+            raise _unsupported(selector_list)
+        combinator = match.group(1) or " "
+        position = match.end()
+
+
+def _parse_compound(selector: str, position: int, selector_list: str) -> (list, int):
+    tests = []
+    while position < len(selector):
+        match = _SIMPLE_SELECTOR.match(selector, position)
+        if match is None or (match.group("tag") and tests):
+            break
+        tests.append(_compile_simple_selector(match, selector_list))
+        position = match.end()
+    if not tests:
+        raise _unsupported(selector_list)
+    return tests, position
+
+
+def _compile_simple_selector(match, selector_list: str):
+    if match.group("tag"):
+        tag = match.group("tag").lower()
+        return (lambda node: True) if tag == "*" else (lambda node: node.tag == tag)
+    if match.group("id"):
+        element_id = _unescape(match.group("id"))
+        return lambda node: node.attributes.get("id") == element_id
+    if match.group("class"):
+        class_name = _unescape(match.group("class"))
+        return lambda node: class_name in node.attributes.get("class", "").split()
+    if match.group("attribute"):
+        return _compile_attribute_selector(match)
+    return _compile_pseudo_class(match.group("pseudo").lower(), (match.group("argument") or "").strip(), selector_list)
+
+
+def _compile_attribute_selector(match):
+    name = match.group("attribute").lower()
+    operator = match.group("operator")
+    if operator is None:
+        return lambda node: name in node.attributes
+    raw_value = next(group for group in (match.group("double"), match.group("single"), match.group("bare"))
+                     if group is not None)
+    value = _unescape(raw_value)
+    compare = {
+        "=": lambda actual: actual == value,
+        "~=": lambda actual: value in actual.split(),
+        "|=": lambda actual: actual == value or actual.startswith(value + "-"),
+        "^=": lambda actual: bool(value) and actual.startswith(value),
+        "$=": lambda actual: bool(value) and actual.endswith(value),
+        "*=": lambda actual: bool(value) and value in actual,
+    }[operator]
+    return lambda node: name in node.attributes and compare(node.attributes[name])
+
+
+def _compile_pseudo_class(name: str, argument: str, selector_list: str):
+    if name == "first-child":
+        return lambda node: node.position == 0
+    if name == "last-child":
+        return lambda node: node.parent is None or node.position == len(node.parent.children) - 1
+    if name == "only-child":
+        return lambda node: node.parent is None or len(node.parent.children) == 1
+    if name in ("nth-child", "nth-last-child"):
+        matches_index = _compile_nth(argument, selector_list)
+        if name == "nth-child":
+            return lambda node: matches_index(node.position + 1)
+        return lambda node: matches_index((len(node.parent.children) if node.parent else 1) - node.position)
+    if name == "checked":
+        return lambda node: bool(node.flags & (_FLAG_CHECKED | _FLAG_SELECTED))
+    if name == "disabled":
+        return lambda node: bool(node.flags & _FLAG_DISABLED)
+    if name == "enabled":
+        return lambda node: node.tag in ("button", "input", "select", "textarea", "option", "fieldset") \
+            and not node.flags & _FLAG_DISABLED
+    if name == "not":
+        tests, position = _parse_compound(argument, 0, selector_list)
+        if position != len(argument):
+            raise _unsupported(selector_list)
+        return lambda node: not all(test(node) for test in tests)
+    raise _unsupported(selector_list)
+
+
+def _compile_nth(argument: str, selector_list: str):
+    match = _NTH.match(argument.replace(" ", "").lower())
+    if match is None:
+        raise _unsupported(selector_list)
+    if match.group("index") is not None:
+        index = int(match.group("index"))
+        return lambda position: position == index
+    if match.group("odd") or match.group("even"):
+        a, b = 2, 1 if match.group("odd") else 0
+    else:
+        a = {"": 1, "+": 1, "-": -1}.get(match.group("a"), None)
+        a = int(match.group("a")) if a is None else a
+        b = int(match.group("b") or 0) * (-1 if match.group("sign") == "-" else 1)
+    # position = a * n + b for some n >= 0
+    if a == 0:
+        return lambda position: position == b
+    return lambda position: (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def _unescape(value: str) -> str:
+    def replace(match):
+        if match.group(1):
+            return chr(int(match.group(1), 16))
+        return match.group(2)
+    return _ESCAPE.sub(replace, value)
+
+
+def _unsupported(selector: str) -> RuntimeError:
+    return RuntimeError(f"The CSS selector '{selector}' is not supported on a snapshot. Supported are tag, #id, "
+                        f".class, attribute selectors, the descendant, child and sibling combinators and the "
+                        f":first-child, :last-child, :only-child, :nth-child(), :nth-last-child(), :checked, "
+                        f":disabled, :enabled and :not() pseudo-classes")
+
+
+# XPath 1.0, as far as locators use it: location paths in the abbreviated syntax (/, //, ., .., @, [n]) and with the
+# child, descendant(-or-self), parent, ancestor(-or-self), following-sibling, preceding-sibling, self and attribute
+# axes, the text() and node() tests, unions, predicates with and, or, comparisons and the functions of _XPATH_FUNCTIONS.
+# An expression is compiled into a function of the context (node, position, size). Values are lists (node-sets of
+# _Nodes, text and attribute values), str, float and bool
+
+def _find_all_by_xpath(scope: _Node, xpath: str, include_scope: bool) -> list:
+    root = scope
+    while root.parent is not None:
+        root = root.parent
+    document = _Node("#document", {}, True, 0, [0, 0], None, 0, [])
+    document.children = [root]
+    document.index = -1
+    result = _XPathParser(xpath, document).parse()((document if include_scope else scope, 1, 1))
+    if not isinstance(result, list) or not all(isinstance(item, _Node) for item in result):
+        raise RuntimeError(f"The XPath '{xpath}' does not select Elements")
+    return [node for node in result if node is not document]
+
+
+class _XPathParser:
+
+    # Absolute paths start at document
+    def __init__(self, xpath: str, document: _Node):
+        self.__xpath = xpath
+        self.__document = document
+        self.__tokens = []
+        position = 0
+        while xpath[position:].strip():
+            match = _XPATH_TOKEN.match(xpath, position)
+            if match is None:
+                raise _unsupported_xpath(xpath)
+            self.__tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        self.__position = 0
+
+    def parse(self):
+        expression = self.__parse_or()
+        if self.__peek() is not None:
+            raise _unsupported_xpath(self.__xpath)
+        return expression
+
+    # Tokens
+
+    def __peek(self, offset: int = 0) -> Optional[tuple]:
+        position = self.__position + offset
+        return self.__tokens[position] if position < len(self.__tokens) else None
+
+    def __accept(self, *values) -> Optional[str]:
+        token = self.__peek()
+        if token is not None and token[0] in ("operator", "name") and token[1] in values:
+            self.__position += 1
+            return token[1]
+        return None
+
+    def __expect(self, value: str):
+        if self.__accept(value) is None:
+            raise _unsupported_xpath(self.__xpath)
+
+    # Expressions, lowest precedence first
+
+    def __parse_or(self):
+        left = self.__parse_and()
+        while self.__accept("or"):
+            left = (lambda first, second: lambda context: _xpath_boolean(first(context))
+                    or _xpath_boolean(second(context)))(left, self.__parse_and())
+        return left
+
+    def __parse_and(self):
+        left = self.__parse_comparison()
+        while self.__accept("and"):
+            left = (lambda first, second: lambda context: _xpath_boolean(first(context))
+                    and _xpath_boolean(second(context)))(left, self.__parse_comparison())
+        return left
+
+    def __parse_comparison(self):
+        left = self.__parse_union()
+        while True:
+            operator = self.__accept("=", "!=", "<", ">", "<=", ">=")
+            if operator is None:
+                return left
+            left = (lambda first, second, operator: lambda context: _xpath_compare(
+                first(context), second(context), operator))(left, self.__parse_union(), operator)
+
+    def __parse_union(self):
+        left = self.__parse_path_or_primary()
+        while self.__accept("|"):
+            left = (lambda first, second: lambda context: _in_document_order(
+                _node_set(first(context), self.__xpath) + _node_set(second(context), self.__xpath)))(
+                left, self.__parse_path_or_primary())
+        return left
+
+    def __parse_path_or_primary(self):
+        token = self.__peek()
+        if token is None:
+            raise _unsupported_xpath(self.__xpath)
+        kind, value = token
+        if kind == "string":
+            self.__position += 1
+            return lambda context: value[1:-1]
+        if kind == "number":
+            self.__position += 1
+            return lambda context: float(value)
+        if self.__accept("("):
+            expression = self.__parse_or()
+            self.__expect(")")
+            return expression
+        next_token = self.__peek(1)
+        if kind == "name" and next_token == ("operator", "(") and value not in ("text", "node"):
+            return self.__parse_function_call()
+        return self.__parse_location_path()
+
+    def __parse_function_call(self):
+        name = self.__peek()[1]
+        self.__position += 2
+        arguments = []
+        if not self.__accept(")"):
+            arguments.append(self.__parse_or())
+            while self.__accept(","):
+                arguments.append(self.__parse_or())
+            self.__expect(")")
+        if name not in _XPATH_FUNCTIONS:
+            raise _unsupported_xpath(self.__xpath)
+        minimum, maximum, function = _XPATH_FUNCTIONS[name]
+        if len(arguments) < minimum or (maximum is not None and len(arguments) > maximum):
+            raise _unsupported_xpath(self.__xpath)
+        return lambda context: function(context, *[argument(context) for argument in arguments])
+
+    # Location paths: (axis, node test, predicates) per step
+
+    def __parse_location_path(self):
+        steps = []
+        absolute = False
+        if self.__accept("/"):
+            absolute = True
+            if not self.__starts_step():
+                return lambda context: [self.__document]
+        elif self.__accept("//"):
+            absolute = True
+            steps.append(("descendant-or-self", "node()", []))
+        steps.append(self.__parse_step())
+        while True:
+            separator = self.__accept("/", "//")
+            if separator is None:
+                break
+            if separator == "//":
+                steps.append(("descendant-or-self", "node()", []))
+            steps.append(self.__parse_step())
+        return lambda context: _evaluate_steps([self.__document] if absolute else [context[0]], steps, self.__xpath)
+
+    def __starts_step(self) -> bool:
+        token = self.__peek()
+        return token is not None and (token[0] == "name" or token[1] in (".", "..", "@", "*"))
+
+    def __parse_step(self) -> tuple:
+        if self.__accept("."):
+            return "self", "node()", []
+        if self.__accept(".."):
+            return "parent", "node()", []
+        axis = "child"
+        if self.__accept("@"):
+            axis = "attribute"
+        elif self.__peek(1) == ("operator", "::"):
+            axis = self.__peek()[1]
+            if axis not in _XPATH_AXES:
+                raise _unsupported_xpath(self.__xpath)
+            self.__position += 2
+        token = self.__peek()
+        if token is None or not (token[0] == "name" or token[1] == "*"):
+            raise _unsupported_xpath(self.__xpath)
+        self.__position += 1
+        node_test = token[1].lower()
+        if node_test in ("text", "node") and self.__accept("("):
+            self.__expect(")")
+            node_test += "()"
+        predicates = []
+        while self.__accept("["):
+            predicates.append(self.__parse_or())
+            self.__expect("]")
+        return axis, node_test, predicates
+
+
+def _evaluate_steps(context_nodes: list, steps: list, xpath: str) -> list:
+    items = context_nodes
+    for axis, node_test, predicates in steps:
+        selected = []
+        for node in items:
+            if not isinstance(node, _Node):
+                raise _unsupported_xpath(xpath)
+            candidates = _select_on_axis(node, axis, node_test)
+            for predicate in predicates:
+                size = len(candidates)
+                candidates = [candidate for position, candidate in enumerate(candidates, 1)
+                              if _holds(predicate((candidate, position, size)), position)]
+            selected.extend(candidates)
+        items = _in_document_order(selected)
+    return items
+
+
+# In the order of the axis, i.e. nearest first for the reverse axes (parent, ancestor, preceding-sibling)
+def _select_on_axis(node: _Node, axis: str, node_test: str) -> list:
+    if axis == "attribute":
+        return [value for name, value in node.attributes.items() if node_test in ("*", "node()", name.lower())]
+    if node_test == "text()":
+        if axis == "child":
+            return [item for item in node.content if isinstance(item, str)]
+        if axis in ("descendant", "descendant-or-self"):
+            return [item for element in _walk(node, True) for item in element.content if isinstance(item, str)]
+        return []
+    if axis == "child":
+        candidates = node.children
+    elif axis == "descendant":
+        candidates = list(_walk(node, False))
+    elif axis == "descendant-or-self":
+        candidates = list(_walk(node, True))
+    elif axis == "self":
+        candidates = [node]
+    elif axis in ("parent", "ancestor", "ancestor-or-self"):
+        candidates = [node] if axis == "ancestor-or-self" else []
+        ancestor = node.parent
+        while ancestor is not None:
+            candidates.append(ancestor)
+            ancestor = ancestor.parent if axis != "parent" else None
+    else:
+        siblings = node.parent.children if node.parent is not None else []
+        candidates = (siblings[node.position + 1:] if axis == "following-sibling"
+                      else list(reversed(siblings[:node.position])))
+    if node_test == "node()":
+        return list(candidates)
+    return [candidate for candidate in candidates
+            if candidate.tag != "#document" and node_test in ("*", candidate.tag)]
+
+
+def _holds(value, position: int) -> bool:
+    if isinstance(value, float):
+        return value == position
+    return _xpath_boolean(value)
+
+
+# Nodes sorted and without duplicates. Text and attribute values keep the order they were selected in
+def _in_document_order(items: list) -> list:
+    if not all(isinstance(item, _Node) for item in items):
+        return items
+    return sorted({id(item): item for item in items}.values(), key=lambda item: item.index)
+
+
+def _node_set(value, xpath: str) -> list:
+    if not isinstance(value, list):
+        raise _unsupported_xpath(xpath)
+    return value
+
+
+def _string_value(item) -> str:
+    if isinstance(item, str):
+        return item
+    return "".join(part if isinstance(part, str) else _string_value(part) for part in item.content)
+
+
+def _xpath_string(value) -> str:
+    if isinstance(value, list):
+        return _string_value(value[0]) if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        return str(int(value)) if value == int(value) else str(value)
+    return value
+
+
+def _xpath_number(value) -> float:
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, float):
+        return value
+    try:
+        return float(_xpath_string(value).strip())
+    except ValueError:
+        return float("nan")
+
+
+def _xpath_boolean(value) -> bool:
+    if isinstance(value, float):
+        return value == value and value != 0
+    return bool(value)
+
+
+def _xpath_compare(left, right, operator: str) -> bool:
+    if operator in ("=", "!=") and (isinstance(left, bool) or isinstance(right, bool)):
+        return (_xpath_boolean(left) == _xpath_boolean(right)) == (operator == "=")
+    # A node-set compares true if any of its nodes does
+    lefts = [_string_value(item) for item in left] if isinstance(left, list) else [left]
+    rights = [_string_value(item) for item in right] if isinstance(right, list) else [right]
+    return any(_compare_values(first, second, operator) for first in lefts for second in rights)
+
+
+def _compare_values(left, right, operator: str) -> bool:
+    if operator in ("=", "!="):
+        if isinstance(left, float) or isinstance(right, float):
+            left, right = _xpath_number(left), _xpath_number(right)
+        return (left == right) == (operator == "=")
+    left, right = _xpath_number(left), _xpath_number(right)
+    return {"<": left < right, ">": left > right, "<=": left <= right, ">=": left >= right}[operator]
+
+
+def _normalize_space(value: str) -> str:
+    return " ".join(part for part in re.split(r"[ \t\r\n]+", value) if part)
+
+
+def _translate(value: str, source: str, target: str) -> str:
+    # The first occurrence of a character in source counts
+    table = {}
+    for position, character in enumerate(source):
+        table.setdefault(ord(character), target[position] if position < len(target) else None)
+    return value.translate(table)
+
+
+# name -> (min arguments, max arguments or None, function of the context and the argument values)
+_XPATH_FUNCTIONS = {
+    "contains": (2, 2, lambda context, value, part: _xpath_string(part) in _xpath_string(value)),
+    "starts-with": (2, 2, lambda context, value, prefix: _xpath_string(value).startswith(_xpath_string(prefix))),
+    "normalize-space": (0, 1, lambda context, *value: _normalize_space(
+        _xpath_string(value[0] if value else [context[0]]))),
+    "string": (0, 1, lambda context, *value: _xpath_string(value[0] if value else [context[0]])),
+    "string-length": (0, 1, lambda context, *value: float(len(_xpath_string(value[0] if value else [context[0]])))),
+    "concat": (2, None, lambda context, *values: "".join(_xpath_string(value) for value in values)),
+    "translate": (3, 3, lambda context, value, source, target: _translate(
+        _xpath_string(value), _xpath_string(source), _xpath_string(target))),
+    "not": (1, 1, lambda context, value: not _xpath_boolean(value)),
+    "true": (0, 0, lambda context: True),
+    "false": (0, 0, lambda context: False),
+    "count": (1, 1, lambda context, value: float(len(value)) if isinstance(value, list) else float("nan")),
+    "position": (0, 0, lambda context: float(context[1])),
+    "last": (0, 0, lambda context: float(context[2])),
+}
+
+
+def _unsupported_xpath(xpath: str) -> RuntimeError:
+    return RuntimeError(f"The XPath '{xpath}' is not supported on a snapshot. Supported are location paths with the "
+                        f"child, descendant, parent, ancestor, sibling, self and attribute axes, text() and node(), "
+                        f"unions, predicates with and, or, comparisons and the functions "
+                        f"{', '.join(sorted(_XPATH_FUNCTIONS))}")
+
+
+# Visible text, roughly like innerText: whitespace collapsed, block elements on lines of their own
+
+def _get_text(node: _Node) -> str:
+    if not node.visible:
+        return ""
+    parts = []
+    _collect_text(node, parts)
+    lines = (re.sub(r" {2,}", " ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _collect_text(node: _Node, parts: list):
+    for item in node.content:
+        if isinstance(item, str):
+            parts.append(re.sub(r"\s+", " ", item.replace("\u00a0", " ")))
+        elif item.tag == "br":
+            parts.append("\n")
+        elif item.visible:
+            separator = "\n" if item.layout == _LAYOUT_BLOCK else " " if item.layout == _LAYOUT_CELL else ""
+            parts.append(separator)
+            _collect_text(item, parts)
+            parts.append(separator)
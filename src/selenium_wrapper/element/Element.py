@@ -3,6 +3,7 @@ from selenium.webdriver.common.by import By
 from src.selenium_wrapper.element.WrappedElement import WrappedElement
 
 
+# The locators are normalized by WrappedElement (see Locator), so by_id("x") and by_css("#x") are located alike
 class Element:
 
     # Instantiation Strategies
@@ -29,7 +30,7 @@ class Element:
 
     @staticmethod
     def by_link_text(link_text: str):
-        return WrappedElement(By.NAME, link_text)
+        return WrappedElement(By.LINK_TEXT, link_text)
 
     @staticmethod
     def by_partial_link_text(partial_link_text: str):
@@ -0,0 +1,126 @@
+from typing import Callable, Optional, Union
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+_TEXTS_SCRIPT = "return arguments[0].map(function (e) { return e.innerText; });"
+_ATTRIBUTES_SCRIPT = """
+var name = arguments[1];
+return arguments[0].map(function (e) { return e.getAttribute(name); });
+"""
+_CSS_PROPERTIES_SCRIPT = """
+var name = arguments[1];
+return arguments[0].map(function (e) { return window.getComputedStyle(e).getPropertyValue(name); });
+"""
+_RECTS_SCRIPT = """
+var rects = {x: [], y: [], width: [], height: []};
+arguments[0].forEach(function (e) {
+    var rect = e.getBoundingClientRect();
+    rects.x.push(rect.x); rects.y.push(rect.y); rects.width.push(rect.width); rects.height.push(rect.height);
+});
+return rects;
+"""
+_VISIBILITY_SCRIPT = """
+return arguments[0].map(function (e) {
+    var style = window.getComputedStyle(e);
+    return style.visibility !== 'hidden' && style.display !== 'none' && e.getClientRects().length > 0;
+});
+"""
+
+
+# Lazy collection of all Elements matched by a locator. Matches are located on first use and kept as bare WebDriver
+# element ids; every bulk read is answered by a single script call returning one column of values
+@log.traced
+class ElementCollection:
+
+    # search_root returns what the Elements are searched from, e.g. a parent WebElement. The document by default.
+    # enter_frames switches the driver to the frame of the Elements before every read
+    def __init__(self, by, locator, element_factory: Callable[[WebElement], object],
+                 search_root: Optional[Callable[[], object]] = None, enter_frames: Optional[Callable[[], None]] = None):
+        self.__by = by
+        self.__locator = locator
+        self.__element_factory = element_factory
+        self.__search_root = search_root or WebDriverSingleton.get_driver
+        self.__enter_frames = enter_frames or (lambda: None)
+        self.__element_ids: Optional[tuple] = None
+
+    # Bulk reads
+
+    def count(self) -> int:
+        element_count = len(self.__get_element_ids())
+        log.info("Counting Elements located by %s '%s'. Returning %s", self.__by, self.__locator, element_count)
+        return element_count
+
+    def texts(self) -> list:
+        log.info("Getting texts from all Elements located by %s '%s'", self.__by, self.__locator)
+        return self.__execute_bulk_script(_TEXTS_SCRIPT)
+
+    def attributes(self, name: str) -> list:
+        log.info("Getting attribute '%s' from all Elements located by %s '%s'", name, self.__by, self.__locator)
+        return self.__execute_bulk_script(_ATTRIBUTES_SCRIPT, name)
+
+    def css_properties(self, name: str) -> list:
+        log.info("Getting CSS property '%s' from all Elements located by %s '%s'", name, self.__by, self.__locator)
+        return self.__execute_bulk_script(_CSS_PROPERTIES_SCRIPT, name)
+
+    def rects(self) -> dict:
+        log.info("Getting rects of all Elements located by %s '%s'", self.__by, self.__locator)
+        return self.__execute_bulk_script(_RECTS_SCRIPT) or {"x": [], "y": [], "width": [], "height": []}
+
+    def visibility(self) -> list:
+        log.info("Checking visibility of all Elements located by %s '%s'", self.__by, self.__locator)
+        return self.__execute_bulk_script(_VISIBILITY_SCRIPT)
+
+    def refresh(self) -> "ElementCollection":
+        log.debug("Dropping the located Elements of the collection located by %s '%s'", self.__by, self.__locator)
+        self.__element_ids = None
+        return self
+
+    # Single Elements
+
+    def __len__(self):
+        return len(self.__get_element_ids())
+
+    # collection[1:3] is a list of Elements, like slicing get_all_elements()
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.__element_factory(self.__to_web_element(element_id))
+                    for element_id in self.__get_element_ids()[index]]
+        return self.__element_factory(self.__to_web_element(self.__get_element_ids()[index]))
+
+    def __iter__(self):
+        for element_id in self.__get_element_ids():
+            yield self.__element_factory(self.__to_web_element(element_id))
+
+    # WebDriver related
+
+    def __get_element_ids(self) -> tuple:
+        self.__enter_frames()
+        if self.__element_ids is None:
+            log.info("Locating all Elements by %s: %s", self.__by, self.__locator)
+            web_elements = self.__search_root().find_elements(self.__by, self.__locator)
+            self.__element_ids = tuple(web_element.id for web_element in web_elements)
+        return self.__element_ids
+
+    def __execute_bulk_script(self, script: str, *args):
+        if not self.__get_element_ids():
+            return []
+        try:
+            return self.__execute_script_on_elements(script, *args)
+        except StaleElementReferenceException:
+            log.info("Elements located by %s: '%s' went stale. Locating them again", self.__by, self.__locator)
+            self.refresh()
+            if not self.__get_element_ids():
+                return []
+            return self.__execute_script_on_elements(script, *args)
+
+    def __execute_script_on_elements(self, script: str, *args):
+        web_elements = [self.__to_web_element(element_id) for element_id in self.__element_ids]
+        return WebDriverSingleton.get_driver().execute_script(script, web_elements, *args)
+
+    @staticmethod
+    def __to_web_element(element_id: str) -> WebElement:
+        return WebDriverSingleton.get_driver().create_web_element(element_id)
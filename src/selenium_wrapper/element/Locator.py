@@ -0,0 +1,134 @@
+import re
+import sys
+import threading
+from weakref import WeakValueDictionary
+
+from selenium.webdriver.common.by import By
+
+# One step of an XPath that has an exact CSS equivalent: //tag, /tag, //*[@attribute], //tag[@attribute='value']...
+# Only lowercase names are compiled, since XPath matches HTML names case-sensitively and CSS does not
+_XPATH_STEP = re.compile(r"""(?P<axis>//|/)(?P<tag>\*|[a-z][a-z0-9-]*)"""
+                         r"""(?P<predicates>(?:\[@[a-z][a-z0-9_-]*(?:=(?:'[^']*'|"[^"]*"))?\])*)""")
+_XPATH_PREDICATE = re.compile(r"""\[@(?P<name>[a-z][a-z0-9_-]*)(?:=(?:'(?P<single>[^']*)'|"(?P<double>[^"]*)"))?\]""")
+_TAG_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9-]*$")
+_STRATEGIES = (By.ID, By.NAME, By.CLASS_NAME, By.TAG_NAME, By.CSS_SELECTOR, By.XPATH, By.LINK_TEXT,
+               By.PARTIAL_LINK_TEXT)
+
+
+# A locator normalized once, when it is created. id, name, class name and tag name are rewritten into the CSS selector
+# selenium would otherwise build on every lookup, XPaths with an exact CSS equivalent are compiled into CSS, and
+# invalid locators fail here instead of on the first lookup. Identical locators share one interned instance
+class Locator:
+    __slots__ = ("__by", "__value", "__compiled_by", "__compiled_value", "__is_relative_exact", "__weakref__")
+    __interned = WeakValueDictionary()
+    __lock = threading.Lock()
+
+    def __init__(self, by: str, value: str):
+        self.__by = by
+        self.__value = value
+        compiled_by, compiled_value = _compile(by, value)
+        self.__compiled_by = sys.intern(compiled_by)
+        self.__compiled_value = sys.intern(compiled_value)
+        # Searched from an element, the CSS of an XPath of several steps also matches its first steps on ancestors
+        # outside the element (a > b from the element vs .//a/b), so those XPaths are kept for relative searches
+        self.__is_relative_exact = (by != By.XPATH or compiled_by == By.XPATH
+                                    or _XPATH_STEP.fullmatch(value) is not None)
+
+    @staticmethod
+    def of(by: str, value: str) -> "Locator":
+        with Locator.__lock:
+            locator = Locator.__interned.get((by, value))
+            if locator is None:
+                locator = Locator(by, value)
+                Locator.__interned[(by, value)] = locator
+        return locator
+
+    # As written by the caller, e.g. ("id", "submit")
+    def get_original(self) -> (str, str):
+        return self.__by, self.__value
+
+    # As sent to the browser, e.g. ("css selector", "#submit"). relative is for searches from an element
+    def get_compiled(self, relative: bool = False) -> (str, str):
+        if relative and not self.__is_relative_exact:
+            return self.__by, self.__value
+        return self.__compiled_by, self.__compiled_value
+
+    def is_rewritten(self) -> bool:
+        return (self.__by, self.__value) != (self.__compiled_by, self.__compiled_value)
+
+    def __repr__(self):
+        if self.is_rewritten():
+            return f"{self.__by}: '{self.__value}' -> {self.__compiled_by}: '{self.__compiled_value}'"
+        return f"{self.__by}: '{self.__value}'"
+
+
+def _compile(by: str, value: str) -> (str, str):
+    if by not in _STRATEGIES:
+        raise RuntimeError(f"Unsupported locator strategy: {by}. Supported strategies: {list(_STRATEGIES)}")
+    if not isinstance(value, str) or not value.strip():
+        raise RuntimeError(f"Empty locator for the strategy: {by}")
+    if by == By.ID:
+        return By.CSS_SELECTOR, "#" + _escape_identifier(value)
+    if by == By.CLASS_NAME:
+        if len(value.split()) > 1:
+            raise RuntimeError(f"Compound class names are not supported: '{value}'. Locate the Element by CSS instead")
+        return By.CSS_SELECTOR, "." + _escape_identifier(value.strip())
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{_escape_string(value)}"]'
+    if by == By.TAG_NAME:
+        if not _TAG_NAME.match(value):
+            raise RuntimeError(f"Invalid tag name: '{value}'")
+        return By.CSS_SELECTOR, value
+    if by == By.XPATH:
+        css = _compile_xpath(value)
+        return (By.CSS_SELECTOR, css) if css is not None else (By.XPATH, value)
+    return by, value
+
+
+def _compile_xpath(xpath: str):
+    if not xpath.startswith("//"):
+        return None
+    parts = []
+    position = 0
+    while position < len(xpath):
+        step = _XPATH_STEP.match(xpath, position)
+        if step is None:
+            return None
+        if parts:
+            parts.append(" " if step.group("axis") == "//" else " > ")
+        attributes = [_compile_xpath_predicate(predicate)
+                      for predicate in _XPATH_PREDICATE.finditer(step.group("predicates"))]
+        tag = step.group("tag")
+        parts.append(("" if tag == "*" and attributes else tag) + "".join(attributes))
+        position = step.end()
+    return "".join(parts)
+
+
+def _compile_xpath_predicate(predicate) -> str:
+    value = predicate.group("single") if predicate.group("single") is not None else predicate.group("double")
+    if value is None:
+        return f"[{predicate.group('name')}]"
+    return f'[{predicate.group("name")}="{_escape_string(value)}"]'
+
+
+def _escape_string(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\a ")
+
+
+# CSS.escape() of the CSSOM spec
+def _escape_identifier(value: str) -> str:
+    escaped = []
+    for index, character in enumerate(value):
+        code = ord(character)
+        if code == 0:
+            escaped.append("\ufffd")
+        elif (0x1 <= code <= 0x1f or code == 0x7f or (index == 0 and character.isdigit() and character.isascii())
+              or (index == 1 and character.isdigit() and character.isascii() and value[0] == "-")):
+            escaped.append(f"\\{code:x} ")
+        elif index == 0 and character == "-" and len(value) == 1:
+            escaped.append("\\-")
+        elif code >= 0x80 or character in "-_" or (character.isascii() and character.isalnum()):
+            escaped.append(character)
+        else:
+            escaped.append("\\" + character)
+    return "".join(escaped)
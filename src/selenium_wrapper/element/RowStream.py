@@ -0,0 +1,105 @@
+import os
+from collections import OrderedDict
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.element.Locator import Locator
+from src.selenium_wrapper.scripts import STREAM_ROWS_JS
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+# Iterates the rows of a long, infinitely scrolling or virtualized list by scrolling its container one step at a time.
+# Every step is a single script call that scrolls, waits for the list to render and extracts only the rows that were
+# not rendered by the previous step. Rows are yielded as {"key", "text", "attributes"} and deduplicated by key (the
+# key_attribute of the row, its text without one). Neither side keeps more than the rendered rows and the last
+# dedup_window keys, however long the list is. Ends when the container stays scrolled to the end without new rows for
+# idle_steps steps, or after max_rows rows
+@log.traced
+class RowStream:
+    __DEFAULT_SETTLE_MS = int(os.getenv("ROW_STREAM_SETTLE_MS", "500"))
+    __DEFAULT_IDLE_STEPS = int(os.getenv("ROW_STREAM_IDLE_STEPS", "2"))
+    __DEFAULT_DEDUP_WINDOW = int(os.getenv("ROW_STREAM_DEDUP_WINDOW", "10000"))
+
+    # container is the scrolling WrappedElement the rows are in, None for rows scrolled with the page
+    def __init__(self, container, by, locator, key_attribute: str = None, attributes: tuple = (),
+                 scroll_step: int = None, settle_ms: int = __DEFAULT_SETTLE_MS, idle_steps: int = __DEFAULT_IDLE_STEPS,
+                 dedup_window: int = __DEFAULT_DEDUP_WINDOW, max_rows: int = None):
+        if idle_steps < 1 or dedup_window < 1:
+            raise ValueError("RowStream needs at least 1 idle step and a dedup window of at least 1")
+        self.__container = container
+        self.__by, self.__locator = Locator.of(by, locator).get_compiled(relative=container is not None)
+        if container is not None and self.__by == By.XPATH and self.__locator.startswith("/"):
+            # Searched from the container, like the children of an Element
+            self.__locator = "." + self.__locator
+        self.__key_attribute = key_attribute
+        self.__attributes = list(attributes)
+        self.__scroll_step = scroll_step
+        self.__settle_ms = settle_ms
+        self.__idle_steps = idle_steps
+        self.__dedup_window = dedup_window
+        self.__max_rows = max_rows
+        # Metrics
+        self.__steps = 0
+        self.__rows = 0
+        self.__duplicates = 0
+
+    def __iter__(self):
+        log.info("Streaming the rows located by %s: '%s'", self.__by, self.__locator)
+        seen_keys: OrderedDict = OrderedDict()
+        previous_keys = []
+        previous_position = None
+        idle_steps = 0
+        scroll = False
+        while True:
+            step = self.__step(previous_keys, scroll)
+            scroll = True
+            new_rows = 0
+            for key, text, attributes in step["rows"]:
+                if key in seen_keys:
+                    seen_keys.move_to_end(key)
+                    self.__duplicates += 1
+                    continue
+                seen_keys[key] = None
+                if len(seen_keys) > self.__dedup_window:
+                    seen_keys.popitem(last=False)
+                new_rows += 1
+                self.__rows += 1
+                yield {"key": key, "text": text, "attributes": attributes}
+                if self.__max_rows is not None and self.__rows >= self.__max_rows:
+                    log.info("Streamed %s rows in %s steps. Reached the maximum", self.__rows, self.__steps)
+                    return
+            previous_keys = step["keys"]
+            if new_rows == 0 and (step["atEnd"] or step["position"] == previous_position):
+                idle_steps += 1
+                if idle_steps >= self.__idle_steps:
+                    log.info("Streamed %s rows in %s steps. Reached the end of the list", self.__rows, self.__steps)
+                    return
+            else:
+                idle_steps = 0
+            previous_position = step["position"]
+
+    def get_stats(self) -> dict:
+        return {"steps": self.__steps, "rows": self.__rows, "duplicates": self.__duplicates}
+
+    def __step(self, previous_keys: list, scroll: bool) -> dict:
+        self.__steps += 1
+        try:
+            return self.__execute_step(previous_keys, scroll)
+        except StaleElementReferenceException:
+            if self.__container is None:
+                raise
+            log.info("The container of the rows located by %s: '%s' went stale. Locating it again",
+                     self.__by, self.__locator)
+            self.__container.reset_cached_web_element()
+            return self.__execute_step(previous_keys, scroll)
+
+    def __execute_step(self, previous_keys: list, scroll: bool) -> dict:
+        container = self.__container.get_web_element() if self.__container is not None else None
+        step = WebDriverSingleton.get_driver().execute_async_script(
+            STREAM_ROWS_JS, container, self.__by, self.__locator, self.__key_attribute, self.__attributes,
+            previous_keys, scroll, self.__settle_ms, self.__scroll_step)
+        if scroll:
+            WebDriverSingleton.get_context_tracker().on_page_changed()
+        return step
@@ -1,388 +1,702 @@
-import logging
 import os
-
-from selenium.common import NoSuchElementException
-from selenium.webdriver import ActionChains, Keys
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver import Keys
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.shadowroot import ShadowRoot
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.wait import WebDriverWait
 
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.element.ElementCollection import ElementCollection
+from src.selenium_wrapper.element.Locator import Locator
+from src.selenium_wrapper.element.RowStream import RowStream
+from src.selenium_wrapper.webdriver.ActionBatch import ActionBatch
+from src.selenium_wrapper.webdriver.DownloadManager import Download
+from src.selenium_wrapper.webdriver.ScreenshotPipeline import ScreenshotPipeline
 from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
-from src.selenium_wrapper.generic import (get_control_or_command_for_current_os, retry_function_until_success)
-
-
+from src.selenium_wrapper.wait import conditions
+from src.selenium_wrapper.wait.BrowserWait import BrowserWait
+from src.selenium_wrapper.generic import (get_control_or_command_for_current_os, get_max_backoff_seconds,
+                                          retry_until_deadline)
+
+# Keyword arguments of child() and shadow_child()
+_CHILD_LOCATOR_STRATEGIES = {
+    "css": By.CSS_SELECTOR,
+    "xpath": By.XPATH,
+    "id": By.ID,
+    "name": By.NAME,
+    "class_name": By.CLASS_NAME,
+    "tag_name": By.TAG_NAME,
+    "link_text": By.LINK_TEXT,
+    "partial_link_text": By.PARTIAL_LINK_TEXT,
+}
+
+
+@log.traced
 class WrappedElement:
     __DEFAULT_TIME_OUT_SECONDS = float(os.getenv("DEFAULT_TIME_OUT_SECONDS"))
-
-    def __init__(self, by, locator, web_element: WebElement = None):
-        self.__driver = WebDriverSingleton.get_driver()
-        self.__by = by
-        self.__locator = locator
+    # The poll interval of WebDriverWait
+    __POLL_SECONDS = 0.5
+    # What one click_until_* attempt may take on top of its retry interval: the click and the round trips of the wait
+    __CLICK_ATTEMPT_OVERHEAD_SECONDS = 0.5
+    # Max age of a located WebElement before it is re-located. Unset means reuse until it goes stale
+    __HANDLE_MAX_AGE_SECONDS = (float(os.getenv("ELEMENT_HANDLE_MAX_AGE_SECONDS"))
+                                if os.getenv("ELEMENT_HANDLE_MAX_AGE_SECONDS") else None)
+    __total_saved_round_trips = 0
+
+    def __init__(self, by, locator, web_element: WebElement = None, parent: "WrappedElement" = None,
+                 in_shadow_root: bool = False):
+        self.__locator_spec = Locator.of(by, locator)
+        # The compiled form is used for lookups, waits, the element cache and logs
+        self.__by, self.__locator = self.__locator_spec.get_compiled(relative=parent is not None)
+        # Child Elements are searched from their parent (or its shadow root) instead of the whole document
+        self.__parent = parent
+        self.__in_shadow_root = in_shadow_root
+        if in_shadow_root and self.__by != By.CSS_SELECTOR:
+            raise RuntimeError(f"Shadow roots can only be searched by CSS selector, not by {self.__by}: "
+                               f"'{self.__locator}'")
+        if parent is not None and self.__by == By.XPATH and self.__locator.startswith("/"):
+            # An absolute XPath would search the whole document even from an element
+            self.__locator = "." + self.__locator
+        self.__shadow_root: Optional[tuple] = None
         self.__web_element = web_element
+        # Elements handed over by get_all_elements() can't be re-located by the locator, so they are never refreshed
+        self.__is_pinned = web_element is not None
+        self.__located_at = time.monotonic()
+        self.__saved_round_trips = 0
+        # The frame Element this Element is in, see in_frame(). Children are in the frame of their parent
+        self.__frame: Optional["WrappedElement"] = parent.__frame if parent is not None else None
+
+    # Resolved on every use so that an Element follows the driver bound to the current thread (see WebDriverPool)
+    @property
+    def __driver(self) -> WebDriver:
+        return WebDriverSingleton.get_driver()
 
     # Actions
 
     def click_no_wait(self):
-        self.__get_web_driver_actions().click(self.__get_web_element()).perform()
-        logging.info(f"Clicking the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("click", self).perform()
+        log.info("Clicking the Element located by %s: '%s'", self.__by, self.__locator)
 
     def click(self):
         self.wait_for_presence().click_no_wait()
 
     def double_click(self):
         self.wait_for_presence()
-        self.__get_web_driver_actions().double_click(self.__get_web_element()).perform()
-        logging.info(f"Double clicking the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("double_click", self).perform()
+        log.info("Double clicking the Element located by %s: '%s'", self.__by, self.__locator)
 
     def click_js_no_wait(self):
-        self.execute_javascript("arguments[0].click();", self.__get_web_element())
-        logging.info(f"JS clicking  the Element located by {self.__by}: '{self.__locator}'")
+        self.__call_on_web_element(lambda web_element: self.execute_javascript("arguments[0].click();", web_element))
+        log.info("JS clicking  the Element located by %s: '%s'", self.__by, self.__locator)
 
     def click_js(self):
         self.wait_for_presence().click_js_no_wait()
 
+    # Clicks and waits until the download the click started is complete
+    def click_to_download(self, file_name_pattern: str = None, timeout: float = None) -> Download:
+        download = WebDriverSingleton.get_download_manager().expect(file_name_pattern)
+        self.click()
+        download.wait(timeout)
+        return download
+
     def click_invisible_element(self):
         script: str = ("var object = arguments[0];var theEvent = document.createEvent(\"MouseEvent\");"
                        "theEvent.initMouseEvent(\"click\", true, true, window, 0, 0, 0, 0, 0, false, false, false, "
                        "false, 0, null);object.dispatchEvent(theEvent);")
-        self.execute_javascript(script, self.__get_web_element())
-        logging.info(f"Clicking the invisible Element located by {self.__by}: '{self.__locator}'")
+        self.__call_on_web_element(lambda web_element: self.execute_javascript(script, web_element))
+        log.info("Clicking the invisible Element located by %s: '%s'", self.__by, self.__locator)
 
     def mouse_over(self):
         self.wait_for_presence()
-        self.__get_web_driver_actions().move_to_element(self.__get_web_element()).perform()
-        logging.info(f"Hovering over the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("move_to_element", self).perform()
+        log.info("Hovering over the Element located by %s: '%s'", self.__by, self.__locator)
+
+    # mouse_down, mouse_up, key_down, key_up and the move_* methods only queue their input. It is sent, together with
+    # everything queued before it on any Element or Page of the driver, by perform() or by the next immediate action
 
     def mouse_down(self):
         self.wait_for_presence()
-        self.__get_web_driver_actions().click_and_hold(self.__get_web_element())
-        logging.info(f"Clicking and holding LMB on the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("click_and_hold", self)
+        log.info("Clicking and holding LMB on the Element located by %s: '%s'", self.__by, self.__locator)
 
     def mouse_up(self):
         self.wait_for_presence()
-        self.__get_web_driver_actions().release(self.__get_web_element())
-        logging.info(f"Releasing LMB from the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("release", self)
+        log.info("Releasing LMB from the Element located by %s: '%s'", self.__by, self.__locator)
 
     def right_click(self):
         self.wait_for_presence()
-        self.__get_web_driver_actions().context_click(self.__get_web_element()).perform()
-        logging.info(f"Right clicking the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("context_click", self).perform()
+        log.info("Right clicking the Element located by %s: '%s'", self.__by, self.__locator)
 
     def drag_and_drop_to_element(self, element: "WrappedElement"):
         self.wait_for_presence()
         element.wait_for_presence()
-        self.__get_web_driver_actions().drag_and_drop(self.__get_web_element(), element.__get_web_element()).perform()
-        logging.info(
-            f"Dragging the Element located by {self.__by}: '{self.__locator}' onto the Element located by "
-            f"{element.__by}: '{element.__locator}'")
+        self.__get_action_batch().add("drag_and_drop", self, element).perform()
+        log.info("Dragging the Element located by %s: '%s' onto the Element located by %s: '%s'",
+                 self.__by, self.__locator, element.__by, element.__locator)
 
     def drag_and_drop_by_offset(self, xoffset: int, yoffset: int):
         self.wait_for_presence()
-        self.__get_web_driver_actions().drag_and_drop_by_offset(self.__get_web_element(), xoffset, yoffset).perform()
-        logging.info(
-            f"Dragging the Element located by {self.__by}: '{self.__locator}' "
-            f"by X offset: {xoffset}, Y offset: {yoffset}")
+        self.__get_action_batch().add("drag_and_drop_by_offset", self, xoffset, yoffset).perform()
+        log.info("Dragging the Element located by %s: '%s' by X offset: %s, Y offset: %s",
+                 self.__by, self.__locator, xoffset, yoffset)
 
     def key_down(self, key: Keys):
         self.wait_for_presence()
-        self.__get_web_driver_actions().key_down(str(key), self.__get_web_element())
-        logging.info(f"Pressing and holding the key: '{key}' on the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("key_down", str(key), self)
+        log.info("Pressing and holding the key: '%s' on the Element located by %s: '%s'",
+                 key, self.__by, self.__locator)
 
     def key_up(self, key: Keys):
         self.wait_for_presence()
-        self.__get_web_driver_actions().key_up(str(key), self.__get_web_element())
-        logging.info(f"Releasing the key: '{key}' from the Element located by {self.__by}: '{self.__locator}'")
+        self.__get_action_batch().add("key_up", str(key), self)
+        log.info("Releasing the key: '%s' from the Element located by %s: '%s'", key, self.__by, self.__locator)
 
     def perform(self):
-        self.wait_for_presence()
-        self.__get_web_driver_actions().perform()
-        logging.info(f"Performing the previously queued actions on the Element located by {self.__by}: "
-                     f"'{self.__locator}'")
+        self.__get_action_batch().perform()
+        log.info("Performing the previously queued actions on the Element located by %s: '%s'",
+                 self.__by, self.__locator)
+
+    def release_actions(self):
+        self.__get_action_batch().release()
+        log.info("Releasing all keys and mouse buttons held down in the browser")
 
     def move_by_offset(self, xoffset: int, yoffset: int):
-        self.wait_for_presence()
-        self.__get_web_driver_actions().move_by_offset(xoffset, yoffset)
-        logging.info(f"Moving the mouse by X offset: {xoffset}, Y offset: {yoffset}")
+        self.__get_action_batch().add("move_by_offset", xoffset, yoffset)
+        log.info("Moving the mouse by X offset: %s, Y offset: %s", xoffset, yoffset)
 
     def move_to_element_with_offset(self, element: "WrappedElement", xoffset: int, yoffset: int):
-        self.wait_for_presence()
-        self.__get_web_driver_actions().move_to_element_with_offset(element.__get_web_element(), xoffset, yoffset)
-        logging.info(f"Moving the mouse to the Element located by {self.__by}: '{self.__locator}' with "
-                     f"X offset: {xoffset}, Y offset: {yoffset}")
+        element.wait_for_presence()
+        self.__get_action_batch().add("move_to_element_with_offset", element, xoffset, yoffset)
+        log.info("Moving the mouse to the Element located by %s: '%s' with X offset: %s, Y offset: %s",
+                 element.__by, element.__locator, xoffset, yoffset)
 
     def scroll_by_offset(self, xoffset: int, yoffset: int):
-        self.wait_for_presence()
-        self.__get_web_driver_actions().scroll_by_amount(xoffset, yoffset).perform()
-        logging.info(f"Scrolling the page by X offset: {xoffset}, Y offset: {yoffset}")
+        self.__get_action_batch().add("scroll_by_amount", xoffset, yoffset).perform()
+        log.info("Scrolling the page by X offset: %s, Y offset: %s", xoffset, yoffset)
 
     def scroll_to_element(self, element: "WrappedElement"):
-        self.wait_for_presence()
-        self.__get_web_driver_actions().scroll_to_element(element.__get_web_element()).perform()
-        logging.info(f"Scrolling the Page to the Element located by {self.__by}: '{self.__locator}'")
+        element.wait_for_presence()
+        self.__get_action_batch().add("scroll_to_element", element).perform()
+        log.info("Scrolling the Page to the Element located by %s: '%s'", element.__by, element.__locator)
 
     def clear_text(self):
         self.wait_for_presence()
-        self.__get_web_element().clear()
-        logging.info(f"Clearing the text from the Element located by {self.__by}: '{self.__locator}'")
+        self.__call_on_web_element(lambda web_element: web_element.clear())
+        self.__mark_page_changed()
+        log.info("Clearing the text from the Element located by %s: '%s'", self.__by, self.__locator)
 
     def clear_field(self):
         self.wait_for_presence()
-        self.send_keys(get_control_or_command_for_current_os() + 'a')
-        self.send_keys(Keys.BACKSPACE)
-        logging.info(f"Clearing the text from the Element located by {self.__by}: '{self.__locator}'")
+        # One key sequence. NULL releases the modifier before the backspace
+        self.send_keys(get_control_or_command_for_current_os() + 'a' + Keys.NULL + Keys.BACKSPACE)
+        log.info("Clearing the text from the Element located by %s: '%s'", self.__by, self.__locator)
 
     def send_keys(self, *text):
         self.wait_for_presence()
-        self.__get_web_element().send_keys(*text)
-        logging.info(f"Typing text: '{''.join(text)}' into the Element located by {self.__by}: '{self.__locator}'")
+        self.__call_on_web_element(lambda web_element: web_element.send_keys(*text))
+        self.__mark_page_changed()
+        log.info("Typing text: '%s' into the Element located by %s: '%s'",
+                 log.LazyJoin(text), self.__by, self.__locator)
 
     def send_keys_no_wait(self, *text):
-        self.__get_web_element().send_keys(*text)
-        logging.info(f"Typing text: '{''.join(text)}' into the Element located by {self.__by}: '{self.__locator}'")
+        self.__call_on_web_element(lambda web_element: web_element.send_keys(*text))
+        self.__mark_page_changed()
+        log.info("Typing text: '%s' into the Element located by %s: '%s'",
+                 log.LazyJoin(text), self.__by, self.__locator)
 
     def switch_frame(self):
-        self.__driver.switch_to.frame(self.__get_web_element())
-        logging.info(f"Switching to the Frame located by {self.__by}: '{self.__locator}'")
+        self.__enter_frames()
+        WebDriverSingleton.get_context_tracker().switch_to_frame(self)
+        log.info("Switching to the Frame located by %s: '%s'", self.__by, self.__locator)
 
     def execute_javascript(self, script, *args):
-        logging.info(f"Executing javascript: {script} with arguments: {args}")
-        return self.__driver.execute_script(script, *args)
+        log.info("Executing javascript: %s with arguments: %s", script, args)
+        result = self.__driver.execute_script(script, *args)
+        self.__mark_page_changed()
+        return result
+
+    # Captures only this Element. Returns False when the screenshot could not be written, like Page.make_screenshot()
+    def make_screenshot(self, file_path: str, image_format: str = None, quality: int = None) -> bool:
+        try:
+            self.make_screenshot_async(file_path, image_format, quality).result()
+            return True
+        except OSError:
+            return False
+
+    # Writes the screenshot in the background, like Page.make_screenshot_async()
+    def make_screenshot_async(self, file_path: str, image_format: str = None, quality: int = None) -> Future:
+        self.wait_for_presence()
+        future = self.__call_on_web_element(lambda web_element: ScreenshotPipeline.get_default().capture(
+            self.__driver, file_path, web_element=web_element, image_format=image_format, quality=quality))
+        log.info("Making screenshot of the Element located by %s: '%s'. Saving the screenshot to %s",
+                 self.__by, self.__locator, file_path)
+        return future
 
     # Get data from element
     def get_attribute(self, attribute: str):
         self.wait_for_presence()
-        element_attribute = self.__get_web_element().get_attribute(attribute)
-        logging.info(f"Getting attribute: '{attribute}' from the Element located by {self.__by}: '{self.__locator}'. "
-                     f"Returning '{element_attribute}'")
+        element_attribute = self.__call_on_web_element(lambda web_element: web_element.get_attribute(attribute))
+        log.info("Getting attribute: '%s' from the Element located by %s: '%s'. Returning '%s'",
+                 attribute, self.__by, self.__locator, element_attribute)
         return element_attribute
 
     def get_text(self):
         self.wait_for_presence()
-        element_text = self.__get_web_element().text
-        logging.info(f"Getting text from the Element located by {self.__by}: '{self.__locator}'. "
-                     f"Returning '{element_text}'")
+        element_text = self.__call_on_web_element(lambda web_element: web_element.text)
+        log.info("Getting text from the Element located by %s: '%s'. Returning '%s'",
+                 self.__by, self.__locator, element_text)
         return element_text
 
     def get_css_property(self, css_property: str):
         self.wait_for_presence()
-        element_css_property = self.__get_web_element().value_of_css_property(css_property)
-        logging.info(f"Getting CSS property: '{css_property}' from the Element located by "
-                     f"{self.__by}: '{self.__locator}'. Returning '{element_css_property}'")
+        element_css_property = self.__call_on_web_element(
+            lambda web_element: web_element.value_of_css_property(css_property))
+        log.info("Getting CSS property: '%s' from the Element located by %s: '%s'. Returning '%s'",
+                 css_property, self.__by, self.__locator, element_css_property)
         return element_css_property
 
     def get_class_name(self):
         self.wait_for_presence()
-        element_class = self.__get_web_element().get_attribute("class")
-        logging.info(f"Getting class name from the Element located by "
-                     f"{self.__by}: '{self.__locator}'. Returning '{element_class}'")
+        element_class = self.__call_on_web_element(lambda web_element: web_element.get_attribute("class"))
+        log.info("Getting class name from the Element located by %s: '%s'. Returning '%s'",
+                 self.__by, self.__locator, element_class)
         return element_class
 
     def get_id(self):
         self.wait_for_presence()
-        element_id = self.__get_web_element().get_attribute("id")
-        logging.info(f"Getting id from the Element located by "
-                     f"{self.__by}: '{self.__locator}'. Returning '{element_id}'")
+        element_id = self.__call_on_web_element(lambda web_element: web_element.get_attribute("id"))
+        log.info("Getting id from the Element located by %s: '%s'. Returning '%s'",
+                 self.__by, self.__locator, element_id)
         return element_id
 
     def get_value(self):
         self.wait_for_presence()
-        element_value = self.__get_web_element().get_attribute("value")
-        logging.info(f"Getting value from the Element located by "
-                     f"{self.__by}: '{self.__locator}'. Returning '{element_value}'")
+        element_value = self.__call_on_web_element(lambda web_element: web_element.get_attribute("value"))
+        log.info("Getting value from the Element located by %s: '%s'. Returning '%s'",
+                 self.__by, self.__locator, element_value)
         return element_value
 
     def get_size(self) -> dict:
         self.wait_for_presence()
-        element_size = self.__get_web_element().size
-        logging.info(f"Getting size from the Element located by {self.__by} '{self.__locator}'. "
-                     f"Returning {element_size}")
+        element_size = self.__call_on_web_element(lambda web_element: web_element.size)
+        log.info("Getting size from the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, element_size)
         return element_size
 
     def get_height(self):
         element_height = self.get_size()["height"]
-        logging.info(f"Getting height from the Element located by {self.__by} '{self.__locator}'. Returning "
-                     f"{element_height}")
+        log.info("Getting height from the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, element_height)
         return element_height
 
     def get_width(self):
         element_width = self.get_size()["width"]
-        logging.info(f"Getting width from the Element located by {self.__by} '{self.__locator}'. Returning "
-                     f"{element_width}")
+        log.info("Getting width from the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, element_width)
         return element_width
 
     # Check states
 
     def is_present(self) -> bool:
         try:
-            self.__get_web_element()
-            logging.info(f"Checking presence of the Element located by {self.__by} '{self.__locator}'. Returning True")
+            self.__locate_web_element()
+            log.info("Checking presence of the Element located by %s '%s'. Returning True", self.__by, self.__locator)
             return True
         except NoSuchElementException:
-            logging.info(
-                f"Checking presence of the Element located by {self.__by} '{self.__locator}'. Returning False")
+            self.reset_cached_web_element()
+            log.info("Checking presence of the Element located by %s '%s'. Returning False", self.__by, self.__locator)
             return False
 
     def is_visible(self) -> bool:
         self.wait_for_presence()
-        is_element_visible = self.__get_web_element().is_displayed()
-        logging.info(f"Checking visibility of the Element located by {self.__by} '{self.__locator}'. "
-                     f"Returning {is_element_visible}")
+        is_element_visible = self.__call_on_web_element(lambda web_element: web_element.is_displayed())
+        log.info("Checking visibility of the Element located by %s '%s'. Returning %s",
+                 self.__by, self.__locator, is_element_visible)
         return is_element_visible
 
     def is_clickable(self) -> bool:
         self.wait_for_presence()
-        is_element_clickable = self.__get_web_element().is_enabled()
-        logging.info(f"Checking if the Element located by {self.__by} '{self.__locator}' is clickable. "
-                     f"Returning {is_element_clickable}")
+        is_element_clickable = self.__call_on_web_element(lambda web_element: web_element.is_enabled())
+        log.info("Checking if the Element located by %s '%s' is clickable. Returning %s",
+                 self.__by, self.__locator, is_element_clickable)
         return is_element_clickable
 
     def is_selected(self) -> bool:
         self.wait_for_presence()
-        is_element_selected = self.__get_web_element().is_selected()
-        logging.info(f"Checking if the Element located by {self.__by} '{self.__locator}' is selected. "
-                     f"Returning {is_element_selected}")
+        is_element_selected = self.__call_on_web_element(lambda web_element: web_element.is_selected())
+        log.info("Checking if the Element located by %s '%s' is selected. Returning %s",
+                 self.__by, self.__locator, is_element_selected)
         return is_element_selected
 
     # Multiple elements
 
     def get_all_elements(self) -> list["WrappedElement"]:
-        web_elements_list = WebDriverSingleton.get_driver().find_elements(self.__by, self.__locator)
+        self.__enter_frames()
+        web_elements_list = self.__search(lambda search_root: search_root.find_elements(self.__by, self.__locator))
         elements_list = []
         if len(web_elements_list) > 0:
             for web_element in web_elements_list:
-                elements_list.append(WrappedElement(self.__by, self.__locator, web_element))
-            logging.info(f"Getting all elements located by {self.__by} '{self.__locator}'. "
-                         f"Returning a list of {len(elements_list)} Elements")
+                elements_list.append(WrappedElement(self.__by, self.__locator, web_element).in_frame(self.__frame))
+            log.info("Getting all elements located by %s '%s'. Returning a list of %s Elements",
+                     self.__by, self.__locator, len(elements_list))
         return elements_list
 
+    def get_element_collection(self) -> ElementCollection:
+        log.info("Getting a collection of Elements located by %s '%s'", self.__by, self.__locator)
+        return ElementCollection(self.__by, self.__locator,
+                                 lambda web_element: WrappedElement(self.__by, self.__locator,
+                                                                    web_element).in_frame(self.__frame),
+                                 self.__get_search_root if self.__parent is not None else None,
+                                 self.__enter_frames)
+
+    # Rows of the long or virtualized list scrolled by this Element, yielded as they are rendered. See RowStream
+    def stream_rows(self, by, locator, key_attribute: str = None, attributes: tuple = (), **options) -> RowStream:
+        log.info("Streaming the rows located by %s: '%s' in the Element located by %s: '%s'",
+                 by, locator, self.__by, self.__locator)
+        return RowStream(self, by, locator, key_attribute, attributes, **options)
+
     # Waits
 
     def wait_for_presence(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.debug(
-            f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be present. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.presence_of_element_located(self.__get_element_by_and_locator()))
+        log.debug("Waiting for the Element located by %s: '%s' to be present. Timeout set to %s seconds",
+                  self.__by, self.__locator, timeout)
+        self.__enter_frames()
+        if self.__get_fresh_web_element() is not None or self.__take_web_element_from_cache() is not None:
+            self.__count_saved_round_trip()
+            return self
+        self.__remember_web_element(self.__wait_until(
+            timeout, ec.presence_of_element_located(self.__get_element_by_and_locator()),
+            conditions.PRESENCE_OF_ELEMENT))
         return self
 
     def wait_for_attribute_in_element(self, attribute: str, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for the attribute '{attribute}' to be included in the Element located by {self.__by}: "
-            f"'{self.__locator}'. Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.element_attribute_to_include(self.__get_element_by_and_locator(), attribute))
+        log.info("Waiting for the attribute '%s' to be included in the Element located by %s: '%s'. Timeout set to "
+                 "%s seconds", attribute, self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.element_attribute_to_include(self.__get_element_by_and_locator(), attribute),
+            conditions.ATTRIBUTE_IN_ELEMENT, attribute)
         return self
 
     def wait_until_selected(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be selected. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.element_located_to_be_selected(self.__get_element_by_and_locator()))
+        log.info("Waiting for the Element located by %s: '%s' to be selected. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.element_located_to_be_selected(self.__get_element_by_and_locator()),
+            conditions.ELEMENT_TO_BE_SELECTED)
         return self
 
     def wait_until_clickable(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be clickable. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.element_to_be_clickable(self.__get_element_by_and_locator()))
+        log.info("Waiting for the Element located by %s: '%s' to be clickable. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__remember_web_element(self.__wait_until(
+            timeout, ec.element_to_be_clickable(self.__get_element_by_and_locator()),
+            conditions.ELEMENT_TO_BE_CLICKABLE))
         return self
 
     def wait_for_visibility(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be visible. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.visibility_of_element_located(self.__get_element_by_and_locator()))
+        log.info("Waiting for the Element located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__remember_web_element(self.__wait_until(
+            timeout, ec.visibility_of_element_located(self.__get_element_by_and_locator()),
+            conditions.VISIBILITY_OF_ELEMENT))
         return self
 
     def wait_for_invisibility(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be invisible. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.invisibility_of_element_located(self.__get_element_by_and_locator()))
+        log.info("Waiting for the Element located by %s: '%s' to be invisible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.invisibility_of_element_located(self.__get_element_by_and_locator()),
+            conditions.INVISIBILITY_OF_ELEMENT)
         return self
 
     def wait_for_absence(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
         try:
-            logging.info(
-                f"Waiting for the Element located by {self.__by}: '{self.__locator}' to be absent. "
-                f"Timeout set to {timeout} seconds")
-            self.__get_web_driver_wait(timeout).until(ec.staleness_of(self.__get_web_element()))
+            log.info("Waiting for the Element located by %s: '%s' to be absent. Timeout set to %s seconds",
+                     self.__by, self.__locator, timeout)
+            if BrowserWait.is_enabled() and self.__parent is None:
+                self.__wait_until(timeout, None, conditions.ABSENCE_OF_ELEMENT)
+            else:
+                self.__get_web_driver_wait(timeout).until(ec.staleness_of(self.__locate_web_element()))
         except NoSuchElementException:
             return self
         return self
 
     def wait_until_text_is_present_in_element(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for text '{text}' to be present in the Element located by {self.__by}: '{self.__locator}'. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.text_to_be_present_in_element(self.__get_element_by_and_locator(), text))
+        log.info("Waiting for text '%s' to be present in the Element located by %s: '%s'. Timeout set to %s seconds",
+                 text, self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.text_to_be_present_in_element(self.__get_element_by_and_locator(), text),
+            conditions.TEXT_IN_ELEMENT, text)
         return self
 
     def wait_until_text_is_present_in_attribute(self, attribute: str, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS)\
             -> "WrappedElement":
-        logging.info(
-            f"Waiting for text '{text}' to be present in the attribute '{attribute}' of the Element located by "
-            f"{self.__by}: '{self.__locator}'. Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.text_to_be_present_in_element_attribute(self.__get_element_by_and_locator(), attribute, text))
+        log.info("Waiting for text '%s' to be present in the attribute '%s' of the Element located by %s: '%s'. "
+                 "Timeout set to %s seconds", text, attribute, self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.text_to_be_present_in_element_attribute(self.__get_element_by_and_locator(), attribute, text),
+            conditions.TEXT_IN_ATTRIBUTE, attribute, text)
         return self
 
     def wait_until_text_is_present_in_value(self, text: str, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for text '{text}' to be present in the value of the Element located by {self.__by}: "
-            f"'{self.__locator}'. Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.text_to_be_present_in_element_value(self.__get_element_by_and_locator(), text))
+        log.info("Waiting for text '%s' to be present in the value of the Element located by %s: '%s'. Timeout set "
+                 "to %s seconds", text, self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.text_to_be_present_in_element_value(self.__get_element_by_and_locator(), text),
+            conditions.TEXT_IN_VALUE, text)
         return self
 
     def wait_for_visibility_of_all_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting all Elements located by {self.__by}: '{self.__locator}' to be visible. Timeout set to {timeout} "
-            f"seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.visibility_of_all_elements_located(self.__get_element_by_and_locator()))
+        log.info("Waiting all Elements located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.visibility_of_all_elements_located(self.__get_element_by_and_locator()),
+            conditions.VISIBILITY_OF_ALL_ELEMENTS)
         return self
 
     def wait_for_presence_of_all_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for all Elements located by {self.__by}: '{self.__locator}' to be present. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.presence_of_all_elements_located(self.__get_element_by_and_locator()))
+        log.info("Waiting for all Elements located by %s: '%s' to be present. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.presence_of_all_elements_located(self.__get_element_by_and_locator()),
+            conditions.PRESENCE_OF_ALL_ELEMENTS)
         return self
 
     def wait_for_visibility_of_any_of_the_elements(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> "WrappedElement":
-        logging.info(
-            f"Waiting for all Elements located by {self.__by}: '{self.__locator}' to be visible. "
-            f"Timeout set to {timeout} seconds")
-        self.__get_web_driver_wait(timeout).until(
-            ec.visibility_of_any_elements_located(self.__get_element_by_and_locator()))
+        log.info("Waiting for all Elements located by %s: '%s' to be visible. Timeout set to %s seconds",
+                 self.__by, self.__locator, timeout)
+        self.__wait_until(
+            timeout, ec.visibility_of_any_elements_located(self.__get_element_by_and_locator()),
+            conditions.VISIBILITY_OF_ANY_ELEMENTS)
         return self
 
+    # Located WebElement reuse
+
+    def get_saved_round_trips(self) -> int:
+        return self.__saved_round_trips
+
+    @staticmethod
+    def get_total_saved_round_trips() -> int:
+        return WrappedElement.__total_saved_round_trips
+
+    @staticmethod
+    def reset_total_saved_round_trips():
+        WrappedElement.__total_saved_round_trips = 0
+
+    # Child Elements
+
+    # An Element located inside this one, e.g. row.child(css="td.price"). Takes a by and locator or one keyword of
+    # css, xpath, id, name, class_name, tag_name, link_text and partial_link_text. The parent is located once and its
+    # WebElement is reused by every lookup of its children
+    def child(self, by: str = None, locator: str = None, **locator_kwargs) -> "WrappedElement":
+        by, locator = WrappedElement.__get_child_locator(by, locator, locator_kwargs)
+        return WrappedElement(by, locator, parent=self)
+
+    # An Element inside the shadow root of this one. Shadow roots can only be searched by CSS
+    def shadow_child(self, by: str = None, locator: str = None, **locator_kwargs) -> "WrappedElement":
+        by, locator = WrappedElement.__get_child_locator(by, locator, locator_kwargs)
+        return WrappedElement(by, locator, parent=self, in_shadow_root=True)
+
+    def get_parent(self) -> Optional["WrappedElement"]:
+        return self.__parent
+
+    def is_in_shadow_root(self) -> bool:
+        return self.__in_shadow_root
+
+    # Fetched once per located WebElement
+    def get_shadow_root(self) -> ShadowRoot:
+        web_element = self.__get_web_element()
+        if self.__shadow_root is None or self.__shadow_root[0] is not web_element:
+            log.debug("Getting the shadow root of the Element located by %s: '%s'", self.__by, self.__locator)
+            self.__shadow_root = (web_element, web_element.shadow_root)
+        return self.__shadow_root[1]
+
+    @staticmethod
+    def __get_child_locator(by: Optional[str], locator: Optional[str], locator_kwargs: dict) -> (str, str):
+        unknown_strategies = set(locator_kwargs) - set(_CHILD_LOCATOR_STRATEGIES)
+        if unknown_strategies:
+            raise RuntimeError(f"Unsupported locator strategies: {sorted(unknown_strategies)}. "
+                               f"Supported: {list(_CHILD_LOCATOR_STRATEGIES)}")
+        if (by is not None) + len(locator_kwargs) != 1:
+            raise RuntimeError("Locate a child Element either by a by and a locator or by exactly one keyword, "
+                               f"e.g. child(css='td.price'). Got: by={by}, {locator_kwargs}")
+        if by is not None:
+            return by, locator
+        (strategy, locator), = locator_kwargs.items()
+        return _CHILD_LOCATOR_STRATEGIES[strategy], locator
+
+    # The driver for top-level Elements, the parent's WebElement or shadow root for child Elements
+    def __get_search_root(self):
+        if self.__parent is None:
+            return WebDriverSingleton.get_driver()
+        if self.__in_shadow_root:
+            return self.__parent.wait_for_presence().get_shadow_root()
+        return self.__parent.wait_for_presence().get_web_element()
+
+    def __search(self, function):
+        try:
+            return function(self.__get_search_root())
+        except StaleElementReferenceException:
+            if self.__parent is None:
+                raise
+            log.info("The parent of the Element located by %s: '%s' went stale. Locating it again",
+                     self.__by, self.__locator)
+            self.__parent.reset_cached_web_element()
+            return function(self.__get_search_root())
+
+    # Frames
+
+    # Declares the frame (an Element of the parent document) this Element is in. Every lookup of this Element first
+    # makes that frame the current context, switching only into the frames the driver is not in yet
+    def in_frame(self, frame_element: Optional["WrappedElement"]) -> "WrappedElement":
+        self.__frame = frame_element
+        return self
+
+    # The frames from the top-level document down to the one this Element is in
+    def get_frame_chain(self) -> tuple:
+        if self.__frame is None:
+            return ()
+        return self.__frame.get_frame_chain() + (self.__frame,)
+
+    # Elements without a frame are in the top-level document, so a frame entered for another Element is left
+    def __enter_frames(self):
+        WebDriverSingleton.get_context_tracker().enter_frames(self.get_frame_chain())
+
+    # Takes over a WebElement located on behalf of this Element, e.g. by Page.prefetch()
+    def adopt_web_element(self, web_element: WebElement) -> "WrappedElement":
+        if not self.__is_pinned:
+            self.__web_element = web_element
+            self.__located_at = time.monotonic()
+        return self
+
+    def reset_cached_web_element(self) -> "WrappedElement":
+        if not self.__is_pinned:
+            log.debug("Dropping the cached WebElement located by %s: '%s'", self.__by, self.__locator)
+            self.__web_element = None
+            if self.__parent is None:
+                WebDriverSingleton.get_element_cache().discard(self.__by, self.__locator)
+        return self
+
+    # Reads the cached WebElement once: page objects shared between WebDriverPool workers may replace it meanwhile
+    def __get_fresh_web_element(self) -> Optional[WebElement]:
+        web_element, located_at = self.__web_element, self.__located_at
+        if web_element is None or self.__is_pinned:
+            return web_element
+        if web_element.parent is not WebDriverSingleton.get_driver():
+            # Located through another driver, e.g. by a page object shared between WebDriverPool workers
+            return None
+        if (WrappedElement.__HANDLE_MAX_AGE_SECONDS is not None
+                and time.monotonic() - located_at >= WrappedElement.__HANDLE_MAX_AGE_SECONDS):
+            return None
+        return web_element
+
+    def __remember_web_element(self, web_element: WebElement) -> WebElement:
+        self.__web_element = web_element
+        self.__located_at = time.monotonic()
+        # The element cache is keyed by locator, which is only unique for Elements searched from the document
+        if self.__parent is None:
+            WebDriverSingleton.get_element_cache().put(self.__by, self.__locator, web_element)
+        return web_element
+
+    def __take_web_element_from_cache(self) -> Optional[WebElement]:
+        if self.__is_pinned or self.__parent is not None:
+            return None
+        own_web_element = self.__web_element
+        if own_web_element is not None and own_web_element.parent is WebDriverSingleton.get_driver():
+            # Our own handle has outlived the freshness policy, so the shared copy of it has as well
+            self.reset_cached_web_element()
+            return None
+        web_element = WebDriverSingleton.get_element_cache().get(self.__by, self.__locator)
+        if web_element is None:
+            return None
+        self.__web_element = web_element
+        self.__located_at = time.monotonic()
+        return web_element
+
+    def __count_saved_round_trip(self):
+        self.__saved_round_trips += 1
+        WrappedElement.__total_saved_round_trips += 1
+
+    def __locate_web_element(self) -> WebElement:
+        self.__enter_frames()
+        log.info("Locating Element by %s: %s", self.__by, self.__locator)
+        return self.__remember_web_element(
+            self.__search(lambda search_root: search_root.find_element(self.__by, self.__locator)))
+
+    # The located WebElement, e.g. for queued actions. Reuses the cached one when it is still fresh
+    def get_web_element(self) -> WebElement:
+        return self.__get_web_element()
+
+    def __call_on_web_element(self, function):
+        try:
+            return function(self.__get_web_element())
+        except StaleElementReferenceException:
+            if self.__is_pinned:
+                raise
+            log.info("The Element located by %s: '%s' went stale. Locating it again", self.__by, self.__locator)
+            if self.__parent is not None:
+                # Most likely re-rendered together with its parent
+                self.__parent.reset_cached_web_element()
+            self.reset_cached_web_element().wait_for_presence()
+            return function(self.__get_web_element())
+
     # WebDriver related
     def __get_web_element(self) -> WebElement:
-        if self.__web_element is None:
-            logging.info(f"Locating Element by {self.__by}: {self.__locator}")
-            return WebDriverSingleton.get_driver().find_element(self.__by, self.__locator)
-        else:
-            return self.__web_element
-
+        self.__enter_frames()
+        web_element = self.__get_fresh_web_element()
+        if web_element is not None:
+            if not self.__is_pinned:
+                self.__count_saved_round_trip()
+            return web_element
+        web_element = self.__take_web_element_from_cache()
+        if web_element is not None:
+            self.__count_saved_round_trip()
+            return web_element
+        return self.__locate_web_element()
+
+    # The expected conditions search for the Element from the root the wait is given, see __get_search_root(). Polls
+    # no longer than the timeout: WebDriverWait sleeps a whole poll interval before it gives up
+    def __get_web_driver_wait(self, timeout=__DEFAULT_TIME_OUT_SECONDS) -> WebDriverWait:
+        return WebDriverWait(self.__get_search_root(), timeout,
+                             poll_frequency=max(min(timeout, WrappedElement.__POLL_SECONDS), 0.01))
+
+    def __wait_until(self, timeout, condition, browser_condition: str, *browser_args):
+        self.__enter_frames()
+        # The in-browser conditions search the whole document, so child Elements are waited for by WebDriver
+        if BrowserWait.is_enabled() and self.__parent is None:
+            return BrowserWait(self.__driver, timeout).until(
+                browser_condition, self.__by, self.__locator, *browser_args,
+                message=f"Element located by {self.__by}: '{self.__locator}' did not meet the condition "
+                        f"within {timeout} seconds")
+        return self.__get_web_driver_wait(timeout).until(condition)
+
+    # Marks snapshots and other page state read before this action as stale
     @staticmethod
-    def __get_web_driver_wait(timeout=__DEFAULT_TIME_OUT_SECONDS) -> WebDriverWait:
-        return WebDriverWait(WebDriverSingleton.get_driver(), timeout)
+    def __mark_page_changed():
+        WebDriverSingleton.get_context_tracker().on_page_changed()
 
     @staticmethod
-    def __get_web_driver_actions() -> ActionChains:
-        return ActionChains(WebDriverSingleton.get_driver())
+    def __get_action_batch() -> ActionBatch:
+        return WebDriverSingleton.get_action_batch()
 
     def __get_element_by_and_locator(self) -> (str, str):
         return self.__by, self.__locator
 
+    def get_by_and_locator(self) -> (str, str):
+        return self.__get_element_by_and_locator()
+
+    def get_locator(self) -> Locator:
+        return self.__locator_spec
+
     def wait_for_visibility_and_click(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
         self.wait_for_visibility(timeout).click()
 
@@ -400,49 +714,46 @@ class WrappedElement:
         self.mouse_over()
         self.click_js()
 
-    def __click_and_wait_for_other_element_visibility(self, element_to_be_visible: "WrappedElement",
-                                                      retry_interval: float):
-        self.click_no_wait()
-        element_to_be_visible.wait_for_visibility(retry_interval)
-
     def click_until_other_element_is_visible(self, element_to_be_visible: "WrappedElement", retry_interval: float,
-                                             num_retries: int):
-        retry_function_until_success(
-            lambda: self.__click_and_wait_for_other_element_visibility(element_to_be_visible, retry_interval),
-            0, num_retries)
-
-    def __click_and_wait_for_other_element_invisibility(self, element_to_be_invisible: "WrappedElement",
-                                                        retry_interval: float):
-        self.click_no_wait()
-        element_to_be_invisible.wait_for_invisibility(retry_interval)
+                                             num_retries: int) -> bool:
+        return self.__click_until(self.click_no_wait, element_to_be_visible.wait_for_visibility, retry_interval,
+                                  num_retries)
 
     def click_until_other_element_is_invisible(self, element_to_be_invisible: "WrappedElement", retry_interval: float,
-                                               num_retries: int):
-        retry_function_until_success(
-            lambda: self.__click_and_wait_for_other_element_invisibility(element_to_be_invisible, retry_interval),
-            0, num_retries)
+                                               num_retries: int) -> bool:
+        return self.__click_until(self.click_no_wait, element_to_be_invisible.wait_for_invisibility, retry_interval,
+                                  num_retries)
 
     def wait_until_clickable_and_click_js(self, timeout=__DEFAULT_TIME_OUT_SECONDS):
         self.wait_until_clickable(timeout).click_js()
 
-    def __click_js_and_wait_for_other_element_visibility(self, element_to_be_visible: "WrappedElement",
-                                                         retry_interval: float):
-        self.click_js_no_wait()
-        element_to_be_visible.wait_for_visibility(retry_interval)
-
     def click_js_until_other_element_is_visible(self, element_to_be_visible: "WrappedElement", retry_interval: float,
-                                                num_retries: int):
-        retry_function_until_success(
-            lambda: self.__click_js_and_wait_for_other_element_visibility(element_to_be_visible, retry_interval),
-            0, num_retries)
-
-    def __click_js_and_wait_for_other_element_invisibility(self, element_to_be_invisible: "WrappedElement",
-                                                           retry_interval: float):
-        self.click_no_wait()
-        element_to_be_invisible.wait_for_invisibility(retry_interval)
+                                                num_retries: int) -> bool:
+        return self.__click_until(self.click_js_no_wait, element_to_be_visible.wait_for_visibility, retry_interval,
+                                  num_retries)
 
     def click_js_until_other_element_is_invisible(self, element_to_be_invisible: "WrappedElement",
-                                                  retry_interval: float, num_retries: int):
-        retry_function_until_success(
-            lambda: self.__click_js_and_wait_for_other_element_invisibility(element_to_be_invisible, retry_interval),
-            0, num_retries)
+                                                  retry_interval: float, num_retries: int) -> bool:
+        return self.__click_until(self.click_js_no_wait, element_to_be_invisible.wait_for_invisibility,
+                                  retry_interval, num_retries)
+
+    # Clicks and waits up to retry_interval for the outcome, num_retries times. Clicks that fail (intercepted, not
+    # interactable, ...) are retried with backoff instead of immediately, other errors are raised. The whole call has a
+    # deadline of num_retries * (retry_interval + the overhead of an attempt) plus the longest backoff between them
+    def __click_until(self, click, wait_for_outcome, retry_interval: float, num_retries: int) -> bool:
+        def click_and_wait_for_outcome(attempt_timeout: float):
+            click()
+            wait_for_outcome(attempt_timeout)
+        if num_retries <= 0:
+            return False
+        timeout = (num_retries * (retry_interval + WrappedElement.__CLICK_ATTEMPT_OVERHEAD_SECONDS)
+                   + get_max_backoff_seconds(num_retries))
+        try:
+            retry_until_deadline(click_and_wait_for_outcome, timeout=timeout,
+                                 attempt_timeout=retry_interval, max_attempts=num_retries,
+                                 name=f"{click.__name__} until outcome")
+            return True
+        except TimeoutException as error:
+            log.info("Clicking the Element located by %s: '%s' did not have the expected outcome. %s",
+                     self.__by, self.__locator, error.msg)
+            return False
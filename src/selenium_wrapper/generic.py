@@ -1,17 +1,153 @@
+import asyncio
+import random
+import threading
 import time
 import platform
 
+from selenium.common import (ElementClickInterceptedException, ElementNotInteractableException,
+                             NoSuchElementException, StaleElementReferenceException, TimeoutException)
 from selenium.webdriver import Keys
 
+from src.selenium_wrapper import wrapper_logging as log
 
-def retry_function_until_success(function, retry_interval: float, num_retries: int) -> bool:
-    for i in range(num_retries):
+# Failures that may go away by themselves: the page is still rendering, an overlay is fading out, and so on.
+# Anything else (a broken session, a JavaScript error, a bug in the test) fails the retry at once
+RETRYABLE_EXCEPTIONS = (StaleElementReferenceException, ElementClickInterceptedException,
+                        ElementNotInteractableException, NoSuchElementException, TimeoutException)
+
+_retry_statistics = {}
+_retry_statistics_lock = threading.Lock()
+
+
+# Calls function(attempt_timeout) until it returns without a retryable exception or the deadline passes. The attempt
+# timeout is the time the function may spend on one attempt (e.g. waiting for its outcome), never more than what is
+# left until the deadline. Between attempts it sleeps with exponential backoff and jitter. Returns the result of the
+# function, raises TimeoutException from the last retryable exception when the deadline or max_attempts is reached
+def retry_until_deadline(function, timeout: float, attempt_timeout: float = None, initial_interval: float = 0.1,
+                         max_interval: float = 2.0, backoff_factor: float = 2.0, jitter: float = 0.5,
+                         max_attempts: int = None, retryable: tuple = RETRYABLE_EXCEPTIONS, name: str = None):
+    name = name or getattr(function, "__qualname__", "<function>")
+    started_at = time.monotonic()
+    deadline = started_at + timeout
+    interval = initial_interval
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = max(deadline - time.monotonic(), 0)
+        attempt_started_at = time.monotonic()
+        try:
+            result = function(remaining if attempt_timeout is None else min(attempt_timeout, remaining))
+        except retryable as error:
+            last_error = error
+            log.debug("Attempt %s of %s failed after %.3f seconds: %s", attempt, name,
+                      time.monotonic() - attempt_started_at, type(error).__name__)
+        except Exception:
+            _record_retry(name, attempt, time.monotonic() - started_at, "fatal")
+            raise
+        else:
+            _record_success(name, attempt, started_at)
+            return result
+        sleep = _get_backoff_sleep(interval, max_interval, jitter)
+        if (max_attempts is not None and attempt >= max_attempts) or time.monotonic() + sleep >= deadline:
+            raise _get_exhausted_error(name, attempt, started_at, last_error) from last_error
+        time.sleep(sleep)
+        interval *= backoff_factor
+
+
+# retry_until_deadline() for coroutine functions: awaits function(attempt_timeout) and sleeps without blocking the
+# event loop. Same backoff, retryable exceptions and statistics
+async def retry_until_deadline_async(function, timeout: float, attempt_timeout: float = None,
+                                     initial_interval: float = 0.1, max_interval: float = 2.0,
+                                     backoff_factor: float = 2.0, jitter: float = 0.5, max_attempts: int = None,
+                                     retryable: tuple = RETRYABLE_EXCEPTIONS, name: str = None):
+    name = name or getattr(function, "__qualname__", "<function>")
+    started_at = time.monotonic()
+    deadline = started_at + timeout
+    interval = initial_interval
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = max(deadline - time.monotonic(), 0)
+        attempt_started_at = time.monotonic()
         try:
-            function()
-            return True
-        except:
-            time.sleep(retry_interval)
-    return False
+            result = await function(remaining if attempt_timeout is None else min(attempt_timeout, remaining))
+        except retryable as error:
+            last_error = error
+            log.debug("Attempt %s of %s failed after %.3f seconds: %s", attempt, name,
+                      time.monotonic() - attempt_started_at, type(error).__name__)
+        except Exception:
+            _record_retry(name, attempt, time.monotonic() - started_at, "fatal")
+            raise
+        else:
+            _record_success(name, attempt, started_at)
+            return result
+        sleep = _get_backoff_sleep(interval, max_interval, jitter)
+        if (max_attempts is not None and attempt >= max_attempts) or time.monotonic() + sleep >= deadline:
+            raise _get_exhausted_error(name, attempt, started_at, last_error) from last_error
+        await asyncio.sleep(sleep)
+        interval *= backoff_factor
+
+
+def _get_backoff_sleep(interval: float, max_interval: float, jitter: float) -> float:
+    return min(interval, max_interval) * (1 + random.uniform(-jitter, jitter))
+
+
+def _record_success(name: str, attempt: int, started_at: float):
+    _record_retry(name, attempt, time.monotonic() - started_at, "succeeded")
+    if attempt > 1:
+        log.info("%s succeeded after %s attempts in %.3f seconds", name, attempt, time.monotonic() - started_at)
+
+
+def _get_exhausted_error(name: str, attempt: int, started_at: float, last_error: Exception) -> TimeoutException:
+    _record_retry(name, attempt, time.monotonic() - started_at, "exhausted")
+    return TimeoutException(f"{name} did not succeed after {attempt} attempts in "
+                            f"{time.monotonic() - started_at:.3f} seconds. Last error: {type(last_error).__name__}")
+
+
+# The longest retry_until_deadline() sleeps in total between max_attempts attempts with the same backoff arguments
+def get_max_backoff_seconds(max_attempts: int, initial_interval: float = 0.1, max_interval: float = 2.0,
+                            backoff_factor: float = 2.0, jitter: float = 0.5) -> float:
+    total = 0.0
+    interval = initial_interval
+    for _ in range(max_attempts - 1):
+        total += min(interval, max_interval)
+        interval = min(interval * backoff_factor, max_interval)
+    return total * (1 + jitter)
+
+
+def _record_retry(name: str, attempts: int, elapsed: float, outcome: str):
+    with _retry_statistics_lock:
+        statistics = _retry_statistics.setdefault(name, {"calls": 0, "attempts": 0, "succeeded": 0, "exhausted": 0,
+                                                         "fatal": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        statistics["calls"] += 1
+        statistics["attempts"] += attempts
+        statistics[outcome] += 1
+        statistics["total_seconds"] += elapsed
+        statistics["max_seconds"] = max(statistics["max_seconds"], elapsed)
+
+
+# Attempts and latency of every retried operation since the start (or the last reset), by operation name
+def get_retry_statistics() -> dict:
+    with _retry_statistics_lock:
+        return {name: dict(statistics) for name, statistics in _retry_statistics.items()}
+
+
+def reset_retry_statistics():
+    with _retry_statistics_lock:
+        _retry_statistics.clear()
+
+
+# Kept for existing callers: retries any Exception (not just the retryable ones) with a fixed interval
+def retry_function_until_success(function, retry_interval: float, num_retries: int) -> bool:
+    if num_retries <= 0:
+        return False
+    try:
+        retry_until_deadline(lambda _: function(), timeout=float("inf"), initial_interval=retry_interval,
+                             backoff_factor=1, jitter=0, max_attempts=num_retries, retryable=(Exception,),
+                             name=getattr(function, "__qualname__", None))
+        return True
+    except TimeoutException:
+        return False
 
 
 def get_os_name():
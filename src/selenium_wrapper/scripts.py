@@ -0,0 +1,203 @@
+# JavaScript shared by the in-browser features of the wrapper (waits, bulk reads, prefetch, ...)
+
+# Defines findAll(by, locator, root) and find(by, locator, root) for every selenium By strategy, and isVisible(element)
+LOCATOR_HELPERS_JS = """
+function findAll(by, locator, root) {
+    root = root || document;
+    var matches;
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(locator));
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('[id="' + CSS.escape(locator) + '"]'));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + CSS.escape(locator) + '"]'));
+        case 'class name':
+            return Array.prototype.slice.call(root.querySelectorAll('.' + CSS.escape(locator)));
+        case 'tag name':
+            return Array.prototype.slice.call(root.getElementsByTagName(locator));
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (link) {
+                var text = (link.innerText || link.textContent || '').trim();
+                return by === 'link text' ? text === locator : text.indexOf(locator) !== -1;
+            });
+        case 'xpath':
+            matches = [];
+            var result = document.evaluate(locator, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength; i++) {
+                if (result.snapshotItem(i).nodeType === Node.ELEMENT_NODE) {
+                    matches.push(result.snapshotItem(i));
+                }
+            }
+            return matches;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function find(by, locator, root) {
+    return findAll(by, locator, root)[0] || null;
+}
+function isVisible(element) {
+    if (!element || !element.isConnected || element.getClientRects().length === 0) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.visibility !== 'collapse' && style.opacity !== '0';
+}
+"""
+
+# Page.fill_form(): sets every field of arguments[0] ([[by, locator] or element, value]) the way a user would, firing
+# the input and change events frameworks listen to. Returns one status per field: 'filled', 'keystrokes' when the field
+# needs real key presses (file inputs, rich text editors, input masks) or the reason it can't be filled
+FILL_FORM_JS = "/* fill form */" + LOCATOR_HELPERS_JS + """
+function setValue(element, value) {
+    // React tracks the value assigned to the element itself, so assign it through the setter of the prototype
+    var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, value);
+    } else {
+        element.value = value;
+    }
+}
+function fire(element, type) {
+    element.dispatchEvent(new Event(type, {bubbles: true}));
+}
+function fill(element, value) {
+    if (!element) {
+        return 'keystrokes';
+    }
+    if (element.disabled) {
+        return 'disabled';
+    }
+    var tag = element.tagName.toLowerCase();
+    var type = (element.getAttribute('type') || '').toLowerCase();
+    if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+        if (element.checked !== !!value) {
+            element.click();
+        }
+        return element.checked === !!value ? 'filled' : 'not changed by a click';
+    }
+    if (tag === 'select') {
+        var wanted = (Array.isArray(value) ? value : [value]).map(String);
+        var matched = 0;
+        Array.prototype.forEach.call(element.options, function (option) {
+            var selected = wanted.indexOf(option.value) !== -1 || wanted.indexOf(option.text.trim()) !== -1;
+            if (selected && (element.multiple || matched === 0)) {
+                option.selected = true;
+                matched++;
+            } else if (element.multiple) {
+                option.selected = false;
+            }
+        });
+        if (matched === 0) {
+            return 'no option ' + wanted.join(', ');
+        }
+        fire(element, 'input');
+        fire(element, 'change');
+        return 'filled';
+    }
+    if (element.isContentEditable || type === 'file' || (tag !== 'input' && tag !== 'textarea')) {
+        return 'keystrokes';
+    }
+    if (element.readOnly) {
+        return 'read-only';
+    }
+    var text = value === null || value === undefined ? '' : String(value);
+    element.focus();
+    setValue(element, text);
+    fire(element, 'input');
+    fire(element, 'change');
+    element.blur();
+    // Input masks and maxlength may rewrite the value, those fields are typed into instead
+    return element.value === text ? 'filled' : 'keystrokes';
+}
+return arguments[0].map(function (field) {
+    try {
+        return fill(Array.isArray(field[0]) ? find(field[0][0], field[0][1]) : field[0], field[1]);
+    } catch (error) {
+        return 'error: ' + error.message;
+    }
+});
+"""
+
+# RowStream: optionally scrolls the container (arguments[0], the page when null) one step and waits for the list to
+# render, then extracts the rendered rows in one pass. Rows whose key is in arguments[5] (the rows rendered by the
+# previous step) are not extracted again. Calls back with the new rows as [key, text, {attribute: value}], the keys of
+# all rendered rows, whether the container is scrolled to the end and its scroll position
+STREAM_ROWS_JS = "/* stream rows */" + LOCATOR_HELPERS_JS + """
+var done = arguments[arguments.length - 1];
+var container = arguments[0], by = arguments[1], locator = arguments[2], keyAttribute = arguments[3],
+    attributes = arguments[4], previousKeys = arguments[5], scroll = arguments[6], settleMs = arguments[7],
+    scrollStep = arguments[8];
+var scroller = container || document.scrollingElement || document.documentElement;
+var root = container || document;
+function collect() {
+    var skip = {};
+    previousKeys.forEach(function (key) { skip[key] = true; });
+    var rows = [], keys = [];
+    findAll(by, locator, root).forEach(function (row) {
+        var key = keyAttribute ? row.getAttribute(keyAttribute) : null;
+        var text = key === null ? row.innerText : null;
+        key = key === null ? text : key;
+        keys.push(key);
+        if (skip[key]) {
+            return;
+        }
+        var values = {};
+        attributes.forEach(function (name) { values[name] = row.getAttribute(name); });
+        rows.push([key, text === null ? row.innerText : text, values]);
+    });
+    done({rows: rows, keys: keys, position: scroller.scrollTop,
+          atEnd: Math.ceil(scroller.scrollTop + scroller.clientHeight) >= scroller.scrollHeight - 1});
+}
+if (!scroll) {
+    collect();
+} else {
+    scroller.scrollTop = scroller.scrollTop + (scrollStep || Math.max(Math.floor(scroller.clientHeight * 0.8), 1));
+    // The list renders the rows scrolled into view (or loads more) on its own schedule: collect after the first DOM
+    // change and the next frame, or after settleMs when nothing changes
+    var timer = null;
+    var observer = new MutationObserver(function () {
+        observer.disconnect();
+        clearTimeout(timer);
+        requestAnimationFrame(collect);
+    });
+    observer.observe(container || document.body, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(function () {
+        observer.disconnect();
+        collect();
+    }, settleMs);
+}
+"""
+
+# Page.take_snapshot(): the elements of the current document in document order as [tag, attributes, visible, layout
+# (0 inline, 1 block, 2 table cell), [width, height], value, flags (1 checked, 2 selected, 4 disabled), content].
+# Content lists the text of the child text nodes and the indexes of the child elements in order
+SNAPSHOT_JS = "/* snapshot */" + LOCATOR_HELPERS_JS + """
+var nodes = [];
+var textless = {SCRIPT: true, STYLE: true, NOSCRIPT: true, TEMPLATE: true};
+function serialize(element) {
+    var index = nodes.length;
+    var attributes = {};
+    for (var i = 0; i < element.attributes.length; i++) {
+        attributes[element.attributes[i].name] = element.attributes[i].value;
+    }
+    var display = window.getComputedStyle(element).display;
+    var rect = element.getBoundingClientRect();
+    var content = [];
+    nodes.push([element.tagName.toLowerCase(), attributes, isVisible(element),
+                display === 'table-cell' ? 2 : (/^(inline|contents|none)/.test(display) ? 0 : 1),
+                [rect.width, rect.height], typeof element.value === 'string' ? element.value : null,
+                (element.checked ? 1 : 0) | (element.selected ? 2 : 0) | (element.disabled ? 4 : 0), content]);
+    for (var child = element.firstChild; child; child = child.nextSibling) {
+        if (child.nodeType === Node.ELEMENT_NODE) {
+            content.push(serialize(child));
+        } else if (child.nodeType === Node.TEXT_NODE && !textless[element.tagName]) {
+            content.push(child.data);
+        }
+    }
+    return index;
+}
+serialize(document.documentElement);
+return {url: location.href, title: document.title, nodes: nodes};
+"""
@@ -0,0 +1,139 @@
+import os
+import time
+from weakref import WeakSet
+
+from selenium.common import (JavascriptException, StaleElementReferenceException, TimeoutException,
+                             UnknownMethodException, WebDriverException)
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.scripts import LOCATOR_HELPERS_JS
+
+# Evaluates the condition on every DOM mutation (coalesced to one check per animation frame) and on a slow timer for
+# state that mutations don't cover (URL, layout). Calls back as soon as the condition holds or the slice runs out
+WATCH_SCRIPT = LOCATOR_HELPERS_JS + """
+var done = arguments[arguments.length - 1];
+var args = arguments[0];
+var condition = __CONDITION__;
+var finished = false, scheduled = false, observer = null, timer = null, ticker = null;
+function finish(outcome) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    clearInterval(ticker);
+    done(outcome);
+}
+function evaluate() {
+    scheduled = false;
+    try {
+        var value = condition(args);
+        if (value) { finish({met: true, value: value}); }
+    } catch (error) {
+        finish({met: false, error: String(error)});
+    }
+}
+function schedule() {
+    if (!scheduled && !finished) {
+        scheduled = true;
+        (window.requestAnimationFrame || setTimeout)(evaluate);
+    }
+}
+evaluate();
+if (!finished) {
+    observer = new MutationObserver(schedule);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    ticker = setInterval(schedule, 100);
+    timer = setTimeout(function () { finish({met: false}); }, arguments[1]);
+}
+"""
+
+# What browsers report when the document a script runs in goes away, e.g. by a navigation or a reload
+_NAVIGATION_ERROR_MESSAGES = ("document unloaded", "document was unloaded", "execution context was destroyed",
+                              "cannot find context with specified id", "inspected target navigated or closed")
+
+CHECK_SCRIPT = LOCATOR_HELPERS_JS + """
+try {
+    return {value: (__CONDITION__)(arguments[0])};
+} catch (error) {
+    return {error: String(error)};
+}
+"""
+
+
+class BrowserWait:
+    # "event" switches the wrapper's waits to this engine; the default "webdriver" keeps WebDriverWait polling
+    __ENGINE = os.getenv("WAIT_ENGINE", "webdriver").lower()
+    # Upper bound for one async script call. Must stay below the session's script timeout (30 seconds by default)
+    __SLICE_SECONDS = float(os.getenv("EVENT_WAIT_SLICE_SECONDS", "10"))
+    __MIN_POLL_INTERVAL_SECONDS = 0.05
+    __MAX_POLL_INTERVAL_SECONDS = 0.5
+    __drivers_without_async_scripts = WeakSet()
+
+    def __init__(self, driver: WebDriver, timeout: float):
+        self.__driver = driver
+        self.__timeout = timeout
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return BrowserWait.__ENGINE == "event"
+
+    @staticmethod
+    def get_slice_seconds() -> float:
+        return BrowserWait.__SLICE_SECONDS
+
+    def until(self, condition: str, *args, message: str = ""):
+        deadline = time.monotonic() + self.__timeout
+        if self.__driver in BrowserWait.__drivers_without_async_scripts:
+            return self.__poll_until(condition, args, deadline, message)
+        while True:
+            slice_seconds = min(max(deadline - time.monotonic(), 0), BrowserWait.__SLICE_SECONDS)
+            try:
+                outcome = self.__driver.execute_async_script(
+                    WATCH_SCRIPT.replace("__CONDITION__", condition), list(args), int(slice_seconds * 1000))
+            except UnknownMethodException:
+                log.info("The driver does not support async scripts. Falling back to polling")
+                BrowserWait.__drivers_without_async_scripts.add(self.__driver)
+                return self.__poll_until(condition, args, deadline, message)
+            except WebDriverException as error:
+                if not BrowserWait.is_interrupted(error):
+                    raise
+                # The page navigated away while the watcher was installed. Watch the new document
+                log.debug("In-browser wait was interrupted: %s", error.msg)
+                outcome = None
+                time.sleep(BrowserWait.__MIN_POLL_INTERVAL_SECONDS)
+            if outcome and outcome.get("met"):
+                return outcome["value"]
+            if outcome and outcome.get("error"):
+                raise JavascriptException(outcome["error"])
+            if time.monotonic() >= deadline:
+                raise TimeoutException(message)
+
+    def __poll_until(self, condition: str, args: tuple, deadline: float, message: str):
+        interval = BrowserWait.__MIN_POLL_INTERVAL_SECONDS
+        while True:
+            try:
+                outcome = self.__driver.execute_script(CHECK_SCRIPT.replace("__CONDITION__", condition), list(args))
+            except WebDriverException as error:
+                if not BrowserWait.is_interrupted(error):
+                    raise
+                log.debug("In-browser check was interrupted: %s", error.msg)
+                outcome = None
+            if outcome and outcome.get("value"):
+                return outcome["value"]
+            if outcome and outcome.get("error"):
+                raise JavascriptException(outcome["error"])
+            if time.monotonic() + interval > deadline:
+                raise TimeoutException(message)
+            time.sleep(interval)
+            interval = min(interval * 1.5, BrowserWait.__MAX_POLL_INTERVAL_SECONDS)
+
+    # Only a navigation or a re-rendered Element is worth waiting out. Everything else (closed window, invalid
+    # session, script errors) fails the same way on the next attempt
+    @staticmethod
+    def is_interrupted(error: WebDriverException) -> bool:
+        # A slice the browser cut short arrives as a script timeout
+        if isinstance(error, (StaleElementReferenceException, TimeoutException)):
+            return True
+        message = (error.msg or "").lower()
+        return any(navigation_message in message for navigation_message in _NAVIGATION_ERROR_MESSAGES)
@@ -0,0 +1,133 @@
+from src.selenium_wrapper.wait import conditions
+
+# Composite condition templates for BrowserWait. __CONDITIONS__ is replaced with a JS array of condition functions;
+# args[i] is the argument list of the i-th condition
+_ANY_OF = """function (args) {
+    var conditions = __CONDITIONS__;
+    for (var i = 0; i < conditions.length; i++) {
+        if (conditions[i](args[i])) { return {index: i}; }
+    }
+    return null;
+}"""
+
+_ALL_OF = """function (args) {
+    var conditions = __CONDITIONS__;
+    for (var i = 0; i < conditions.length; i++) {
+        if (!conditions[i](args[i])) { return null; }
+    }
+    return {index: -1};
+}"""
+
+
+# Runs a condition of a child Element. args[0] is the [by, locator, search the shadow root] chain of its ancestors,
+# outermost first, args[1] the arguments of the condition. find() and findAll() search from the innermost ancestor
+_IN_PARENT = """function (args) {
+    var root = document;
+    for (var i = 0; i < args[0].length && root; i++) {
+        var parent = find(args[0][i][0], args[0][i][1], root);
+        root = parent && args[0][i][2] ? parent.shadowRoot : parent;
+    }
+    return (function (find, findAll) {
+        return (__CONDITION__)(args[1]);
+    })(function (by, locator) { return root ? find(by, locator, root) : null; },
+       function (by, locator) { return root ? findAll(by, locator, root) : []; });
+}"""
+
+
+class Condition:
+
+    # frame_chain is the chain of frame Elements the condition is evaluated in, see WrappedElement.get_frame_chain()
+    def __init__(self, description: str, script: str, *args, frame_chain: tuple = ()):
+        self.__description = description
+        self.__script = script
+        self.__args = list(args)
+        self.__frame_chain = frame_chain
+
+    # Element conditions
+
+    @staticmethod
+    def visible(element) -> "Condition":
+        by, locator = element.get_by_and_locator()
+        return Condition.__of_element(element, f"Element located by {by}: '{locator}' is visible",
+                                      conditions.VISIBILITY_OF_ELEMENT)
+
+    @staticmethod
+    def invisible(element) -> "Condition":
+        by, locator = element.get_by_and_locator()
+        return Condition.__of_element(element, f"Element located by {by}: '{locator}' is invisible",
+                                      conditions.INVISIBILITY_OF_ELEMENT)
+
+    @staticmethod
+    def text_present(element, text: str) -> "Condition":
+        by, locator = element.get_by_and_locator()
+        return Condition.__of_element(element, f"Text '{text}' is present in the Element located by {by}: '{locator}'",
+                                      conditions.TEXT_IN_ELEMENT, text)
+
+    @staticmethod
+    def attribute_contains(element, attribute: str, text: str) -> "Condition":
+        by, locator = element.get_by_and_locator()
+        return Condition.__of_element(
+            element, f"Attribute '{attribute}' of the Element located by {by}: '{locator}' contains '{text}'",
+            conditions.TEXT_IN_ATTRIBUTE, attribute, text)
+
+    # Child Elements are searched from their ancestors, which are located again on every check
+    @staticmethod
+    def __of_element(element, description: str, script: str, *args) -> "Condition":
+        args = list(element.get_by_and_locator()) + list(args)
+        ancestors = []
+        child = element
+        while child.get_parent() is not None:
+            ancestors.insert(0, list(child.get_parent().get_by_and_locator()) + [child.is_in_shadow_root()])
+            child = child.get_parent()
+        if ancestors:
+            script, args = _IN_PARENT.replace("__CONDITION__", script), [ancestors, args]
+        return Condition(description, script, *args, frame_chain=element.get_frame_chain())
+
+    def get_frame_chain(self) -> tuple:
+        return self.__frame_chain
+
+    # Page conditions
+
+    @staticmethod
+    def url_matches(pattern: str) -> "Condition":
+        return Condition(f"URL matches the pattern '{pattern}'", conditions.URL_MATCHES, pattern)
+
+    @staticmethod
+    def url_contains(text: str) -> "Condition":
+        return Condition(f"URL contains '{text}'", conditions.URL_CONTAINS, text)
+
+    @staticmethod
+    def title_is(title: str) -> "Condition":
+        return Condition(f"Title is '{title}'", conditions.TITLE_IS, title)
+
+    # Composition
+
+    # The conditions are evaluated by one script, so they must all be in the same frame. Page conditions are evaluated
+    # in the top-level document
+    @staticmethod
+    def get_common_frame_chain(*conditions_list: "Condition") -> tuple:
+        frame_chains = {Condition.__get_frame_key(condition): condition.__frame_chain for condition in conditions_list}
+        if len(frame_chains) > 1:
+            raise RuntimeError(f"The conditions {list(conditions_list)} are in different frames. Conditions can only be "
+                               f"waited for together when they are all in the same frame")
+        return next(iter(frame_chains.values()), ())
+
+    @staticmethod
+    def __get_frame_key(condition: "Condition") -> tuple:
+        return tuple(frame.get_by_and_locator() for frame in condition.__frame_chain)
+
+    @staticmethod
+    def compose_any(*conditions_list: "Condition") -> (str, list):
+        return Condition.__compose(_ANY_OF, conditions_list)
+
+    @staticmethod
+    def compose_all(*conditions_list: "Condition") -> (str, list):
+        return Condition.__compose(_ALL_OF, conditions_list)
+
+    @staticmethod
+    def __compose(template: str, conditions_list) -> (str, list):
+        scripts = ",\n".join(condition.__script for condition in conditions_list)
+        return template.replace("__CONDITIONS__", f"[{scripts}]"), [condition.__args for condition in conditions_list]
+
+    def __repr__(self):
+        return self.__description
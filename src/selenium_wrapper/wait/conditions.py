@@ -0,0 +1,72 @@
+# In-browser counterparts of selenium's expected_conditions used by BrowserWait. Each one is a JavaScript function
+# taking the argument list passed to BrowserWait.until() and returning a truthy value once the condition holds.
+# Element conditions receive (by, locator, ...) and may use the helpers from scripts.LOCATOR_HELPERS_JS
+
+PRESENCE_OF_ELEMENT = "function (args) { return find(args[0], args[1]); }"
+
+VISIBILITY_OF_ELEMENT = """function (args) {
+    var element = find(args[0], args[1]);
+    return isVisible(element) ? element : null;
+}"""
+
+INVISIBILITY_OF_ELEMENT = "function (args) { return !isVisible(find(args[0], args[1])); }"
+
+ABSENCE_OF_ELEMENT = "function (args) { return find(args[0], args[1]) === null; }"
+
+ELEMENT_TO_BE_CLICKABLE = """function (args) {
+    var element = find(args[0], args[1]);
+    return isVisible(element) && !element.disabled ? element : null;
+}"""
+
+ELEMENT_TO_BE_SELECTED = """function (args) {
+    var element = find(args[0], args[1]);
+    return !!element && (element.checked === true || element.selected === true);
+}"""
+
+ATTRIBUTE_IN_ELEMENT = """function (args) {
+    var element = find(args[0], args[1]);
+    return !!element && element.hasAttribute(args[2]);
+}"""
+
+TEXT_IN_ELEMENT = """function (args) {
+    var element = find(args[0], args[1]);
+    return !!element && (element.innerText || '').indexOf(args[2]) !== -1;
+}"""
+
+TEXT_IN_ATTRIBUTE = """function (args) {
+    var element = find(args[0], args[1]);
+    var value = element ? element.getAttribute(args[2]) : null;
+    return value !== null && value.indexOf(args[3]) !== -1;
+}"""
+
+TEXT_IN_VALUE = """function (args) {
+    var element = find(args[0], args[1]);
+    return !!element && String(element.value || '').indexOf(args[2]) !== -1;
+}"""
+
+VISIBILITY_OF_ALL_ELEMENTS = """function (args) {
+    var elements = findAll(args[0], args[1]);
+    return elements.length > 0 && elements.every(isVisible) ? elements : null;
+}"""
+
+PRESENCE_OF_ALL_ELEMENTS = """function (args) {
+    var elements = findAll(args[0], args[1]);
+    return elements.length > 0 ? elements : null;
+}"""
+
+VISIBILITY_OF_ANY_ELEMENTS = """function (args) {
+    var elements = findAll(args[0], args[1]).filter(isVisible);
+    return elements.length > 0 ? elements : null;
+}"""
+
+TITLE_IS = "function (args) { return document.title === args[0]; }"
+
+TITLE_CONTAINS = "function (args) { return document.title.indexOf(args[0]) !== -1; }"
+
+URL_TO_BE = "function (args) { return window.location.href === args[0]; }"
+
+URL_CHANGES = "function (args) { return window.location.href !== args[0]; }"
+
+URL_CONTAINS = "function (args) { return window.location.href.indexOf(args[0]) !== -1; }"
+
+URL_MATCHES = "function (args) { return new RegExp(args[0]).test(window.location.href); }"
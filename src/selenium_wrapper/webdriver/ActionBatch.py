@@ -0,0 +1,139 @@
+import threading
+from typing import Callable, Optional
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver import ActionChains
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+
+# ActionChains methods that can be queued. Arguments that are WrappedElements are resolved when the batch is performed
+_QUEUEABLE_ACTIONS = frozenset((
+    "click", "click_and_hold", "context_click", "double_click", "drag_and_drop", "drag_and_drop_by_offset", "key_down",
+    "key_up", "move_by_offset", "move_to_element", "move_to_element_with_offset", "pause", "release", "send_keys",
+    "send_keys_to_element", "scroll_to_element", "scroll_by_amount", "scroll_from_origin"))
+
+
+# Pointer, key and wheel input queued for one driver. The browser has a single input state per session, so every
+# WrappedElement and Page of a driver shares one batch: steps queued on different elements are sent together in one
+# W3C "perform actions" command. A performed batch is kept as the last gesture, which can be replayed later
+class ActionBatch:
+
+    # on_perform is called after every command sent to the browser, e.g. to mark page state read before as stale
+    def __init__(self, driver: WebDriver, on_perform: Optional[Callable[[], None]] = None):
+        self.__driver = driver
+        self.__on_perform = on_perform
+        # (ActionChains method name, arguments)
+        self.__steps: list = []
+        self.__last_gesture: tuple = ()
+        self.__lock = threading.Lock()
+
+    def add(self, action: str, *args) -> "ActionBatch":
+        if action not in _QUEUEABLE_ACTIONS:
+            raise RuntimeError(f"Unsupported action: {action}. Supported actions: {sorted(_QUEUEABLE_ACTIONS)}")
+        with self.__lock:
+            self.__steps.append((action, args))
+        return self
+
+    def get_pending_steps(self) -> tuple:
+        with self.__lock:
+            return tuple(self.__steps)
+
+    def get_last_gesture(self) -> tuple:
+        return self.__last_gesture
+
+    def perform(self):
+        with self.__lock:
+            steps, self.__steps = tuple(self.__steps), []
+        if not steps:
+            return
+        log.debug("Performing %s queued actions", len(steps))
+        chain, resolved = self.__build(steps)
+        later_element_ids = self.__get_element_ids_after_first_tick(chain)
+        presses_in_first_tick = self.__presses_in_first_tick(chain)
+        try:
+            chain.perform()
+        except StaleElementReferenceException:
+            elements = self.__get_elements(steps)
+            if not elements or self.__has_stale_element(resolved, later_element_ids):
+                # The browser dispatches the actions tick by tick, so buttons or keys of the ticks before the stale
+                # Element may be held down
+                self.release()
+                raise
+            if presses_in_first_tick:
+                self.release()
+            # Typically the page re-rendered or navigated, so the Elements may not be back yet
+            log.info("An Element of the queued actions went stale. Waiting for the Elements to be present again")
+            for element in elements:
+                element.reset_cached_web_element().wait_for_presence()
+            try:
+                self.__build(steps)[0].perform()
+            except Exception:
+                self.release()
+                raise
+        self.__last_gesture = steps
+        self.__notify()
+
+    def replay(self, gesture: tuple):
+        log.debug("Replaying a gesture of %s actions", len(gesture))
+        with self.__lock:
+            self.__steps.extend(gesture)
+        self.perform()
+
+    # Drops the queued steps and releases every key and button the browser still holds down
+    def release(self):
+        with self.__lock:
+            self.__steps = []
+        self.__driver.execute(Command.W3C_CLEAR_ACTIONS)
+        self.__notify()
+
+    def __notify(self):
+        if self.__on_perform is not None:
+            self.__on_perform()
+
+    # The chain and the WebElements its Elements resolved to
+    def __build(self, steps: tuple) -> (ActionChains, dict):
+        chain = ActionChains(self.__driver)
+        resolved = {}
+        for action, args in steps:
+            getattr(chain, action)(*[self.__resolve(arg, resolved) for arg in args])
+        return chain, resolved
+
+    # Ids of the WebElements the ticks after the first one move or scroll relative to. Those ticks only run once the
+    # ones before were dispatched. Read before performing, which empties the chain
+    @staticmethod
+    def __get_element_ids_after_first_tick(chain: ActionChains) -> set:
+        return {element_id for device in chain.w3c_actions.devices for action in device.actions[1:]
+                if isinstance(action, dict) and isinstance(action.get("origin"), dict)
+                for element_id in action["origin"].values()}
+
+    # A key or button pressed in the first tick may be dispatched before the stale Element of the same tick
+    @staticmethod
+    def __presses_in_first_tick(chain: ActionChains) -> bool:
+        return any(isinstance(action, dict) and action.get("type") in ("keyDown", "pointerDown")
+                   for device in chain.w3c_actions.devices for action in device.actions[:1])
+
+    # Asks the browser about the WebElements with the given ids
+    @staticmethod
+    def __has_stale_element(resolved: dict, element_ids: set) -> bool:
+        for web_element in resolved.values():
+            if web_element.id in element_ids:
+                try:
+                    web_element.tag_name
+                except StaleElementReferenceException:
+                    return True
+        return False
+
+    # Each Element is resolved once per batch, however many steps refer to it
+    @staticmethod
+    def __resolve(arg, resolved: dict):
+        if not hasattr(arg, "get_web_element"):
+            return arg
+        if id(arg) not in resolved:
+            resolved[id(arg)] = arg.get_web_element()
+        return resolved[id(arg)]
+
+    @staticmethod
+    def __get_elements(steps: tuple) -> list:
+        return list({id(arg): arg for _, args in steps for arg in args if hasattr(arg, "get_web_element")}.values())
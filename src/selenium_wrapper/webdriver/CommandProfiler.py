@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import threading
+import time
+from weakref import WeakKeyDictionary
+
+from selenium.webdriver.remote.command import Command
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.CommandTrace import CommandTraceRecorder
+
+
+class CommandProfiler:
+    __ENABLED = os.getenv("PROFILE_COMMANDS", "").lower() in ("true", "1", "yes", "on", "enabled")
+    # Where to write the JSON report when a session ends. Session id is appended to keep sessions apart
+    __REPORT_FILE = os.getenv("PROFILE_REPORT_FILE")
+    __profilers = WeakKeyDictionary()
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        # (command, latency seconds, request bytes, response bytes, wrapper method, locator, wrapper call id)
+        self.__records: list = []
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return CommandProfiler.__ENABLED
+
+    @staticmethod
+    def for_driver(driver):
+        return CommandProfiler.__profilers.get(driver)
+
+    @staticmethod
+    def attach(driver) -> "CommandProfiler":
+        profiler = CommandProfiler()
+        CommandProfiler.__profilers[driver] = profiler
+        return profiler
+
+    # Recording
+
+    def record(self, command: str, latency: float, params, response):
+        operation = log.get_current_operation()
+        record = (command, latency, _get_size(params), _get_size(response),
+                  operation.method if operation else None,
+                  _format_locator(operation.locator) if operation else None,
+                  operation.call_id if operation else None)
+        with self.__lock:
+            self.__records.append(record)
+
+    def reset(self):
+        with self.__lock:
+            self.__records = []
+
+    # Reports
+
+    def get_report(self) -> dict:
+        with self.__lock:
+            records = list(self.__records)
+        return {
+            "commands": _aggregate(records, lambda record: record[0], per_wrapper_call=False),
+            "wrapper_methods": _aggregate(records, lambda record: record[4] or "<outside wrapper>",
+                                          per_wrapper_call=True),
+            "locators": _aggregate(records, lambda record: record[5], per_wrapper_call=True),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.get_report(), indent=2)
+
+    def to_table(self) -> str:
+        report = self.get_report()
+        lines = []
+        for section, title in (("commands", "WebDriver command"), ("wrapper_methods", "Wrapper method")):
+            lines.append(f"{title:<48} {'calls':>7} {'trips':>7} {'trips/call':>10} {'total ms':>10} "
+                         f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req B':>9} {'resp B':>9}")
+            for name, stats in sorted(report[section].items(), key=lambda item: -item[1]["total_ms"]):
+                lines.append(f"{name[:48]:<48} {stats['calls']:>7} {stats['round_trips']:>7} "
+                             f"{stats['round_trips_per_call']:>10.2f} {stats['total_ms']:>10.1f} "
+                             f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+                             f"{stats['request_bytes']:>9} {stats['response_bytes']:>9}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def report_session_end(self, session_id: str):
+        log.info("WebDriver command profile of session %s:\n%s", session_id, log.LazyCall(self.to_table))
+        if CommandProfiler.__REPORT_FILE:
+            root, extension = os.path.splitext(CommandProfiler.__REPORT_FILE)
+            with open(f"{root}.{session_id}{extension or '.json'}", "w") as report_file:
+                report_file.write(self.to_json())
+
+
+def instrument_command_executor(driver):
+    execute = driver.command_executor.execute
+    profiler = CommandProfiler.attach(driver) if CommandProfiler.is_enabled() else None
+    recorder = CommandTraceRecorder.attach(driver) if CommandTraceRecorder.is_enabled() else None
+
+    def instrumented_execute(command, params):
+        log.count_round_trip()
+        if profiler is None and recorder is None:
+            return execute(command, params)
+        # RemoteConnection removes the URL parameters (session id, element id, ...) from params while sending them, so
+        # sizes and traces are taken from a copy of params as the executor got them
+        request = dict(params or {})
+        started_at = time.perf_counter()
+        response = error = None
+        try:
+            response = execute(command, params)
+            return response
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            latency = time.perf_counter() - started_at
+            if profiler is not None:
+                profiler.record(command, latency, request, response)
+            if recorder is not None:
+                recorder.record(command, request, started_at, latency, response, error)
+            # Every way of ending the session (close_driver, the pool, a direct quit()) goes through this command
+            if command == Command.QUIT:
+                if profiler is not None:
+                    profiler.report_session_end(driver.session_id)
+                if recorder is not None:
+                    recorder.close()
+
+    driver.command_executor.execute = instrumented_execute
+
+
+def _get_size(payload) -> int:
+    if not payload:
+        return 0
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _format_locator(locator) -> str:
+    return None if locator is None else f"{locator[0]}: {locator[1]}"
+
+
+def _percentile(sorted_values: list, percent: float) -> float:
+    index = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def _aggregate(records: list, key, per_wrapper_call: bool) -> dict:
+    groups = {}
+    for record in records:
+        name = key(record)
+        if name is not None:
+            groups.setdefault(name, []).append(record)
+    report = {}
+    for name, group in groups.items():
+        if per_wrapper_call:
+            # Latency percentiles of whole wrapper calls, summing the commands each call issued
+            call_latencies = {}
+            for index, record in enumerate(group):
+                call_id = record[6] if record[6] is not None else f"command-{index}"
+                call_latencies[call_id] = call_latencies.get(call_id, 0.0) + record[1]
+            latencies = sorted(latency * 1000 for latency in call_latencies.values())
+        else:
+            latencies = sorted(record[1] * 1000 for record in group)
+        report[name] = {
+            "calls": len(latencies),
+            "round_trips": len(group),
+            "round_trips_per_call": len(group) / len(latencies),
+            "total_ms": sum(latencies),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "request_bytes": sum(record[2] for record in group),
+            "response_bytes": sum(record[3] for record in group),
+        }
+    return report
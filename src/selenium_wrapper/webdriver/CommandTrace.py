@@ -0,0 +1,169 @@
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from selenium.common import WebDriverException
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+
+# Trace files are JSON lines, gzip compressed when the name ends with .gz. The first line is a header, every other line
+# one command: [start offset ms, command, params, latency ms, response or {"exception": ...}, wrapper method]
+_TRACE_FORMAT = "selenium_wrapper-trace"
+_TRACE_VERSION = 1
+
+
+class CommandTraceRecorder:
+    # Session id is appended to the file name to keep sessions apart
+    __FILE = os.getenv("TRACE_COMMANDS_FILE")
+    __recorders = WeakKeyDictionary()
+
+    def __init__(self, path: str, session_id: str, capabilities: dict):
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__started_at = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.__file = _open_trace(path, "wt")
+        self.__write({"format": _TRACE_FORMAT, "version": _TRACE_VERSION, "session_id": session_id,
+                      "capabilities": capabilities, "recorded_at": time.time()})
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(CommandTraceRecorder.__FILE)
+
+    @staticmethod
+    def for_driver(driver) -> Optional["CommandTraceRecorder"]:
+        return CommandTraceRecorder.__recorders.get(driver)
+
+    @staticmethod
+    def attach(driver) -> "CommandTraceRecorder":
+        root, extension = os.path.splitext(CommandTraceRecorder.__FILE)
+        recorder = CommandTraceRecorder(f"{root}.{driver.session_id}{extension or '.jsonl'}",
+                                        driver.session_id, driver.caps)
+        CommandTraceRecorder.__recorders[driver] = recorder
+        log.info("Recording WebDriver commands to %s", recorder.get_path())
+        return recorder
+
+    def get_path(self) -> str:
+        return self.__path
+
+    def record(self, command: str, params: Optional[dict], started_at: float, latency: float, response,
+               error: Optional[BaseException]):
+        operation = log.get_current_operation()
+        outcome = {"exception": f"{type(error).__name__}: {error}"} if error is not None else response
+        self.__write([round((started_at - self.__started_at) * 1000, 3), command, _strip_session(params),
+                      round(latency * 1000, 3), outcome, operation.method if operation else None])
+
+    def close(self):
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.close()
+
+    def __write(self, entry):
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.write(line + "\n")
+
+
+# Stands in for the HTTP connection to a driver and answers every command from a recorded trace. Responses are looked
+# up by command and parameters, in recorded order, so wrapper changes that issue fewer or reordered commands still get
+# the answers the browser gave. Each answer is delayed by its recorded latency multiplied by time_scale
+class CommandReplayExecutor(RemoteConnection):
+
+    def __init__(self, trace_path: str, time_scale: float = 1.0, strict: bool = False):
+        super().__init__("http://replay.invalid", keep_alive=False, ignore_proxy=True)
+        self.__trace_path = trace_path
+        self.__time_scale = time_scale
+        self.__strict = strict
+        self.__header, self.__entries = load_trace(trace_path)
+        self.__responses = {}
+        self.__last_responses = {}
+        for entry in self.__entries:
+            self.__responses.setdefault(_get_key(entry[1], entry[2]), deque()).append(entry)
+        self.__lock = threading.Lock()
+        self.__replayed = Counter()
+        self.__unmatched = Counter()
+        self.__replayed_latency = 0.0
+        self.__started_at = None
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            return {"value": {"sessionId": self.__header["session_id"], "capabilities": self.__header["capabilities"]}}
+        with self.__lock:
+            if self.__started_at is None:
+                self.__started_at = time.perf_counter()
+            self.__replayed[command] += 1
+            entry = self.__take_entry(command, params)
+        if entry is None:
+            return {"value": None}
+        latency = entry[3] / 1000 * self.__time_scale
+        with self.__lock:
+            self.__replayed_latency += latency
+        if latency > 0:
+            time.sleep(latency)
+        if command == Command.QUIT:
+            log.info("Replayed trace %s: %s", self.__trace_path, log.LazyCall(self.get_report))
+        if "exception" in (entry[4] or {}):
+            raise WebDriverException(f"Recorded failure: {entry[4]['exception']}")
+        return json.loads(json.dumps(entry[4]))
+
+    def get_report(self) -> dict:
+        recorded = Counter(entry[1] for entry in self.__entries)
+        with self.__lock:
+            return {
+                "recorded_commands": sum(recorded.values()),
+                "replayed_commands": sum(self.__replayed.values()),
+                "unmatched_commands": dict(self.__unmatched),
+                "recorded_latency_ms": sum(entry[3] for entry in self.__entries),
+                "replayed_latency_ms": self.__replayed_latency * 1000,
+                "wall_ms": (time.perf_counter() - self.__started_at) * 1000 if self.__started_at else 0.0,
+                "commands": {command: {"recorded": recorded[command], "replayed": self.__replayed[command]}
+                             for command in sorted(set(recorded) | set(self.__replayed))},
+            }
+
+    def __take_entry(self, command: str, params: Optional[dict]) -> Optional[list]:
+        queue = self.__responses.get(_get_key(command, _strip_session(params)))
+        if queue:
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+            self.__last_responses[command] = entry
+            return entry
+        self.__unmatched[command] += 1
+        if self.__strict:
+            raise WebDriverException(f"Command {command} with parameters {params} is not in the trace "
+                                     f"{self.__trace_path}")
+        # Best effort for commands the recorded run never issued: the latest answer to the same command, if any
+        return self.__last_responses.get(command)
+
+
+def create_replay_driver(trace_path: str, time_scale: float = 1.0, strict: bool = False) -> WebDriver:
+    log.info("Replaying WebDriver commands from %s with time scale %s", trace_path, time_scale)
+    return WebDriver(command_executor=CommandReplayExecutor(trace_path, time_scale, strict), options=ChromeOptions())
+
+
+def load_trace(path: str) -> (dict, list):
+    with _open_trace(path, "rt") as trace_file:
+        header = json.loads(trace_file.readline())
+        if header.get("format") != _TRACE_FORMAT or header.get("version") != _TRACE_VERSION:
+            raise RuntimeError(f"{path} is not a version {_TRACE_VERSION} WebDriver command trace")
+        return header, [json.loads(line) for line in trace_file if line.strip()]
+
+
+def _open_trace(path: str, mode: str):
+    return gzip.open(path, mode, encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def _strip_session(params: Optional[dict]) -> dict:
+    return {name: value for name, value in (params or {}).items() if name != "sessionId"}
+
+
+def _get_key(command: str, params: dict) -> str:
+    return command + json.dumps(params, sort_keys=True, default=str)
@@ -0,0 +1,176 @@
+from typing import Callable, Optional
+
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+
+
+# Knows which window and frame a driver is in, so that switching to where the driver already is costs nothing and the
+# window handles are only queried when they can't be known. The frame path is the (by, locator) of every frame from
+# the top-level document down to the current one. The window list is queried every time: a page opens and closes windows
+# by itself (target=_blank, window.open in a page script), and the browsingContext events of WebDriver BiDi that would
+# report them are not available through the synchronous selenium API the wrapper uses
+class ContextTracker:
+
+    def __init__(self, driver: WebDriver):
+        self.__driver = driver
+        self.__window: Optional[str] = None
+        # The windows in the order they were seen in
+        self.__window_order: list = []
+        self.__frame_path: tuple = ()
+        # True when the current frame was switched to by hand (switch_to_frame), not entered for an Element in_frame()
+        self.__in_frame_by_hand = False
+        self.__listeners: list = []
+        # Changes on every navigation, context switch and action, so that state read from the page can tell it is stale
+        self.__page_version = 0
+        # Metrics
+        self.__switches = 0
+        self.__skipped_switches = 0
+        self.__handle_queries = 0
+
+    # Called with the reason whenever the context changes, e.g. to invalidate the element cache
+    def add_listener(self, listener: Callable[[str], None]):
+        self.__listeners.append(listener)
+
+    # Where the driver is
+
+    def get_current_window(self) -> str:
+        if self.__window is None:
+            self.__handle_queries += 1
+            self.__window = self.__driver.current_window_handle
+        return self.__window
+
+    def get_windows(self) -> list:
+        self.__handle_queries += 1
+        handles = self.__driver.window_handles
+        # Keep the order the windows were seen in, append the new ones
+        known = [handle for handle in self.__window_order if handle in handles]
+        self.__window_order = known + [handle for handle in handles if handle not in known]
+        return list(self.__window_order)
+
+    def get_frame_path(self) -> tuple:
+        return self.__frame_path
+
+    def get_page_version(self) -> int:
+        return self.__page_version
+
+    # Switching
+
+    # Returns False when the driver already was in the top-level document of the window
+    def switch_to_window(self, window_handle: str) -> bool:
+        if window_handle == self.__window and not self.__frame_path:
+            self.__skip("window", window_handle)
+            return False
+        self.__driver.switch_to.window(window_handle)
+        self.__switches += 1
+        self.__window = window_handle
+        if window_handle not in self.__window_order:
+            self.__window_order.append(window_handle)
+        self.__set_frame_path((), "window switch")
+        return True
+
+    def switch_to_default_content(self):
+        if not self.__frame_path:
+            self.__skip("default content", None)
+            return
+        self.__driver.switch_to.default_content()
+        self.__switches += 1
+        self.__set_frame_path((), "frame switch")
+
+    def switch_to_parent_frame(self):
+        if not self.__frame_path:
+            self.__skip("parent frame", None)
+            return
+        self.__driver.switch_to.parent_frame()
+        self.__switches += 1
+        self.__set_frame_path(self.__frame_path[:-1], "frame switch")
+
+    # Switches into the frame located by frame_element (a WrappedElement) from the current context
+    def switch_to_frame(self, frame_element):
+        self.__enter_frame(frame_element)
+        self.__set_frame_path(self.__frame_path, "frame switch")
+        self.__in_frame_by_hand = True
+
+    # Makes the given chain of frame Elements (outermost first) the current context, leaving and entering only the
+    # frames that differ from the current path. An empty chain is the top-level document, except after a switch by
+    # hand: Elements used there keep working in the frame switched to
+    def enter_frames(self, frame_elements: tuple):
+        target_path = tuple(frame_element.get_by_and_locator() for frame_element in frame_elements)
+        if target_path == self.__frame_path or (not target_path and self.__in_frame_by_hand):
+            return
+        common = 0
+        while (common < min(len(target_path), len(self.__frame_path))
+               and target_path[common] == self.__frame_path[common]):
+            common += 1
+        if not target_path:
+            self.__driver.switch_to.default_content()
+            self.__switches += 1
+            self.__frame_path = ()
+        elif common == len(target_path):
+            for _ in range(len(self.__frame_path) - common):
+                self.__driver.switch_to.parent_frame()
+                self.__switches += 1
+            self.__frame_path = target_path
+        else:
+            if common < len(self.__frame_path):
+                self.__driver.switch_to.default_content()
+                self.__switches += 1
+                self.__frame_path = ()
+                common = 0
+            for frame_element in frame_elements[common:]:
+                self.__enter_frame(frame_element)
+        log.debug("Entered the frame path %s", log.LazyCall(lambda: list(target_path)))
+        self.__set_frame_path(self.__frame_path, "frame switch")
+
+    def __enter_frame(self, frame_element):
+        try:
+            self.__driver.switch_to.frame(frame_element.get_web_element())
+        except StaleElementReferenceException:
+            self.__driver.switch_to.frame(frame_element.reset_cached_web_element().get_web_element())
+        self.__switches += 1
+        self.__frame_path = self.__frame_path + (frame_element.get_by_and_locator(),)
+
+    # Changes made outside of the tracker
+
+    # A navigation (get, refresh, back, forward) always lands in the top-level document of the current window
+    def on_navigation(self):
+        self.__set_frame_path((), "navigation")
+
+    # handle=None when the new window's handle is not known, e.g. after window.open() in a script. get_windows() finds
+    # it then
+    def on_window_opened(self, window_handle: Optional[str] = None):
+        if window_handle is not None and window_handle not in self.__window_order:
+            self.__window_order.append(window_handle)
+
+    def on_window_closed(self, window_handle: Optional[str] = None):
+        window_handle = window_handle or self.__window
+        if window_handle in self.__window_order:
+            self.__window_order.remove(window_handle)
+        if window_handle is None or window_handle == self.__window:
+            self.__window = None
+        self.__set_frame_path((), "window closed")
+
+    # Clicks, typing, scripts and other input that may have changed the page
+    def on_page_changed(self):
+        self.__page_version += 1
+
+    # Stats
+
+    def get_stats(self) -> dict:
+        return {
+            "switches": self.__switches,
+            "skipped_switches": self.__skipped_switches,
+            "handle_queries": self.__handle_queries,
+        }
+
+    def __skip(self, target: str, window_handle: Optional[str]):
+        self.__skipped_switches += 1
+        log.debug("Already in the %s %s. Not switching", target, window_handle or "")
+
+    def __set_frame_path(self, frame_path: tuple, reason: str):
+        self.__frame_path = frame_path
+        self.__in_frame_by_hand = self.__in_frame_by_hand and bool(frame_path)
+        self.__page_version += 1
+        for listener in self.__listeners:
+            listener(reason)
@@ -0,0 +1,359 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import os
+import select
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from typing import Optional
+
+from selenium.common import TimeoutException
+
+from src.selenium_wrapper import wrapper_logging as log
+
+_TRUTHY_VALUES = ("true", "1", "yes", "on", "enabled")
+# Chrome and Edge write to .crdownload, Firefox to .part, Safari to .download. The final name appears by a rename once
+# the download is complete
+_PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".download")
+# Firefox only saves the types it is told to without asking
+_FIREFOX_SAVE_TO_DISK_TYPES = ",".join((
+    "application/octet-stream", "application/pdf", "application/zip", "application/x-zip-compressed",
+    "application/gzip", "application/json", "application/xml", "application/vnd.ms-excel",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/csv", "text/plain", "text/xml",
+    "image/png", "image/jpeg"))
+# inotify(7) events that create, complete, rename or remove a file of the watched directory
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_INOTIFY_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+# The download directory of one browser session and the downloads finished in it. With DOWNLOAD_DIR_PER_SESSION every
+# session started by WebDriverFactory gets its own subdirectory of DOWNLOAD_DIR, so parallel sessions never see each
+# other's files. The subdirectory is removed with the downloads in it once the driver is closed. A download is expected
+# before the action that triggers it: the files already in the directory at that moment are not it, the first new file
+# that is complete is. Complete means it has its final name and no partial file (.crdownload, .part) goes with it.
+# Waiting blocks on inotify events on Linux and polls the directory every DOWNLOAD_POLL_SECONDS elsewhere, or with
+# DOWNLOAD_WATCHER=polling. The directory has to be on this machine, i.e. not on a remote Grid node
+@log.traced
+class DownloadManager:
+    __BASE_DIRECTORY = os.getenv("DOWNLOAD_DIR")
+    __PER_SESSION = os.getenv("DOWNLOAD_DIR_PER_SESSION", "false").lower() in _TRUTHY_VALUES
+    __WATCHER = os.getenv("DOWNLOAD_WATCHER", "auto").lower()
+    __POLL_SECONDS = float(os.getenv("DOWNLOAD_POLL_SECONDS", "0.2"))
+    # An empty file may be a placeholder the browser writes before the partial file. It counts once it has stayed
+    # empty, without a partial file, for this long
+    __EMPTY_FILE_QUIET_SECONDS = float(os.getenv("DOWNLOAD_EMPTY_FILE_QUIET_SECONDS", "0.5"))
+    __DEFAULT_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT_SECONDS", "60"))
+
+    # directory=None for drivers the factory did not start. Chromium browsers are told to download to a new directory,
+    # the others are assumed to download to DOWNLOAD_DIR
+    def __init__(self, driver, directory: Optional[str] = None):
+        # A directory the manager created itself is removed by close()
+        self.__owns_directory = False
+        if directory is None:
+            directory = DownloadManager.__get_driver_directory(driver)
+            self.__owns_directory = not DownloadManager.__is_base_directory(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = os.path.abspath(directory)
+        self.__watcher = _create_watcher(self.__directory, DownloadManager.__WATCHER, DownloadManager.__POLL_SECONDS)
+        self.__lock = threading.Lock()
+        self.__claimed = set()
+        # Metrics
+        self.__expected = 0
+        self.__completed = 0
+        self.__wakeups = 0
+        self.__wait_seconds = 0.0
+        log.debug("Watching the download directory %s with %s", self.__directory, self.__watcher.get_name())
+
+    # Browser setup
+
+    # A new, empty subdirectory of DOWNLOAD_DIR for one browser session. None without DOWNLOAD_DIR
+    @staticmethod
+    def create_session_directory() -> Optional[str]:
+        base_directory = DownloadManager.__BASE_DIRECTORY
+        if not base_directory or not DownloadManager.__PER_SESSION:
+            return base_directory
+        os.makedirs(base_directory, exist_ok=True)
+        return tempfile.mkdtemp(prefix="session-", dir=base_directory)
+
+    # Removes a directory from create_session_directory() with the files downloaded to it. Never DOWNLOAD_DIR itself
+    @staticmethod
+    def remove_session_directory(directory: Optional[str]):
+        if not directory or DownloadManager.__is_base_directory(directory):
+            return
+        shutil.rmtree(directory, ignore_errors=True)
+        log.debug("Removed the download directory %s", directory)
+
+    @staticmethod
+    def __is_base_directory(directory: str) -> bool:
+        base_directory = DownloadManager.__BASE_DIRECTORY
+        return bool(base_directory) and os.path.abspath(directory) == os.path.abspath(base_directory)
+
+    # directory=None keeps the DOWNLOAD_DIR setting, e.g. for the async factory
+    @staticmethod
+    def apply_to_options(browser: str, options, directory: Optional[str] = None):
+        directory = directory or DownloadManager.__BASE_DIRECTORY
+        if browser in ("chrome", "edge"):
+            preferences = dict(options.experimental_options.get("prefs") or {})
+            preferences["download.default_directory"] = directory
+            if directory:
+                preferences["download.prompt_for_download"] = False
+                preferences["download.directory_upgrade"] = True
+            options.add_experimental_option("prefs", preferences)
+        elif browser == "firefox" and directory:
+            options.set_preference("browser.download.folderList", 2)
+            options.set_preference("browser.download.dir", directory)
+            options.set_preference("browser.download.useDownloadDir", True)
+            options.set_preference("browser.download.manager.showWhenStarting", False)
+            options.set_preference("browser.helperApps.neverAsk.saveToDisk", _FIREFOX_SAVE_TO_DISK_TYPES)
+
+    @staticmethod
+    def __get_driver_directory(driver) -> str:
+        if hasattr(driver, "execute_cdp_cmd"):
+            directory = DownloadManager.create_session_directory() or tempfile.mkdtemp(prefix="selenium-downloads-")
+            driver.execute_cdp_cmd("Browser.setDownloadBehavior", {"behavior": "allow", "downloadPath": directory})
+            log.info("Downloading to %s", directory)
+            return directory
+        if DownloadManager.__BASE_DIRECTORY:
+            log.warning("The download directory of this driver is not known. Assuming DOWNLOAD_DIR: %s",
+                        DownloadManager.__BASE_DIRECTORY)
+            return DownloadManager.__BASE_DIRECTORY
+        raise RuntimeError("The download directory of this driver is not known. Set DOWNLOAD_DIR before the browser "
+                           "starts")
+
+    # Downloads
+
+    def get_directory(self) -> str:
+        return self.__directory
+
+    # Call before the action that triggers the download. file_name_pattern (e.g. "*.csv") ignores other new files
+    def expect(self, file_name_pattern: Optional[str] = None) -> "Download":
+        with self.__lock:
+            self.__expected += 1
+        return Download(self, set(self.__list_files()), file_name_pattern)
+
+    # Blocks until a file that is not in known_files and matches file_name_pattern is complete. Returns its path
+    def wait_for(self, known_files: set, file_name_pattern: Optional[str] = None,
+                 timeout: Optional[float] = None) -> str:
+        timeout = DownloadManager.__DEFAULT_TIMEOUT if timeout is None else timeout
+        started_at = time.monotonic()
+        deadline = started_at + timeout
+        empty_since = {}
+        try:
+            while True:
+                file_name, size = self.__find_completed(known_files, file_name_pattern)
+                now = time.monotonic()
+                if file_name is not None:
+                    quiet_seconds = 0.0
+                    if size == 0:
+                        quiet_seconds = (empty_since.setdefault(file_name, now)
+                                         + DownloadManager.__EMPTY_FILE_QUIET_SECONDS - now)
+                    if quiet_seconds <= 0 and self.__claim(file_name):
+                        return os.path.join(self.__directory, file_name)
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise TimeoutException(
+                        f"No download{' matching ' + file_name_pattern if file_name_pattern else ''} finished in "
+                        f"{self.__directory} within {timeout} seconds. Partial files: {self.__get_partial_files()}")
+                self.__watcher.wait(min(quiet_seconds, remaining) if file_name is not None else remaining)
+                with self.__lock:
+                    self.__wakeups += 1
+        finally:
+            with self.__lock:
+                self.__wait_seconds += time.monotonic() - started_at
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                "watcher": self.__watcher.get_name(),
+                "directory": self.__directory,
+                "expected": self.__expected,
+                "completed": self.__completed,
+                "wakeups": self.__wakeups,
+                "wait_seconds": self.__wait_seconds,
+            }
+
+    def close(self):
+        self.__watcher.close()
+        if self.__owns_directory:
+            DownloadManager.remove_session_directory(self.__directory)
+
+    # The oldest new file that has its final name, and its size
+    def __find_completed(self, known_files: set, file_name_pattern: Optional[str]) -> tuple:
+        file_names = set(self.__list_files())
+        candidates = []
+        for file_name in file_names:
+            if (file_name in known_files or file_name in self.__claimed or _is_partial(file_name)
+                    or any(file_name + suffix in file_names for suffix in _PARTIAL_SUFFIXES)
+                    or (file_name_pattern and not fnmatch.fnmatch(file_name, file_name_pattern))):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.__directory, file_name))
+            except FileNotFoundError:
+                continue
+            candidates.append((stat.st_mtime_ns, file_name, stat.st_size))
+        if not candidates:
+            return None, 0
+        _, file_name, size = min(candidates)
+        return file_name, size
+
+    # So that two expected downloads never get the same file
+    def __claim(self, file_name: str) -> bool:
+        with self.__lock:
+            if file_name in self.__claimed:
+                return False
+            self.__claimed.add(file_name)
+            self.__completed += 1
+            return True
+
+    def __list_files(self) -> list:
+        try:
+            return [entry.name for entry in os.scandir(self.__directory) if entry.is_file()]
+        except FileNotFoundError:
+            return []
+
+    def __get_partial_files(self) -> list:
+        return [file_name for file_name in self.__list_files() if _is_partial(file_name)]
+
+
+# A download expected by DownloadManager.expect(). The path is known once wait() returns. As a context manager it waits
+# for the download at the end of the with block:
+#     with page.expect_download("*.csv") as download:
+#         export_button.click()
+#     checksum = download.get_checksum()
+@log.traced
+class Download:
+    __CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHECKSUM_CHUNK_BYTES", str(1024 * 1024)))
+
+    def __init__(self, manager: DownloadManager, known_files: set, file_name_pattern: Optional[str] = None):
+        self.__manager = manager
+        self.__known_files = known_files
+        self.__file_name_pattern = file_name_pattern
+        self.__path: Optional[str] = None
+
+    def __enter__(self) -> "Download":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.wait()
+        return False
+
+    def wait(self, timeout: Optional[float] = None) -> str:
+        if self.__path is None:
+            self.__path = self.__manager.wait_for(self.__known_files, self.__file_name_pattern, timeout)
+            log.info("Downloaded %s", self.__path)
+        return self.__path
+
+    def get_path(self) -> str:
+        return self.wait()
+
+    def get_file_name(self) -> str:
+        return os.path.basename(self.wait())
+
+    def get_size(self) -> int:
+        return os.path.getsize(self.wait())
+
+    # Reads the file in chunks, so that large downloads are never loaded whole
+    def get_checksum(self, algorithm: str = "sha256", chunk_size: int = __CHUNK_SIZE) -> str:
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        digest = hashlib.new(algorithm)
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        with open(self.wait(), "rb", buffering=0) as file:
+            while True:
+                read = file.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+        return digest.hexdigest()
+
+
+def _is_partial(file_name: str) -> bool:
+    return file_name.endswith(_PARTIAL_SUFFIXES) or file_name.startswith(".com.google.Chrome.")
+
+
+def _create_watcher(directory: str, watcher: str, poll_seconds: float):
+    if watcher not in ("auto", "inotify", "polling"):
+        raise RuntimeError(f"Unsupported download watcher: {watcher}. Supported: auto, inotify, polling")
+    if watcher != "polling" and sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(directory)
+        except OSError as error:
+            if watcher == "inotify":
+                raise
+            log.debug("inotify is not available: %s. Polling the download directory instead", error)
+    elif watcher == "inotify":
+        raise RuntimeError("The inotify download watcher needs Linux")
+    return _PollingWatcher(poll_seconds)
+
+
+# Wakes up on every file created, written, renamed or removed in the directory. The events themselves are not read,
+# the directory is listed again after each wake up
+class _InotifyWatcher:
+    __libc = None
+
+    def __init__(self, directory: str):
+        libc = _InotifyWatcher.__get_libc()
+        file_descriptor = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(file_descriptor, os.fsencode(directory), _INOTIFY_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(file_descriptor)
+            raise OSError(errno, f"Watching {directory} failed")
+        self.__file_descriptor = file_descriptor
+        self.__finalizer = weakref.finalize(self, os.close, file_descriptor)
+
+    @staticmethod
+    def __get_libc():
+        if _InotifyWatcher.__libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            if not hasattr(libc, "inotify_init1"):
+                raise OSError("The C library has no inotify")
+            _InotifyWatcher.__libc = libc
+        return _InotifyWatcher.__libc
+
+    def get_name(self) -> str:
+        return "inotify"
+
+    # Returns on the first change or after timeout
+    def wait(self, timeout: float):
+        if not self.__finalizer.alive:
+            raise RuntimeError("The download watcher is closed")
+        readable, _, _ = select.select([self.__file_descriptor], [], [], max(timeout, 0))
+        if not readable:
+            return
+        try:
+            while os.read(self.__file_descriptor, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        self.__finalizer()
+
+
+class _PollingWatcher:
+
+    def __init__(self, poll_seconds: float):
+        self.__poll_seconds = poll_seconds
+
+    def get_name(self) -> str:
+        return "polling"
+
+    def wait(self, timeout: float):
+        time.sleep(max(min(self.__poll_seconds, timeout), 0))
+
+    def close(self):
+        pass
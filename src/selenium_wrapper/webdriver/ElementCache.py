@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.ContextTracker import ContextTracker
+
+# Installs a MutationObserver on the current document (once) and returns its generation counter
+_DOM_GENERATION_SCRIPT = """
+if (window.__seleniumWrapperDomGeneration === undefined) {
+    window.__seleniumWrapperDomGeneration = 0;
+    new MutationObserver(function () { window.__seleniumWrapperDomGeneration++; })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return window.__seleniumWrapperDomGeneration;
+"""
+
+
+class ElementCache:
+    __DEFAULT_MAX_SIZE = int(os.getenv("ELEMENT_CACHE_MAX_SIZE", "256"))
+    __DEFAULT_OBSERVE_DOM = os.getenv("ELEMENT_CACHE_OBSERVE_DOM", "").lower() in ("true", "1", "yes", "on", "enabled")
+
+    def __init__(self, driver: WebDriver, context_tracker: ContextTracker = None, max_size: int = __DEFAULT_MAX_SIZE,
+                 observe_dom: bool = __DEFAULT_OBSERVE_DOM):
+        self.__driver = driver
+        # Knows the current window and frame. Every context change invalidates the cache
+        self.__context_tracker = context_tracker or ContextTracker(driver)
+        self.__context_tracker.add_listener(self.invalidate)
+        self.__max_size = max_size
+        self.__observe_dom = observe_dom
+        # (by, locator, window handle, frame path) -> (WebElement, DOM generation at the time it was stored)
+        self.__entries: OrderedDict = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+
+    # Lookups
+
+    def get(self, by, locator) -> Optional[WebElement]:
+        if self.__max_size <= 0:
+            return None
+        key = self.__get_key(by, locator)
+        entry = self.__entries.get(key)
+        if entry is not None and self.__observe_dom and entry[1] != self.__get_dom_generation():
+            log.debug("DOM changed since the Element located by %s: '%s' was cached", by, locator)
+            self.invalidate("DOM mutation")
+            entry = None
+        if entry is None:
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry[0]
+
+    def put(self, by, locator, web_element: WebElement):
+        if self.__max_size <= 0:
+            return
+        key = self.__get_key(by, locator)
+        generation = self.__get_dom_generation() if self.__observe_dom else None
+        self.__entries[key] = (web_element, generation)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    # Stores many Elements at once, e.g. the ones prefetched for a page, with a single DOM generation lookup
+    def put_all(self, entries: list):
+        if self.__max_size <= 0 or not entries:
+            return
+        generation = self.__get_dom_generation() if self.__observe_dom else None
+        for by, locator, web_element in entries:
+            key = self.__get_key(by, locator)
+            self.__entries[key] = (web_element, generation)
+            self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def discard(self, by, locator):
+        self.__entries.pop(self.__get_key(by, locator), None)
+
+    # Invalidation
+
+    def invalidate(self, reason: str = "explicit request"):
+        if self.__entries:
+            log.debug("Invalidating %s cached Elements. Reason: %s", len(self.__entries), reason)
+            self.__invalidations += 1
+            self.__entries.clear()
+
+    # Stats
+
+    def get_stats(self) -> dict:
+        lookups = self.__hits + self.__misses
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "invalidations": self.__invalidations,
+            "size": len(self.__entries),
+            "max_size": self.__max_size,
+            "hit_ratio": self.__hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        self.__hits = self.__misses = self.__evictions = self.__invalidations = 0
+
+    def __get_key(self, by, locator) -> tuple:
+        return (by, locator, self.__context_tracker.get_current_window(),
+                self.__context_tracker.get_frame_path())
+
+    def __get_dom_generation(self) -> int:
+        return self.__driver.execute_script(_DOM_GENERATION_SCRIPT)
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+from weakref import WeakKeyDictionary
+
+from selenium.common import WebDriverException
+
+from src.selenium_wrapper import wrapper_logging as log
+
+_TRUTHY_VALUES = ("true", "1", "yes", "on", "enabled")
+_STRATEGIES = ("normal", "eager", "none")
+# Blocked by the file extension at the end of the URL path, with or without a query string (and images also by a
+# preference). Fetch.enable could match by resource type, but the requests it pauses have to be failed from a CDP event
+# listener, which execute_cdp_cmd has no way to receive
+_RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8"),
+    "stylesheet": ("css",),
+}
+_RESOURCE_TYPE_PATTERNS = {
+    resource_type: tuple(pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*"))
+    for resource_type, extensions in _RESOURCE_TYPE_EXTENSIONS.items()
+}
+_TRACKER_PATTERNS = ("*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*connect.facebook.net*",
+                     "*hotjar.com*", "*segment.io*", "*cdn.segment.com*", "*js-agent.newrelic.com*", "*clarity.ms*")
+_LEAN_CHROMIUM_ARGUMENTS = ("--disable-extensions", "--disable-background-networking", "--disable-sync",
+                            "--disable-default-apps", "--disable-component-update", "--no-first-run", "--mute-audio",
+                            "--disable-features=Translate,OptimizationHints,MediaRouter")
+_LEAN_FIREFOX_PREFERENCES = {
+    "app.update.auto": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "extensions.update.enabled": False,
+    "media.autoplay.default": 5,
+    "toolkit.telemetry.enabled": False,
+}
+_NAVIGATION_TIMING_SCRIPT = """
+var entry = performance.getEntriesByType('navigation')[0];
+return entry ? {domContentLoaded: entry.domContentLoadedEventEnd, load: entry.loadEventEnd,
+                resources: performance.getEntriesByType('resource').length} : null;
+"""
+
+# name -> (page load strategy, blocked resource types, blocked URL patterns, window size, lean browser)
+_PROFILES = {
+    # The behaviour without a profile: wait for every resource, maximize the window on every navigation
+    "default": ("normal", (), (), "maximize", False),
+    "fast": ("eager", ("image", "font", "media"), _TRACKER_PATTERNS, "1920x1080", True),
+    "fastest": ("none", ("image", "font", "media", "stylesheet"), _TRACKER_PATTERNS, "1920x1080", True),
+}
+
+
+# Settings that trade page fidelity for load time: page load strategy, blocked resources, disabled browser features and
+# a window size fixed when the browser starts instead of maximizing it on every navigation. Chosen by PAGE_LOAD_PROFILE
+# (default, fast, fastest), single settings can be overridden by PAGE_LOAD_STRATEGY, BLOCK_RESOURCE_TYPES,
+# BLOCK_URL_PATTERNS and WINDOW_SIZE ("maximize" or e.g. "1920x1080")
+class PageLoadProfile:
+    __COLLECT_BROWSER_TIMINGS = os.getenv("PAGE_LOAD_TIMINGS", "").lower() in _TRUTHY_VALUES
+
+    __configured = None
+    __configured_lock = threading.Lock()
+
+    def __init__(self, name: str, page_load_strategy: str = "normal", blocked_resource_types: tuple = (),
+                 blocked_url_patterns: tuple = (), window_size: str = "maximize", lean_browser: bool = False):
+        if page_load_strategy not in _STRATEGIES:
+            raise RuntimeError(f"Unsupported page load strategy: {page_load_strategy}. Supported: {list(_STRATEGIES)}")
+        unknown_types = set(blocked_resource_types) - set(_RESOURCE_TYPE_PATTERNS)
+        if unknown_types:
+            raise RuntimeError(f"Unsupported resource types: {sorted(unknown_types)}. "
+                               f"Supported: {sorted(_RESOURCE_TYPE_PATTERNS)}")
+        if window_size != "maximize" and not re.match(r"^\d+x\d+$", window_size):
+            raise RuntimeError(f"Invalid window size: {window_size}. Use 'maximize' or WIDTHxHEIGHT, e.g. 1920x1080")
+        self.__name = name
+        self.__page_load_strategy = page_load_strategy
+        self.__blocked_resource_types = tuple(blocked_resource_types)
+        self.__blocked_url_patterns = tuple(blocked_url_patterns)
+        self.__window_size = window_size
+        self.__lean_browser = lean_browser
+        self.__lock = threading.Lock()
+        # driver -> handles of the windows URL blocking is installed in
+        self.__blocked_windows = WeakKeyDictionary()
+        self.__navigations = 0
+        self.__total_seconds = 0.0
+        self.__max_seconds = 0.0
+        # Running sums, so that a long-lived driver never accumulates an entry per navigation
+        self.__browser_timings_count = 0
+        self.__browser_timings_sums = {"domContentLoaded": 0.0, "load": 0.0, "resources": 0}
+
+    @staticmethod
+    def get_configured() -> "PageLoadProfile":
+        with PageLoadProfile.__configured_lock:
+            if PageLoadProfile.__configured is None:
+                PageLoadProfile.__configured = PageLoadProfile.from_env()
+        return PageLoadProfile.__configured
+
+    @staticmethod
+    def from_env() -> "PageLoadProfile":
+        name = os.getenv("PAGE_LOAD_PROFILE", "default").lower()
+        if name not in _PROFILES:
+            raise RuntimeError(f"Unknown page load profile: {name}. Supported profiles: {sorted(_PROFILES)}")
+        strategy, resource_types, url_patterns, window_size, lean_browser = _PROFILES[name]
+        if os.getenv("BLOCK_RESOURCE_TYPES") is not None:
+            resource_types = _split(os.getenv("BLOCK_RESOURCE_TYPES").lower())
+        if os.getenv("BLOCK_URL_PATTERNS") is not None:
+            url_patterns = _split(os.getenv("BLOCK_URL_PATTERNS"))
+        return PageLoadProfile(name, os.getenv("PAGE_LOAD_STRATEGY", strategy).lower(), resource_types, url_patterns,
+                               os.getenv("WINDOW_SIZE", window_size).lower(), lean_browser)
+
+    def get_name(self) -> str:
+        return self.__name
+
+    def maximizes_on_navigation(self) -> bool:
+        return self.__window_size == "maximize"
+
+    # Browser setup
+
+    def apply_to_options(self, browser: str, options):
+        options.page_load_strategy = self.__page_load_strategy
+        if browser in ("chrome", "edge"):
+            if self.__window_size != "maximize":
+                options.add_argument("--window-size=" + self.__window_size.replace("x", ","))
+            if self.__lean_browser:
+                for argument in _LEAN_CHROMIUM_ARGUMENTS:
+                    options.add_argument(argument)
+            if "image" in self.__blocked_resource_types:
+                preferences = dict(options.experimental_options.get("prefs") or {})
+                preferences["profile.managed_default_content_settings.images"] = 2
+                options.add_experimental_option("prefs", preferences)
+        elif browser == "firefox":
+            if self.__window_size != "maximize":
+                width, height = self.__window_size.split("x")
+                options.add_argument(f"--width={width}")
+                options.add_argument(f"--height={height}")
+            if self.__lean_browser:
+                for name, value in _LEAN_FIREFOX_PREFERENCES.items():
+                    options.set_preference(name, value)
+            if "image" in self.__blocked_resource_types:
+                options.set_preference("permissions.default.image", 2)
+            if "font" in self.__blocked_resource_types:
+                options.set_preference("gfx.downloadable_fonts.enabled", False)
+
+    # URL blocking needs a session, so it is installed right after the browser starts. Network.setBlockedURLs only
+    # covers the DevTools target it is sent to, i.e. the current window. The wrapper installs it again in every window
+    # it switches to (see WebDriverSingleton) before using it; windows switched to through the plain driver, and the
+    # first load of a window a page opens by itself, are not covered
+    def apply_to_driver(self, driver, window_handle: str = None):
+        patterns = list(self.__blocked_url_patterns)
+        for resource_type in self.__blocked_resource_types:
+            patterns.extend(_RESOURCE_TYPE_PATTERNS[resource_type])
+        if not patterns:
+            return
+        if not hasattr(driver, "execute_cdp_cmd"):
+            if window_handle is None:
+                log.warning("Blocking URL patterns needs a Chromium browser. Only the browser preferences of the %s "
+                            "page load profile are applied", self.__name)
+            return
+        blocked_windows = self.__blocked_windows.setdefault(driver, set())
+        if window_handle is not None and window_handle in blocked_windows:
+            return
+        blocked_windows.add(window_handle)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        log.debug("Blocking %s URL patterns: %s", len(patterns), log.LazyJoin(patterns))
+
+    # Load timings
+
+    def record_navigation(self, driver, url: str, seconds: float):
+        browser_timings = self.__get_browser_timings(driver) if PageLoadProfile.__COLLECT_BROWSER_TIMINGS else None
+        with self.__lock:
+            self.__navigations += 1
+            self.__total_seconds += seconds
+            self.__max_seconds = max(self.__max_seconds, seconds)
+            if browser_timings:
+                self.__browser_timings_count += 1
+                for key in self.__browser_timings_sums:
+                    self.__browser_timings_sums[key] += browser_timings[key]
+        if browser_timings:
+            log.info("Loaded %s in %.3f seconds with the %s page load profile. DOM content loaded after %.0f ms, "
+                     "load event after %.0f ms, %s resources", url, seconds, self.__name,
+                     browser_timings["domContentLoaded"], browser_timings["load"], browser_timings["resources"])
+        else:
+            log.info("Loaded %s in %.3f seconds with the %s page load profile", url, seconds, self.__name)
+
+    def get_load_timings(self) -> dict:
+        with self.__lock:
+            timings = {
+                "profile": self.__name,
+                "page_load_strategy": self.__page_load_strategy,
+                "navigations": self.__navigations,
+                "total_seconds": self.__total_seconds,
+                "average_seconds": self.__total_seconds / self.__navigations if self.__navigations else 0.0,
+                "max_seconds": self.__max_seconds,
+            }
+            if self.__browser_timings_count:
+                for key, name in (("domContentLoaded", "average_dom_content_loaded_ms"),
+                                  ("load", "average_load_event_ms"), ("resources", "average_resources")):
+                    timings[name] = self.__browser_timings_sums[key] / self.__browser_timings_count
+        return timings
+
+    @staticmethod
+    def __get_browser_timings(driver):
+        try:
+            return driver.execute_script(_NAVIGATION_TIMING_SCRIPT)
+        except WebDriverException as error:
+            log.debug("Reading the navigation timings failed: %s", error.msg)
+            return None
+
+
+def _split(value: str) -> tuple:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
@@ -0,0 +1,201 @@
+import atexit
+import base64
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from src.selenium_wrapper import wrapper_logging as log
+
+_FORMATS_BY_EXTENSION = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp"}
+
+
+# Captures screenshots on the calling thread (one or two WebDriver round trips) and leaves decoding, hashing and
+# writing them to a pool of background workers. At most queue_size screenshots wait for a worker; capturing more
+# blocks until one is written, so a slow disk throttles the test instead of filling the memory. A screenshot that is
+# identical to one already written becomes a hard link to that file instead of a second copy
+class ScreenshotPipeline:
+    __DEFAULT_WORKERS = int(os.getenv("SCREENSHOT_WORKERS", "2"))
+    __DEFAULT_QUEUE_SIZE = int(os.getenv("SCREENSHOT_QUEUE_SIZE", "64"))
+    # png, jpeg or webp. jpeg and webp need a Chromium browser, other browsers always capture PNG
+    __DEFAULT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "png").lower()
+    __DEFAULT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+    __DEFAULT_DEDUPLICATE = os.getenv("SCREENSHOT_DEDUPLICATE", "true").lower() in ("true", "1", "yes", "on", "enabled")
+
+    __default_pipeline = None
+    __default_lock = threading.Lock()
+
+    def __init__(self, workers: int = __DEFAULT_WORKERS, queue_size: int = __DEFAULT_QUEUE_SIZE,
+                 deduplicate: bool = __DEFAULT_DEDUPLICATE):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("ScreenshotPipeline needs at least 1 worker and a queue size of at least 1")
+        self.__executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        self.__slots = threading.BoundedSemaphore(queue_size)
+        self.__deduplicate = deduplicate
+        self.__lock = threading.Lock()
+        # Content hash -> path of a file written with that content, and the other way round
+        self.__written_files: dict = {}
+        self.__digests_by_path: dict = {}
+        self.__pending: set = set()
+        self.__warned_about_format = False
+        # Metrics
+        self.__captured = 0
+        self.__written = 0
+        self.__duplicates = 0
+        self.__failed = 0
+        self.__bytes_written = 0
+        self.__capture_seconds = 0.0
+        self.__queue_wait_seconds = 0.0
+
+    # Shared by Page and WrappedElement. Pending screenshots are written before the interpreter exits
+    @staticmethod
+    def get_default() -> "ScreenshotPipeline":
+        with ScreenshotPipeline.__default_lock:
+            if ScreenshotPipeline.__default_pipeline is None:
+                ScreenshotPipeline.__default_pipeline = ScreenshotPipeline()
+                atexit.register(ScreenshotPipeline.__default_pipeline.close)
+        return ScreenshotPipeline.__default_pipeline
+
+    # Captures the viewport, the whole page or only the given element and returns a Future of the written file path
+    def capture(self, driver: WebDriver, file_path: str, web_element: WebElement = None, full_page: bool = False,
+                image_format: str = None, quality: int = None) -> Future:
+        image_format = (image_format or _FORMATS_BY_EXTENSION.get(os.path.splitext(file_path)[1].lower())
+                        or ScreenshotPipeline.__DEFAULT_FORMAT)
+        quality = ScreenshotPipeline.__DEFAULT_QUALITY if quality is None else quality
+        started_at = time.perf_counter()
+        data = self.__capture(driver, web_element, full_page, image_format, quality)
+        captured_at = time.perf_counter()
+        self.__slots.acquire()
+        queued_at = time.perf_counter()
+        with self.__lock:
+            self.__captured += 1
+            self.__capture_seconds += captured_at - started_at
+            self.__queue_wait_seconds += queued_at - captured_at
+        try:
+            future = self.__executor.submit(self.__write, data, file_path)
+        except BaseException:
+            self.__slots.release()
+            raise
+        with self.__lock:
+            self.__pending.add(future)
+        future.add_done_callback(self.__on_written)
+        return future
+
+    # Blocks until every screenshot captured so far is written
+    def flush(self, timeout: float = None):
+        with self.__lock:
+            pending = list(self.__pending)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in pending:
+            future.exception(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+    def close(self):
+        self.flush()
+        self.__executor.shutdown(wait=True)
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                "captured": self.__captured,
+                "written": self.__written,
+                "duplicates": self.__duplicates,
+                "failed": self.__failed,
+                "pending": len(self.__pending),
+                "bytes_written": self.__bytes_written,
+                "capture_ms_per_screenshot": self.__capture_seconds * 1000 / self.__captured if self.__captured else 0.0,
+                "queue_wait_ms": self.__queue_wait_seconds * 1000,
+            }
+
+    # Capturing, on the calling thread
+
+    def __capture(self, driver: WebDriver, web_element: Optional[WebElement], full_page: bool, image_format: str,
+                  quality: int) -> str:
+        if hasattr(driver, "execute_cdp_cmd"):
+            return self.__capture_with_cdp(driver, web_element, full_page, image_format, quality)
+        if image_format != "png" and not self.__warned_about_format:
+            log.warning("%s screenshots need a Chromium browser. Capturing PNG instead", image_format)
+            self.__warned_about_format = True
+        if web_element is not None:
+            return web_element.screenshot_as_base64
+        if full_page and hasattr(driver, "get_full_page_screenshot_as_base64"):
+            return driver.get_full_page_screenshot_as_base64()
+        return driver.get_screenshot_as_base64()
+
+    @staticmethod
+    def __capture_with_cdp(driver: WebDriver, web_element: Optional[WebElement], full_page: bool, image_format: str,
+                           quality: int) -> str:
+        parameters = {"format": image_format, "fromSurface": True}
+        if image_format in ("jpeg", "webp"):
+            parameters["quality"] = quality
+        if web_element is not None:
+            # The W3C element rect is relative to the document, like the clip of a capture beyond the viewport
+            rect = web_element.rect
+            parameters["clip"] = {"x": rect["x"], "y": rect["y"], "width": rect["width"], "height": rect["height"],
+                                  "scale": 1}
+            parameters["captureBeyondViewport"] = True
+        elif full_page:
+            content_size = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})["cssContentSize"]
+            parameters["clip"] = {"x": 0, "y": 0, "width": content_size["width"], "height": content_size["height"],
+                                  "scale": 1}
+            parameters["captureBeyondViewport"] = True
+        return driver.execute_cdp_cmd("Page.captureScreenshot", parameters)["data"]
+
+    # Writing, on a worker
+
+    def __write(self, data: str, file_path: str) -> str:
+        image = base64.b64decode(data)
+        digest = hashlib.blake2b(image, digest_size=16).digest() if self.__deduplicate else None
+        if digest is not None:
+            with self.__lock:
+                original_path = self.__written_files.get(digest)
+            if original_path is not None and original_path != file_path and self.__link(original_path, file_path):
+                with self.__lock:
+                    self.__duplicates += 1
+                    self.__digests_by_path[file_path] = digest
+                log.debug("Screenshot %s is identical to %s. Linked it instead of writing it", file_path,
+                          original_path)
+                return file_path
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Replaced rather than overwritten, so that a file hard linked to this path keeps its content
+        temporary_path = f"{file_path}.{threading.get_ident()}.part"
+        with open(temporary_path, "wb") as screenshot_file:
+            screenshot_file.write(image)
+        os.replace(temporary_path, file_path)
+        with self.__lock:
+            self.__written += 1
+            self.__bytes_written += len(image)
+            if digest is not None:
+                # The path may have held other content before, which must not be linked to any more
+                previous_digest = self.__digests_by_path.get(file_path)
+                if previous_digest is not None and self.__written_files.get(previous_digest) == file_path:
+                    del self.__written_files[previous_digest]
+                self.__written_files.setdefault(digest, file_path)
+                self.__digests_by_path[file_path] = digest
+        return file_path
+
+    @staticmethod
+    def __link(original_path: str, file_path: str) -> bool:
+        try:
+            if os.path.lexists(file_path):
+                os.remove(file_path)
+            os.link(original_path, file_path)
+            return True
+        except OSError:
+            # E.g. another file system, or the first copy is not on disk yet: write a copy instead
+            return False
+
+    def __on_written(self, future: Future):
+        self.__slots.release()
+        with self.__lock:
+            self.__pending.discard(future)
+            if future.exception() is not None:
+                self.__failed += 1
+        if future.exception() is not None:
+            log.warning("Writing a screenshot failed: %s", future.exception())
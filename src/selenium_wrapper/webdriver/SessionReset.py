@@ -0,0 +1,106 @@
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from selenium.common import NoAlertPresentException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+
+# Clears Web Storage, IndexedDB and Cache Storage of the current origin. Calls back with null or an error message
+_CLEAR_ORIGIN_STORAGE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+    var pending = [];
+    if (window.indexedDB && indexedDB.databases) {
+        pending.push(indexedDB.databases().then(function (databases) {
+            return Promise.all(databases.map(function (database) {
+                return new Promise(function (resolve) {
+                    var request = indexedDB.deleteDatabase(database.name);
+                    request.onsuccess = request.onerror = request.onblocked = resolve;
+                });
+            }));
+        }));
+    }
+    if (window.caches) {
+        pending.push(caches.keys().then(function (names) {
+            return Promise.all(names.map(function (name) { return caches.delete(name); }));
+        }));
+    }
+    Promise.all(pending).then(function () { done(null); }, function (error) { done(String(error)); });
+} catch (error) {
+    done(String(error));
+}
+"""
+
+
+# visited_origins are the origins the session may have stored state for besides the ones open in its windows, see
+# WebDriverSingleton.remember_url(). Cookies, Web Storage, IndexedDB and Cache Storage of every one of them are cleared
+def reset_driver_session(driver: WebDriver, visited_origins: Iterable[str] = ()):
+    log.info("Resetting the browser session")
+    _dismiss_alert(driver)
+    # Keys and mouse buttons still held down by an unfinished gesture
+    driver.execute(Command.W3C_CLEAR_ACTIONS)
+    origins = []
+    all_windows: list = driver.window_handles
+    for window in all_windows[1:]:
+        driver.switch_to.window(window)
+        _add_origin(origins, _get_origin(driver))
+        driver.close()
+    driver.switch_to.window(all_windows[0])
+    driver.switch_to.default_content()
+    current_origin = _get_origin(driver)
+    for origin in visited_origins:
+        _add_origin(origins, origin)
+    if current_origin:
+        _clear_current_origin(driver, current_origin)
+    other_origins = [origin for origin in origins if origin != current_origin]
+    if hasattr(driver, "execute_cdp_cmd"):
+        # Chromium clears the cookies and the cache of every origin at once, the storage of each origin by name
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        for origin in ([current_origin] if current_origin else []) + other_origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    else:
+        # Storage and cookies can only be cleared from a page of their origin
+        for origin in other_origins:
+            log.debug("Clearing the storage of %s", origin)
+            driver.get(origin + "/")
+            _clear_current_origin(driver, origin)
+    driver.get("about:blank")
+
+
+def _get_origin(driver: WebDriver) -> Optional[str]:
+    origin = driver.execute_script("return window.location.origin;")
+    return origin if origin and origin != "null" else None
+
+
+def _add_origin(origins: list, origin: Optional[str]):
+    if origin and origin not in origins:
+        origins.append(origin)
+
+
+def _clear_current_origin(driver: WebDriver, origin: str):
+    error = driver.execute_async_script(_CLEAR_ORIGIN_STORAGE_SCRIPT)
+    if error:
+        log.warning("Could not clear the storage of %s: %s", origin, error)
+    driver.delete_all_cookies()
+
+
+def _dismiss_alert(driver: WebDriver):
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+
+
+# scheme://host[:port] of an http(s) URL, None for other URLs (about:blank, data:, file:)
+def get_origin(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
@@ -1,8 +1,14 @@
+import json
 import os
+import subprocess
+import threading
+import time
+from weakref import WeakKeyDictionary
 
 import urllib3
 
 from selenium import webdriver
+from selenium.common import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.firefox.service import Service as FirefoxService
@@ -10,33 +16,204 @@ from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.edge.service import Service as EdgeService
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.CommandProfiler import instrument_command_executor
+from src.selenium_wrapper.webdriver.CommandTrace import create_replay_driver
+from src.selenium_wrapper.webdriver.DownloadManager import DownloadManager
+from src.selenium_wrapper.webdriver.PageLoadProfile import PageLoadProfile
+
 
 os.environ['WDM_SSL_VERIFY'] = '0'
 os.environ['WDM_LOCAL'] = '1'
 # os.environ['WDM_LOG'] = str(logging.NOTSET)   # Disable webdriver_manager logs
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+_TRUTHY_VALUES = ("true",  "1", "yes", "on", "enabled")
+
 
 class WebDriverFactory:
 
+    __startup_timings = WeakKeyDictionary()
+    __page_load_profiles = WeakKeyDictionary()
+    __download_directories = WeakKeyDictionary()
+    # For drivers the factory did not create, e.g. bound by hand or replayed: no assumptions about their setup
+    __unprofiled = PageLoadProfile("default")
+
     @staticmethod
     def get_web_driver():
+        replay_trace_file = os.getenv("REPLAY_TRACE_FILE")
+        if replay_trace_file:
+            # Answers from a recorded trace (see TRACE_COMMANDS_FILE) instead of launching a browser
+            driver = create_replay_driver(replay_trace_file, float(os.getenv("REPLAY_TIME_SCALE", "1")),
+                                          _get_env_transformed("REPLAY_STRICT") in _TRUTHY_VALUES)
+            instrument_command_executor(driver)
+            return driver
+        started_at = time.perf_counter()
+        download_directory = DownloadManager.create_session_directory()
+        browser, driver_class, service_class, options = WebDriverFactory.get_browser_setup(download_directory)
+        service = service_class(DriverBinaryCache.resolve(browser))
+        resolved_at = time.perf_counter()
+        service_timings = _time_service_start(service)
+        try:
+            driver = driver_class(service=service, options=options)
+        except SessionNotCreatedException as error:
+            # Most likely the browser updated itself past the cached driver binary
+            if not DriverBinaryCache.invalidate(browser):
+                raise
+            log.warning("Starting %s with the cached driver failed: %s. Resolving the driver binary again",
+                        browser, error.msg)
+            service = service_class(DriverBinaryCache.resolve(browser))
+            resolved_at = time.perf_counter()
+            service_timings = _time_service_start(service)
+            driver = driver_class(service=service, options=options)
+        page_load_profile = PageLoadProfile.get_configured()
+        page_load_profile.apply_to_driver(driver)
+        WebDriverFactory.__page_load_profiles[driver] = page_load_profile
+        if download_directory:
+            WebDriverFactory.__download_directories[driver] = download_directory
+        finished_at = time.perf_counter()
+        timings = {
+            "resolve_binary": resolved_at - started_at,
+            "spawn_service": service_timings.get("spawn_service", 0.0),
+            "create_session": finished_at - resolved_at - service_timings.get("spawn_service", 0.0),
+            "total": finished_at - started_at,
+        }
+        WebDriverFactory.__startup_timings[driver] = timings
+        instrument_command_executor(driver)
+        log.info("Started %s in %.3f seconds. Resolving the driver binary took %.3f, spawning the service %.3f, "
+                 "creating the session %.3f seconds",
+                 browser, timings["total"], timings["resolve_binary"], timings["spawn_service"],
+                 timings["create_session"])
+        return driver
+
+    # Browser name, driver class, service class and options for the BROWSER / HEADLESS / PAGE_LOAD_PROFILE settings.
+    # Downloads go to download_directory, DOWNLOAD_DIR without one
+    @staticmethod
+    def get_browser_setup(download_directory: str = None) -> (str, type, type, object):
+        browser, driver_class, service_class, options = WebDriverFactory.__get_browser()
+        PageLoadProfile.get_configured().apply_to_options(browser, options)
+        DownloadManager.apply_to_options(browser, options, download_directory)
+        return browser, driver_class, service_class, options
+
+    @staticmethod
+    def __get_browser() -> (str, type, type, object):
         browser = _get_env_transformed("BROWSER")
         headless = _get_env_transformed("HEADLESS")
         if browser == "chrome" or not browser:
             options = webdriver.ChromeOptions()
             options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("prefs", {"download.default_directory": os.getenv("DOWNLOAD_DIR")})
-            if headless in ("true",  "1", "yes", "on", "enabled"):
+            if headless in _TRUTHY_VALUES:
                 options.add_argument("--headless=new")
-            driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+            return "chrome", webdriver.Chrome, ChromeService, options
         elif browser == "firefox":
-            driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()))
+            return "firefox", webdriver.Firefox, FirefoxService, webdriver.FirefoxOptions()
         elif browser == "edge":
-            driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()))
-        else:
-            raise RuntimeError("Browser not supported. Supported browsers: Chrome, Firefox, Edge")
-        return driver
+            return "edge", webdriver.Edge, EdgeService, webdriver.EdgeOptions()
+        raise RuntimeError("Browser not supported. Supported browsers: Chrome, Firefox, Edge")
+
+    @staticmethod
+    def get_startup_timings(driver) -> dict:
+        return dict(WebDriverFactory.__startup_timings.get(driver, {}))
+
+    @staticmethod
+    def get_page_load_profile(driver) -> PageLoadProfile:
+        return WebDriverFactory.__page_load_profiles.get(driver, WebDriverFactory.__unprofiled)
+
+    # The session's own download directory, None for drivers the factory did not start or without DOWNLOAD_DIR
+    @staticmethod
+    def get_download_directory(driver) -> str:
+        return WebDriverFactory.__download_directories.get(driver)
+
+    # Removes the session's own download directory, when the driver is closed
+    @staticmethod
+    def release_download_directory(driver):
+        DownloadManager.remove_session_directory(WebDriverFactory.__download_directories.pop(driver, None))
+
+
+class DriverBinaryCache:
+    # DRIVER_PATH skips resolution entirely. DRIVER_OFFLINE never calls webdriver_manager and trusts the cache
+    __CACHE_FILE = os.path.expanduser(
+        os.getenv("DRIVER_CACHE_FILE", os.path.join("~", ".cache", "selenium_wrapper", "drivers.json")))
+    __TTL_SECONDS = float(os.getenv("DRIVER_CACHE_TTL_HOURS", "24")) * 3600
+    __MANAGERS = {
+        "chrome": ChromeDriverManager,
+        "firefox": GeckoDriverManager,
+        "edge": EdgeChromiumDriverManager,
+    }
+    __lock = threading.Lock()
+    __entries = None
+    # Browsers whose driver was taken from the cache by this process, see invalidate()
+    __served_from_cache = set()
+
+    @staticmethod
+    def resolve(browser: str) -> str:
+        explicit_path = os.getenv("DRIVER_PATH")
+        if explicit_path:
+            log.debug("Using the %s driver from DRIVER_PATH: %s", browser, explicit_path)
+            return explicit_path
+        offline = _get_env_transformed("DRIVER_OFFLINE") in _TRUTHY_VALUES
+        with DriverBinaryCache.__lock:
+            entry = DriverBinaryCache.__get_entries().get(browser)
+            if entry is not None and os.access(entry["path"], os.X_OK) and (
+                    offline or time.time() - entry["resolved_at"] < DriverBinaryCache.__TTL_SECONDS):
+                log.debug("Using the cached %s driver %s: %s", browser, entry['version'], entry['path'])
+                DriverBinaryCache.__served_from_cache.add(browser)
+                return entry["path"]
+            if offline:
+                raise RuntimeError(f"No cached {browser} driver binary available and DRIVER_OFFLINE is set. "
+                                   f"Set DRIVER_PATH or run once online to populate {DriverBinaryCache.__CACHE_FILE}")
+            log.info("Resolving the %s driver binary through webdriver_manager", browser)
+            path = DriverBinaryCache.__MANAGERS[browser]().install()
+            DriverBinaryCache.__entries[browser] = {
+                "path": path,
+                "version": _get_driver_version(path),
+                "resolved_at": time.time(),
+            }
+            DriverBinaryCache.__save_entries()
+            return path
+
+    # Drops the cached driver of a browser after it failed to start a session. Returns False when there is nothing to
+    # resolve again: the driver came from DRIVER_PATH or was just resolved, or DRIVER_OFFLINE is set
+    @staticmethod
+    def invalidate(browser: str) -> bool:
+        if os.getenv("DRIVER_PATH") or _get_env_transformed("DRIVER_OFFLINE") in _TRUTHY_VALUES:
+            return False
+        with DriverBinaryCache.__lock:
+            if browser not in DriverBinaryCache.__served_from_cache:
+                return False
+            DriverBinaryCache.__served_from_cache.discard(browser)
+            if DriverBinaryCache.__get_entries().pop(browser, None) is None:
+                return False
+            DriverBinaryCache.__save_entries()
+        log.info("Dropped the cached %s driver binary", browser)
+        return True
+
+    @staticmethod
+    def clear():
+        with DriverBinaryCache.__lock:
+            DriverBinaryCache.__entries = {}
+            DriverBinaryCache.__save_entries()
+
+    @staticmethod
+    def __get_entries() -> dict:
+        if DriverBinaryCache.__entries is None:
+            try:
+                with open(DriverBinaryCache.__CACHE_FILE) as cache_file:
+                    DriverBinaryCache.__entries = json.load(cache_file)
+            except (OSError, ValueError):
+                DriverBinaryCache.__entries = {}
+        return DriverBinaryCache.__entries
+
+    @staticmethod
+    def __save_entries():
+        try:
+            os.makedirs(os.path.dirname(DriverBinaryCache.__CACHE_FILE), exist_ok=True)
+            temporary_file = f"{DriverBinaryCache.__CACHE_FILE}.{os.getpid()}.tmp"
+            with open(temporary_file, "w") as cache_file:
+                json.dump(DriverBinaryCache.__entries, cache_file, indent=2)
+            os.replace(temporary_file, DriverBinaryCache.__CACHE_FILE)
+        except OSError as error:
+            log.warning("Could not save the driver binary cache to %s: %s", DriverBinaryCache.__CACHE_FILE, error)
 
 
 def _get_env_transformed(env_var):
@@ -46,3 +223,24 @@ def _get_env_transformed(env_var):
     except AttributeError:
         pass
     return env_var
+
+
+def _get_driver_version(path: str) -> str:
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return next((word for word in output.split() if word[:1].isdigit()), "unknown")
+
+
+def _time_service_start(service) -> dict:
+    timings = {}
+    start = service.start
+
+    def timed_start():
+        started_at = time.perf_counter()
+        start()
+        timings["spawn_service"] = time.perf_counter() - started_at
+
+    service.start = timed_start
+    return timings
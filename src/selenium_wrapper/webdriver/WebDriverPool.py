@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.WebDriverFactory import WebDriverFactory
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+class WebDriverPool:
+    __DEFAULT_SIZE = int(os.getenv("WEBDRIVER_POOL_SIZE", "2"))
+    # Number of checkouts after which a driver is quit and replaced. 0 means never recycle
+    __DEFAULT_MAX_USES = int(os.getenv("WEBDRIVER_POOL_MAX_USES", "0"))
+
+    def __init__(self, size: int = __DEFAULT_SIZE, max_uses: int = __DEFAULT_MAX_USES,
+                 driver_factory: Callable[[], WebDriver] = WebDriverFactory.get_web_driver):
+        if size < 1:
+            raise ValueError("WebDriverPool size must be at least 1")
+        self.__size = size
+        self.__max_uses = max_uses
+        self.__driver_factory = driver_factory
+        self.__condition = threading.Condition()
+        self.__idle_drivers: deque = deque()
+        self.__uses: dict = {}
+        self.__live_drivers = 0
+        self.__closed = False
+        # Metrics
+        self.__created = 0
+        self.__recycled = 0
+        self.__unhealthy = 0
+        self.__checkouts = 0
+        self.__total_wait_seconds = 0.0
+        self.__max_wait_seconds = 0.0
+        self.__busy_seconds = 0.0
+        self.__busy_since: dict = {}
+        self.__started_at = time.monotonic()
+
+    # Lifecycle
+
+    def prewarm(self, count: Optional[int] = None):
+        with self.__condition:
+            count = min(self.__size - self.__live_drivers, self.__size if count is None else count)
+            self.__live_drivers += max(count, 0)
+        if count <= 0:
+            return
+        log.info("Pre-warming %s browsers for the WebDriver pool", count)
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self.__create_driver) for _ in range(count)]
+        errors = []
+        for future in futures:
+            try:
+                driver = future.result()
+            except Exception as error:
+                errors.append(error)
+                self.__forget_driver(None)
+                continue
+            with self.__condition:
+                self.__idle_drivers.append(driver)
+                self.__condition.notify()
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            drivers = list(self.__idle_drivers)
+            self.__idle_drivers.clear()
+            self.__live_drivers -= len(drivers)
+            self.__condition.notify_all()
+        log.info("Closing the WebDriver pool. Quitting %s idle browsers", len(drivers))
+        for driver in drivers:
+            self.__quit_driver(driver)
+
+    # Checkout / checkin
+
+    def checkout(self, timeout: Optional[float] = None) -> WebDriver:
+        requested_at = time.monotonic()
+        deadline = None if timeout is None else requested_at + timeout
+        while True:
+            with self.__condition:
+                while not self.__idle_drivers and self.__live_drivers >= self.__size and not self.__closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise RuntimeError(f"No WebDriver became available in the pool within {timeout} seconds")
+                    self.__condition.wait(remaining)
+                if self.__closed:
+                    raise RuntimeError("WebDriver pool is closed")
+                driver = self.__idle_drivers.popleft() if self.__idle_drivers else None
+                if driver is None:
+                    self.__live_drivers += 1
+            if driver is None:
+                try:
+                    driver = self.__create_driver()
+                except Exception:
+                    self.__forget_driver(None)
+                    raise
+            elif not self.__is_healthy(driver):
+                self.__forget_driver(driver)
+                with self.__condition:
+                    self.__unhealthy += 1
+                continue
+            break
+        waited = time.monotonic() - requested_at
+        with self.__condition:
+            self.__checkouts += 1
+            self.__total_wait_seconds += waited
+            self.__max_wait_seconds = max(self.__max_wait_seconds, waited)
+            self.__busy_since[id(driver)] = time.monotonic()
+        log.debug("Checked out a WebDriver from the pool after waiting %.3f seconds", waited)
+        return driver
+
+    def checkin(self, driver: WebDriver):
+        with self.__condition:
+            busy_since = self.__busy_since.pop(id(driver), None)
+            if busy_since is not None:
+                self.__busy_seconds += time.monotonic() - busy_since
+            uses = self.__uses.get(id(driver), 0) + 1
+            self.__uses[id(driver)] = uses
+        if self.__closed:
+            self.__forget_driver(driver)
+        elif self.__max_uses and uses >= self.__max_uses:
+            log.info("Recycling a WebDriver after %s uses", uses)
+            with self.__condition:
+                self.__recycled += 1
+            self.__forget_driver(driver)
+        else:
+            with self.__condition:
+                self.__idle_drivers.append(driver)
+                self.__condition.notify()
+
+    # Binds a checked out driver to the current thread / task. A driver closed inside the block, e.g. by
+    # Page.close_browser(), is replaced by another one from the pool, which is checked in at the end instead
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        driver = self.checkout(timeout)
+        token = WebDriverSingleton.bind_driver(driver, self.__replace_closed_driver)
+        try:
+            yield driver
+        finally:
+            driver = WebDriverSingleton.get_bound_driver()
+            WebDriverSingleton.unbind_driver(token)
+            if driver is not None:
+                self.checkin(driver)
+
+    # Metrics
+
+    def get_metrics(self) -> dict:
+        with self.__condition:
+            now = time.monotonic()
+            in_use = len(self.__busy_since)
+            busy_seconds = self.__busy_seconds + sum(now - since for since in self.__busy_since.values())
+            elapsed = now - self.__started_at
+            return {
+                "size": self.__size,
+                "live": self.__live_drivers,
+                "idle": len(self.__idle_drivers),
+                "in_use": in_use,
+                "created": self.__created,
+                "recycled": self.__recycled,
+                "unhealthy": self.__unhealthy,
+                "checkouts": self.__checkouts,
+                "utilization": busy_seconds / (elapsed * self.__size) if elapsed else 0.0,
+                "total_wait_seconds": self.__total_wait_seconds,
+                "max_wait_seconds": self.__max_wait_seconds,
+                "average_wait_seconds": self.__total_wait_seconds / self.__checkouts if self.__checkouts else 0.0,
+            }
+
+    # WebDriver related
+
+    def __create_driver(self) -> WebDriver:
+        driver = self.__driver_factory()
+        with self.__condition:
+            self.__created += 1
+        return driver
+
+    # The closed driver is already quit, only its slot in the pool is given up
+    def __replace_closed_driver(self, driver: WebDriver) -> WebDriver:
+        log.info("A checked out WebDriver was closed. Checking out a replacement")
+        with self.__condition:
+            busy_since = self.__busy_since.pop(id(driver), None)
+            if busy_since is not None:
+                self.__busy_seconds += time.monotonic() - busy_since
+            self.__uses.pop(id(driver), None)
+            self.__live_drivers -= 1
+            self.__condition.notify()
+        return self.checkout()
+
+    def __forget_driver(self, driver: Optional[WebDriver]):
+        with self.__condition:
+            self.__live_drivers -= 1
+            if driver is not None:
+                self.__uses.pop(id(driver), None)
+            self.__condition.notify()
+        if driver is not None:
+            self.__quit_driver(driver)
+
+    @staticmethod
+    def __is_healthy(driver: WebDriver) -> bool:
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            # Also covers drivers quit by their user, e.g. through Page.close_browser()
+            log.info("Discarding a WebDriver from the pool because it failed the health check")
+            return False
+
+    @staticmethod
+    def __quit_driver(driver: WebDriver):
+        WebDriverSingleton.release_driver_state(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -1,18 +1,205 @@
+import os
+import threading
+from contextvars import ContextVar, Token
+from typing import Callable, Optional
+from weakref import WeakKeyDictionary
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.selenium_wrapper import wrapper_logging as log
+from src.selenium_wrapper.webdriver.ActionBatch import ActionBatch
+from src.selenium_wrapper.webdriver.ContextTracker import ContextTracker
+from src.selenium_wrapper.webdriver.DownloadManager import DownloadManager
+from src.selenium_wrapper.webdriver.ElementCache import ElementCache
+from src.selenium_wrapper.webdriver.SessionReset import get_origin, reset_driver_session
 from src.selenium_wrapper.webdriver.WebDriverFactory import WebDriverFactory
 
 
 class WebDriverSingleton:
 
+    # Number of reset_session() calls after which the browser is relaunched instead. 0 means never
+    __MAX_SESSION_RESETS = int(os.getenv("SESSION_MAX_RESETS", "0"))
+
     driver = None
+    # Driver bound to the current thread / asyncio task, e.g. by WebDriverPool. Takes precedence over the global one,
+    # even after it is closed
+    __binding: ContextVar = ContextVar("driver_binding", default=None)
+    __context_trackers = WeakKeyDictionary()
+    __element_caches = WeakKeyDictionary()
+    __action_batches = WeakKeyDictionary()
+    # Not released by reset_session(): the browser keeps downloading to the same directory
+    __download_managers = WeakKeyDictionary()
+    __session_resets = WeakKeyDictionary()
+    __last_known_urls = WeakKeyDictionary()
+    # Origins the wrapper navigated to or read, whose storage reset_session() clears
+    __visited_origins = WeakKeyDictionary()
+    __lock = threading.Lock()
 
     @staticmethod
     def get_driver():
-        if WebDriverSingleton.driver is None:
-            WebDriverSingleton.driver = WebDriverFactory.get_web_driver()
+        binding = WebDriverSingleton.__binding.get()
+        if binding is not None:
+            if binding.driver is None:
+                raise RuntimeError("The driver bound to this thread / task was closed and has no replacement. Bind "
+                                   "another driver or leave the binding")
+            return binding.driver
+        with WebDriverSingleton.__lock:
+            if WebDriverSingleton.driver is None:
+                WebDriverSingleton.driver = WebDriverFactory.get_web_driver()
         return WebDriverSingleton.driver
 
+    # replace is called with the bound driver when close_driver() quits it and returns the driver the context
+    # continues with, e.g. one checked out of the same WebDriverPool. Without it get_driver() raises once it is closed
+    @staticmethod
+    def bind_driver(driver, replace: Optional[Callable[[WebDriver], WebDriver]] = None) -> Token:
+        return WebDriverSingleton.__binding.set(_Binding(driver, replace))
+
+    @staticmethod
+    def unbind_driver(token: Token):
+        WebDriverSingleton.__binding.reset(token)
+
+    # The driver bound to the current context, the replacement if the bound one was closed. None without a binding
+    @staticmethod
+    def get_bound_driver():
+        binding = WebDriverSingleton.__binding.get()
+        return binding.driver if binding is not None else None
+
+    @staticmethod
+    def get_context_tracker() -> ContextTracker:
+        driver = WebDriverSingleton.get_driver()
+        with WebDriverSingleton.__lock:
+            return WebDriverSingleton.__get_context_tracker(driver)
+
+    @staticmethod
+    def get_element_cache() -> ElementCache:
+        driver = WebDriverSingleton.get_driver()
+        with WebDriverSingleton.__lock:
+            element_cache = WebDriverSingleton.__element_caches.get(driver)
+            if element_cache is None:
+                element_cache = ElementCache(driver, WebDriverSingleton.__get_context_tracker(driver))
+                WebDriverSingleton.__element_caches[driver] = element_cache
+        return element_cache
+
+    @staticmethod
+    def get_action_batch() -> ActionBatch:
+        driver = WebDriverSingleton.get_driver()
+        with WebDriverSingleton.__lock:
+            action_batch = WebDriverSingleton.__action_batches.get(driver)
+            if action_batch is None:
+                action_batch = ActionBatch(driver, WebDriverSingleton.__get_context_tracker(driver).on_page_changed)
+                WebDriverSingleton.__action_batches[driver] = action_batch
+        return action_batch
+
+    @staticmethod
+    def get_download_manager() -> DownloadManager:
+        driver = WebDriverSingleton.get_driver()
+        with WebDriverSingleton.__lock:
+            download_manager = WebDriverSingleton.__download_managers.get(driver)
+            if download_manager is None:
+                download_manager = DownloadManager(driver, WebDriverFactory.get_download_directory(driver))
+                WebDriverSingleton.__download_managers[driver] = download_manager
+        return download_manager
+
+    # Callers hold the lock
+    @staticmethod
+    def __get_context_tracker(driver) -> ContextTracker:
+        context_tracker = WebDriverSingleton.__context_trackers.get(driver)
+        if context_tracker is None:
+            context_tracker = ContextTracker(driver)
+            context_tracker.add_listener(
+                lambda reason: WebDriverSingleton.__on_context_change(driver, context_tracker, reason))
+            WebDriverSingleton.__context_trackers[driver] = context_tracker
+        return context_tracker
+
+    # The URL blocking of the page load profile only covers the window it was installed in
+    @staticmethod
+    def __on_context_change(driver, context_tracker: ContextTracker, reason: str):
+        if reason == "window switch":
+            WebDriverFactory.get_page_load_profile(driver).apply_to_driver(driver,
+                                                                           context_tracker.get_current_window())
+
+    # Last URL the wrapper navigated to or read, so that log messages never need a current_url round trip
+    @staticmethod
+    def remember_url(url):
+        WebDriverSingleton.__last_known_urls[WebDriverSingleton.get_driver()] = url
+        WebDriverSingleton.remember_origin(url)
+
+    # Pages opened without the wrapper knowing their URL afterwards, e.g. in a new tab
+    @staticmethod
+    def remember_origin(url):
+        origin = get_origin(url)
+        if origin is not None:
+            driver = WebDriverSingleton.get_driver()
+            with WebDriverSingleton.__lock:
+                WebDriverSingleton.__visited_origins.setdefault(driver, set()).add(origin)
+
+    @staticmethod
+    def get_last_known_url() -> str:
+        return WebDriverSingleton.__last_known_urls.get(WebDriverSingleton.get_driver()) or "<unknown>"
+
+    # Called before the driver quits. Closes its download manager and removes its own download directory
+    @staticmethod
+    def release_driver_state(driver):
+        WebDriverSingleton.__release_session_state(driver)
+        with WebDriverSingleton.__lock:
+            download_manager = WebDriverSingleton.__download_managers.pop(driver, None)
+        if download_manager is not None:
+            download_manager.close()
+        WebDriverFactory.release_download_directory(driver)
+
+    @staticmethod
+    def __release_session_state(driver):
+        with WebDriverSingleton.__lock:
+            WebDriverSingleton.__context_trackers.pop(driver, None)
+            WebDriverSingleton.__element_caches.pop(driver, None)
+            WebDriverSingleton.__action_batches.pop(driver, None)
+            WebDriverSingleton.__last_known_urls.pop(driver, None)
+            WebDriverSingleton.__visited_origins.pop(driver, None)
+
+    @staticmethod
+    def reset_session():
+        binding = WebDriverSingleton.__binding.get()
+        # Like close_driver(), never falls back to the global driver: it is shared with the other threads
+        driver = binding.driver if binding is not None else WebDriverSingleton.driver
+        if driver is None:
+            return
+        resets = WebDriverSingleton.__session_resets.get(driver, 0) + 1
+        if WebDriverSingleton.__MAX_SESSION_RESETS and resets > WebDriverSingleton.__MAX_SESSION_RESETS:
+            log.info("Browser session was reset %s times. Relaunching the browser instead", resets - 1)
+            WebDriverSingleton.close_driver()
+            return
+        with WebDriverSingleton.__lock:
+            visited_origins = sorted(WebDriverSingleton.__visited_origins.get(driver, ()))
+        try:
+            reset_driver_session(driver, visited_origins)
+        except Exception as error:
+            log.warning("Resetting the browser session failed: %s. Relaunching the browser instead", error)
+            WebDriverSingleton.close_driver()
+            return
+        WebDriverSingleton.__session_resets[driver] = resets
+        WebDriverSingleton.__release_session_state(driver)
+
     @staticmethod
     def close_driver():
-        if WebDriverSingleton.driver is not None:
+        binding = WebDriverSingleton.__binding.get()
+        if binding is not None:
+            # Never falls back to the global driver: it is shared with the other threads
+            if binding.driver is None:
+                return
+            closed_driver, binding.driver = binding.driver, None
+            WebDriverSingleton.release_driver_state(closed_driver)
+            closed_driver.quit()
+            if binding.replace is not None:
+                binding.driver = binding.replace(closed_driver)
+        elif WebDriverSingleton.driver is not None:
+            WebDriverSingleton.release_driver_state(WebDriverSingleton.driver)
             WebDriverSingleton.driver.quit()
             WebDriverSingleton.driver = None
+
+
+# Mutable, so that the replacement of a closed driver is seen by every copy of the context, e.g. asyncio tasks
+class _Binding:
+
+    def __init__(self, driver, replace: Optional[Callable[[WebDriver], WebDriver]]):
+        self.driver = driver
+        self.replace = replace
@@ -0,0 +1,146 @@
+import functools
+import inspect
+import itertools
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+# Every record carries these fields for the outermost Page/WrappedElement call it was logged from (None outside one)
+STRUCTURED_FIELDS = ("method", "locator", "elapsed", "round_trips")
+
+logger = logging.getLogger("selenium_wrapper")
+
+
+class _Operation:
+    __slots__ = ("call_id", "method", "owner", "started_at", "round_trips")
+    __call_ids = itertools.count()
+
+    def __init__(self, method: str, owner):
+        self.call_id = next(_Operation.__call_ids)
+        self.method = method
+        self.owner = owner
+        self.started_at = time.perf_counter()
+        self.round_trips = 0
+
+    @property
+    def locator(self):
+        get_by_and_locator = getattr(self.owner, "get_by_and_locator", None)
+        return get_by_and_locator() if get_by_and_locator else None
+
+
+_current_operation: ContextVar = ContextVar("wrapper_operation", default=None)
+
+
+# Log statements. Arguments are %-style and only formatted when the record is actually emitted
+
+def debug(message: str, *args):
+    _log(logging.DEBUG, message, args)
+
+
+def info(message: str, *args):
+    _log(logging.INFO, message, args)
+
+
+def warning(message: str, *args):
+    _log(logging.WARNING, message, args)
+
+
+def _log(level: int, message: str, args: tuple):
+    if not logger.isEnabledFor(level):
+        return
+    operation = _current_operation.get()
+    if operation is None:
+        extra = dict.fromkeys(STRUCTURED_FIELDS)
+    else:
+        extra = {
+            "method": operation.method,
+            "locator": operation.locator,
+            "elapsed": time.perf_counter() - operation.started_at,
+            "round_trips": operation.round_trips,
+        }
+    logger.log(level, message, *args, extra=extra, stacklevel=3)
+
+
+# Operation tracking
+
+def traced(cls):
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith("_") and callable(attribute) and not isinstance(attribute, (staticmethod, type)):
+            setattr(cls, name, _trace(attribute))
+    return cls
+
+
+def _trace(function):
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(self, *args, **kwargs):
+            if _current_operation.get() is not None:
+                return await function(self, *args, **kwargs)
+            token = _current_operation.set(_Operation(function.__qualname__, self))
+            try:
+                return await function(self, *args, **kwargs)
+            finally:
+                _current_operation.reset(token)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if _current_operation.get() is not None:
+            return function(self, *args, **kwargs)
+        token = _current_operation.set(_Operation(function.__qualname__, self))
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            _current_operation.reset(token)
+    return wrapper
+
+
+def get_current_operation():
+    return _current_operation.get()
+
+
+def count_round_trip():
+    operation = _current_operation.get()
+    if operation is not None:
+        operation.round_trips += 1
+
+
+# Formatting helpers
+
+class LazyJoin:
+    __slots__ = ("__parts",)
+
+    def __init__(self, parts):
+        self.__parts = parts
+
+    def __str__(self):
+        return "".join(str(part) for part in self.__parts)
+
+
+class LazyCall:
+    __slots__ = ("__function",)
+
+    def __init__(self, function):
+        self.__function = function
+
+    def __str__(self):
+        return str(self.__function())
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = list(value) if field == "locator" else value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
@@ -0,0 +1,39 @@
+import os
+
+# Read by the wrapper classes when they are imported
+os.environ.setdefault("DEFAULT_TIME_OUT_SECONDS", "1")
+
+import pytest
+from selenium import webdriver
+from selenium.common import WebDriverException
+
+from benchmarks.FakeRemoteEnd import FakeRemoteEnd
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+@pytest.fixture
+def remote_end():
+    with FakeRemoteEnd() as remote_end:
+        yield remote_end
+
+
+def start_driver(remote_end: FakeRemoteEnd):
+    return webdriver.Remote(command_executor=remote_end.url, options=webdriver.ChromeOptions())
+
+
+def quit_driver(driver):
+    WebDriverSingleton.release_driver_state(driver)
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+
+# A driver bound to the test, like the ones WebDriverPool hands out
+@pytest.fixture
+def driver(remote_end):
+    driver = start_driver(remote_end)
+    token = WebDriverSingleton.bind_driver(driver)
+    yield driver
+    WebDriverSingleton.unbind_driver(token)
+    quit_driver(driver)
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+from selenium.common import StaleElementReferenceException
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def test_queued_actions_are_sent_together(remote_end, driver):
+    open_page(remote_end, node("input", id="name"), node("div", id="target"))
+    name = Element.by_id("name")
+    name.mouse_down()
+    name.move_by_offset(5, 5)
+    Element.by_id("target").mouse_up()
+    assert len(WebDriverSingleton.get_action_batch().get_pending_steps()) == 3
+    remote_end.reset_counts()
+    Page().perform_actions()
+    assert remote_end.get_counts()["actions"] == 1
+    assert not WebDriverSingleton.get_action_batch().get_pending_steps()
+    assert len(Page().get_last_gesture()) == 3
+
+
+def test_waits_for_stale_elements_to_come_back(remote_end, driver):
+    open_page(remote_end, node("div", id="canvas"))
+    canvas = Element.by_id("canvas")
+    canvas.mouse_down()
+    # The page navigates by itself: the queued Element goes stale and only comes back a moment later
+    remote_end.add_page("http://test/page", "Page")
+    driver.refresh()
+
+    def render_again():
+        remote_end.add_page("http://test/page", "Page", node("div", id="canvas"))
+        driver.refresh()
+    renderer = threading.Timer(0.3, render_again)
+    renderer.start()
+    try:
+        Page().perform_actions()
+    finally:
+        renderer.join()
+    assert Page().get_last_gesture()
+    # Only the move to the Element, which failed, was sent before: there is no input to release
+    assert remote_end.get_counts()["clearActionState"] == 0
+
+
+def test_stale_element_in_the_middle_of_a_drag_is_not_resent(remote_end, driver):
+    open_page(remote_end, node("div", id="source"), node("div", id="target"))
+    target = Element.by_id("target")
+    target.get_text()
+    # Only the target is stale: the source is first resolved after the page rendered again
+    remote_end.add_page("http://test/page", "Page", node("div", id="source"), node("div", id="target"))
+    driver.refresh()
+    batch = WebDriverSingleton.get_action_batch()
+    batch.add("drag_and_drop", Element.by_id("source"), target)
+    remote_end.reset_counts()
+    with pytest.raises(StaleElementReferenceException):
+        batch.perform()
+    # The button pressed on the source is released, and the press is not sent twice
+    assert remote_end.get_counts()["actions"] == 1
+    assert remote_end.get_counts()["clearActionState"] == 1
+    assert not batch.get_pending_steps()
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+from selenium import webdriver
+from selenium.common import NoSuchWindowException
+from selenium.webdriver import Keys
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.aio.AsyncBrowserWait import AsyncBrowserWait
+from src.selenium_wrapper.aio.AsyncElement import AsyncElement
+from src.selenium_wrapper.aio.AsyncHttpClient import AsyncHttpClient
+from src.selenium_wrapper.aio.AsyncPage import AsyncPage
+from src.selenium_wrapper.aio.AsyncWebDriverFactory import AsyncWebDriverFactory
+from src.selenium_wrapper.aio.AsyncWebDriverSingleton import AsyncWebDriverSingleton
+from src.selenium_wrapper.generic import get_retry_statistics, reset_retry_statistics
+from src.selenium_wrapper.wait.BrowserWait import BrowserWait
+
+
+def run_session(remote_end, scenario):
+    async def run():
+        AsyncWebDriverSingleton.bind_driver(await AsyncWebDriverFactory.connect(remote_end.url,
+                                                                                webdriver.ChromeOptions()))
+        try:
+            remote_end.add_page("http://test/page", "Page", node("input", id="name"), node("div", id="target"),
+                                node("span", "Done", id="done"), node("span", "Hidden", id="hidden", displayed=False))
+            await AsyncPage().open_page("http://test/page")
+            remote_end.reset_counts()
+            return await scenario()
+        finally:
+            await AsyncPage.close_browser()
+    return asyncio.run(run())
+
+
+def test_queued_actions_are_sent_together(remote_end):
+    async def scenario():
+        name = AsyncElement.by_id("name")
+        await name.key_down(Keys.SHIFT)
+        await name.mouse_down()
+        await name.move_by_offset(5, 5)
+        await name.mouse_up()
+        await name.key_up(Keys.SHIFT)
+        assert remote_end.get_counts()["actions"] == 0
+        await name.perform()
+        assert remote_end.get_counts()["actions"] == 1
+        await AsyncElement.by_id("name").drag_and_drop_to_element(AsyncElement.by_id("target"))
+        await AsyncPage().scroll_by_offset(0, 100)
+        assert remote_end.get_counts()["actions"] == 3
+        await AsyncPage().release_actions()
+        assert remote_end.get_counts()["clearActionState"] == 1
+    run_session(remote_end, scenario)
+
+
+def test_clicks_until_the_outcome(remote_end):
+    async def scenario():
+        name = AsyncElement.by_id("name")
+        assert await name.click_until_other_element_is_visible(AsyncElement.by_id("done"), 0.1, 3)
+        reset_retry_statistics()
+        assert not await name.click_until_other_element_is_visible(AsyncElement.by_id("hidden"), 0.1, 3)
+        assert remote_end.get_counts()["actions"] == 4
+        # The retry policy of the sync wrapper, statistics included
+        assert get_retry_statistics()["click_no_wait until outcome"]["exhausted"] == 1
+    run_session(remote_end, scenario)
+
+
+def test_clears_a_field_with_one_key_sequence(remote_end):
+    async def scenario():
+        await AsyncElement.by_id("name").clear_field()
+        assert remote_end.get_counts()["sendKeysToElement"] == 1
+    run_session(remote_end, scenario)
+
+
+@pytest.mark.parametrize("wait_engine", ["webdriver", "event"])
+def test_fatal_errors_are_not_retried(remote_end, monkeypatch, wait_engine):
+    monkeypatch.setattr(BrowserWait, "_BrowserWait__ENGINE", wait_engine)
+
+    async def scenario():
+        driver = await AsyncWebDriverSingleton.get_driver()
+        await driver.close()
+        started_at = time.monotonic()
+        with pytest.raises(NoSuchWindowException):
+            await AsyncBrowserWait(driver, 5).until("function (args) { return false; }")
+        assert time.monotonic() - started_at < 1
+    run_session(remote_end, scenario)
+
+
+# Answers every request except the second one, after which it drops the connection
+def run_with_flaky_server(method: str) -> (list, object):
+    received = []
+
+    async def serve(reader, writer):
+        while not reader.at_eof():
+            headers = await reader.readuntil(b"\r\n\r\n")
+            await reader.readexactly(int(headers.split(b"Content-Length: ")[1].split(b"\r\n")[0]))
+            received.append(method)
+            if len(received) == 2:
+                writer.close()
+                return
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+            await writer.drain()
+
+    async def run():
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        client = AsyncHttpClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        try:
+            await client.request(method, "/status", {} if method == "POST" else None)
+            return await client.request(method, "/status", {} if method == "POST" else None)
+        except ConnectionError as error:
+            return error
+        except asyncio.IncompleteReadError as error:
+            return error
+        finally:
+            await client.close()
+            server.close()
+    return received, asyncio.run(run())
+
+
+def test_resends_idempotent_requests_on_a_broken_connection():
+    received, result = run_with_flaky_server("GET")
+    assert result == (200, "{}")
+    assert len(received) == 3
+
+
+def test_does_not_resend_a_post():
+    received, result = run_with_flaky_server("POST")
+    assert isinstance(result, (ConnectionError, asyncio.IncompleteReadError))
+    assert len(received) == 2
@@ -0,0 +1,22 @@
+import json
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.CommandProfiler import CommandProfiler, instrument_command_executor
+
+
+def test_request_sizes_include_the_url_parameters(remote_end, driver, monkeypatch):
+    monkeypatch.setattr(CommandProfiler, "_CommandProfiler__ENABLED", True)
+    instrument_command_executor(driver)
+    remote_end.add_page("http://test/page", "Page", node("span", "Hello", id="greeting"))
+    Page().open_page("http://test/page")
+    greeting = Element.by_id("greeting").wait_for_presence()
+    assert greeting.get_text() == "Hello"
+    element_id = greeting.get_web_element().id
+    report = CommandProfiler.for_driver(driver).get_report()["commands"]
+    assert report["getElementText"]["request_bytes"] == len(json.dumps({"id": element_id,
+                                                                        "sessionId": driver.session_id}))
+    assert report["getElementText"]["response_bytes"] == len(json.dumps({"value": "Hello"}))
+    assert report["get"]["request_bytes"] == len(json.dumps({"url": "http://test/page",
+                                                             "sessionId": driver.session_id}))
@@ -0,0 +1,78 @@
+import pytest
+from selenium.common import NoSuchWindowException, TimeoutException
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.wait.BrowserWait import BrowserWait
+from src.selenium_wrapper.wait.Condition import Condition
+
+
+@pytest.fixture(params=["webdriver", "event"])
+def wait_engine(request, monkeypatch):
+    monkeypatch.setattr(BrowserWait, "_BrowserWait__ENGINE", request.param)
+    return request.param
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def test_waits_for_visibility(remote_end, driver, wait_engine):
+    open_page(remote_end, node("span", "Hello", id="greeting"), node("span", "Hidden", id="hidden", displayed=False))
+    assert Element.by_id("greeting").wait_for_visibility().get_text() == "Hello"
+    with pytest.raises(TimeoutException):
+        Element.by_id("hidden").wait_for_visibility(timeout=0.2)
+    Element.by_id("hidden").wait_for_invisibility()
+    Element.by_id("missing").wait_for_absence()
+
+
+def test_waits_for_text(remote_end, driver, wait_engine):
+    open_page(remote_end, node("span", "Hello world", id="greeting"))
+    Element.by_id("greeting").wait_until_text_is_present_in_element("world")
+    with pytest.raises(TimeoutException):
+        Element.by_id("greeting").wait_until_text_is_present_in_element("moon", timeout=0.2)
+
+
+def test_attribute_condition_ignores_dom_properties(remote_end, driver, monkeypatch):
+    monkeypatch.setattr(BrowserWait, "_BrowserWait__ENGINE", "event")
+    open_page(remote_end, node("input", id="name", required="required"))
+    Element.by_id("name").wait_for_attribute_in_element("required")
+    # Every input has a "value" property, but this one has no value attribute
+    with pytest.raises(TimeoutException):
+        Element.by_id("name").wait_for_attribute_in_element("value", timeout=0.2)
+
+
+def test_fatal_errors_are_not_retried(remote_end, driver, monkeypatch):
+    monkeypatch.setattr(BrowserWait, "_BrowserWait__ENGINE", "event")
+    open_page(remote_end, node("span", "Hidden", id="hidden", displayed=False))
+    driver.close()
+    with pytest.raises(NoSuchWindowException):
+        BrowserWait(driver, 5).until("function (args) { return false; }")
+
+
+def test_waits_for_child_elements_within_their_parent(remote_end, driver):
+    open_page(remote_end, node("div", "", node("span", "Ready", class_="status"), id="first"),
+              node("div", "", node("span", "Loading", class_="status"), id="second"))
+    second = Element.by_id("second")
+    loading = Condition.text_present(second.child(css=".status"), "Loading")
+    assert Page().wait_for_any(Condition.text_present(second.child(css=".status"), "Ready"), loading) is loading
+    with pytest.raises(TimeoutException):
+        Page().wait_for_all(Condition.text_present(second.child(css=".status"), "Ready"), timeout=0.2)
+    Page().wait_for_all(Condition.invisible(Element.by_id("missing").child(css=".status")))
+
+
+def test_waits_for_elements_in_a_frame(remote_end, driver):
+    open_page(remote_end, node("span", "Top", id="status"),
+              node("iframe", "", node("span", "Framed", id="status"), id="frame"))
+    framed_status = Element.by_id("status").in_frame(Element.by_id("frame"))
+    Page().wait_for_all(Condition.text_present(framed_status, "Framed"))
+    Page().wait_for_all(Condition.text_present(Element.by_id("status"), "Top"))
+
+
+def test_rejects_conditions_in_different_frames(remote_end, driver):
+    open_page(remote_end, node("iframe", "", node("span", "Framed", id="status"), id="frame"))
+    framed_status = Element.by_id("status").in_frame(Element.by_id("frame"))
+    with pytest.raises(RuntimeError, match="different frames"):
+        Page().wait_for_any(Condition.visible(framed_status), Condition.url_contains("page"))
@@ -0,0 +1,118 @@
+import pytest
+from selenium.common import NoSuchElementException
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def open_shop(remote_end):
+    open_page(remote_end,
+              node("h1", "Shop", id="title"),
+              node("ul", "", node("li", "Apple", class_="item", name="apple"),
+                   node("li", "Pear", class_="item sold-out", name="pear", displayed=False), id="items"),
+              node("input", id="quantity", value="3"),
+              node("input", id="gift", type="checkbox", selected=True),
+              node("button", "Buy", id="buy", enabled=False))
+
+
+def test_answers_queries_without_round_trips(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    remote_end.reset_counts()
+    assert snapshot.get_title() == "Page"
+    assert snapshot.find("id", "title").get_text() == "Shop"
+    # Like WebElement.text, hidden Elements have no text
+    assert [item.get_text() for item in snapshot.find_all("css selector", "li.item")] == ["Apple", ""]
+    assert snapshot.find("class name", "sold-out").get_attribute("name") == "pear"
+    assert snapshot.find("xpath", "//li[@name='apple']").get_text() == "Apple"
+    assert snapshot.find("id", "quantity").get_value() == "3"
+    assert snapshot.find("id", "gift").is_selected()
+    assert not snapshot.find("class name", "sold-out").is_visible()
+    assert not snapshot.find("id", "buy").is_clickable()
+    assert not snapshot.is_present("id", "missing")
+    with pytest.raises(NoSuchElementException):
+        snapshot.find("id", "missing")
+    assert remote_end.get_total_commands() == 0
+
+
+def test_reads_elements_and_their_children(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    items = Element.by_id("items")
+    assert snapshot.get(items).get_tag_name() == "ul"
+    assert [item.get_attribute("name") for item in snapshot.get_all(items.child(css=".item"))] == ["apple", "pear"]
+    assert snapshot.get(items).find("css selector", ".sold-out").get_attribute("name") == "pear"
+
+
+def test_goes_stale_after_an_action(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    Element.by_id("quantity").send_keys("4")
+    assert snapshot.is_stale()
+    with pytest.raises(RuntimeError, match="stale"):
+        snapshot.find("id", "title")
+
+
+def test_rejects_elements_of_another_frame(remote_end, driver):
+    open_page(remote_end, node("iframe", "", node("span", "Framed", id="status"), id="frame"))
+    snapshot = Page().take_snapshot()
+    with pytest.raises(RuntimeError, match="another frame"):
+        snapshot.get(Element.by_id("status").in_frame(Element.by_id("frame")))
+
+
+def test_answers_xpath_queries(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    remote_end.reset_counts()
+    assert snapshot.find("xpath", "//li[text()='Apple']").get_attribute("name") == "apple"
+    assert snapshot.find("xpath", "//ul[@id='items']/li[last()]").get_attribute("name") == "pear"
+    assert snapshot.find("xpath", "//li[contains(@class, 'sold-out')]").get_attribute("name") == "pear"
+    assert snapshot.find("xpath", "//li[normalize-space(.)='Pear']/preceding-sibling::li").get_text() == "Apple"
+    assert snapshot.find("xpath", "//*[starts-with(@id, 'qua')]").get_value() == "3"
+    assert snapshot.find("xpath", "//li[@name='pear']/..").get_tag_name() == "ul"
+    assert snapshot.find("xpath", "/html/body/h1").get_text() == "Shop"
+    # In document order, like in the browser
+    union = snapshot.find_all("xpath", "//li[2] | //li[1]")
+    assert [item.get_attribute("name") for item in union] == ["apple", "pear"]
+    assert snapshot.find("xpath", "//input[not(@type)]").get_attribute("id") == "quantity"
+    assert not snapshot.is_present("xpath", "//li[3]")
+    assert remote_end.get_total_commands() == 0
+
+
+def test_reads_xpath_elements_and_their_children(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    items = Element.by_xpath("//ul[count(li) = 2]")
+    assert snapshot.get(items).get_attribute("id") == "items"
+    assert [item.get_text() for item in snapshot.get_all(items.child(xpath=".//li[contains(text(), 'ea')]"))] == [""]
+    assert snapshot.get(items).find("xpath", "./li[1]").get_text() == "Apple"
+
+
+def test_child_xpaths_are_not_compiled_into_css_that_matches_outside_the_parent(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    # ul > li from the list would match its own items, .//ul/li needs a list inside the list
+    assert Element.by_xpath("//ul/li").get_by_and_locator() == ("css selector", "ul > li")
+    nested = Element.by_id("items").child(xpath="//ul/li")
+    assert nested.get_by_and_locator() == ("xpath", ".//ul/li")
+    assert snapshot.get_all(nested) == []
+    assert snapshot.find("id", "items").find_all("xpath", "//ul/li") == []
+    # A single step is still compiled
+    pear = Element.by_id("items").child(xpath="//li[@name='pear']")
+    assert pear.get_by_and_locator() == ("css selector", 'li[name="pear"]')
+    assert snapshot.get(pear).get_attribute("class") == "item sold-out"
+
+
+def test_rejects_unsupported_xpaths(remote_end, driver):
+    open_shop(remote_end)
+    snapshot = Page().take_snapshot()
+    with pytest.raises(RuntimeError, match="not supported on a snapshot"):
+        snapshot.find("xpath", "//li[lang('en')]")
+    with pytest.raises(RuntimeError, match="does not select Elements"):
+        snapshot.find_all("xpath", "//li/@name")
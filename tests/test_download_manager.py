@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.webdriver.DownloadManager import DownloadManager
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+@pytest.fixture
+def download_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(DownloadManager, "_DownloadManager__BASE_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+# Like a Chromium driver, which the manager tells where to download
+@pytest.fixture
+def chromium_driver(driver, monkeypatch):
+    monkeypatch.setattr(driver, "execute_cdp_cmd", lambda command, arguments: {}, raising=False)
+    return driver
+
+
+def download(file_name: str) -> str:
+    expected = Page().expect_download()
+    with open(os.path.join(WebDriverSingleton.get_download_manager().get_directory(), file_name), "w") as file:
+        file.write("content")
+    return expected.wait(timeout=1)
+
+
+def test_per_session_directories_are_opt_in(download_dir, monkeypatch):
+    assert DownloadManager.create_session_directory() == str(download_dir)
+    monkeypatch.setattr(DownloadManager, "_DownloadManager__PER_SESSION", True)
+    session_directory = DownloadManager.create_session_directory()
+    assert os.path.dirname(session_directory) == str(download_dir)
+    assert os.path.basename(session_directory).startswith("session-")
+
+
+def test_closing_the_driver_removes_its_session_directory(remote_end, download_dir, chromium_driver, monkeypatch):
+    monkeypatch.setattr(DownloadManager, "_DownloadManager__PER_SESSION", True)
+    remote_end.add_page("http://test/page", "Page")
+    Page().open_page("http://test/page")
+    path = download("report.csv")
+    session_directory = os.path.dirname(path)
+    assert os.path.dirname(session_directory) == str(download_dir)
+    WebDriverSingleton.reset_session()
+    # The browser keeps downloading to the same directory after a reset
+    assert download("second.csv") == os.path.join(session_directory, "second.csv")
+    download_manager = WebDriverSingleton.get_download_manager()
+    WebDriverSingleton.release_driver_state(chromium_driver)
+    assert not os.path.exists(session_directory)
+    assert os.path.isdir(download_dir)
+    if download_manager.get_stats()["watcher"] == "inotify":
+        with pytest.raises(RuntimeError, match="closed"):
+            download_manager.wait_for(set(), timeout=0.1)
+
+
+def test_closing_the_driver_keeps_the_shared_directory(download_dir, chromium_driver):
+    path = download("report.csv")
+    assert os.path.dirname(path) == str(download_dir)
+    WebDriverSingleton.release_driver_state(chromium_driver)
+    assert os.path.isfile(path)
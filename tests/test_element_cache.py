@@ -0,0 +1,64 @@
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.ElementCache import ElementCache
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+def open_page(remote_end, url="http://test/page"):
+    remote_end.add_page(url, "Page", node("span", "Hello", id="greeting"), node("span", "World", id="other"))
+    Page().open_page(url)
+
+
+def test_elements_with_the_same_locator_share_one_lookup(remote_end, driver):
+    open_page(remote_end)
+    Element.by_id("greeting").get_text()
+    remote_end.reset_counts()
+    assert Element.by_id("greeting").get_text() == "Hello"
+    assert remote_end.get_counts()["findElement"] == 0
+    assert WebDriverSingleton.get_element_cache().get_stats()["hits"] >= 1
+
+
+def test_navigation_invalidates_the_cache(remote_end, driver):
+    open_page(remote_end)
+    Element.by_id("greeting").get_text()
+    open_page(remote_end, "http://test/other")
+    assert WebDriverSingleton.get_element_cache().get_stats()["size"] == 0
+    remote_end.reset_counts()
+    assert Element.by_id("greeting").get_text() == "Hello"
+    assert remote_end.get_counts()["findElement"] == 1
+
+
+def test_frame_switch_invalidates_the_cache(remote_end, driver):
+    remote_end.add_page("http://test/frames", "Frames", node("iframe", "", node("span", "Inner", id="inner"), id="f"))
+    Page().open_page("http://test/frames")
+    frame = Element.by_id("f")
+    frame.get_attribute("id")
+    assert WebDriverSingleton.get_element_cache().get_stats()["size"] == 1
+    frame.switch_frame()
+    assert WebDriverSingleton.get_element_cache().get_stats()["size"] == 0
+
+
+def test_evicts_the_least_recently_used_entry(remote_end, driver):
+    open_page(remote_end)
+    cache = ElementCache(driver, max_size=1)
+    greeting = driver.find_element("css selector", "#greeting")
+    other = driver.find_element("css selector", "#other")
+    cache.put("css selector", "#greeting", greeting)
+    cache.put("css selector", "#other", other)
+    assert cache.get("css selector", "#greeting") is None
+    assert cache.get("css selector", "#other") is other
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_discard_and_invalidate(remote_end, driver):
+    open_page(remote_end)
+    cache = ElementCache(driver)
+    greeting = driver.find_element("css selector", "#greeting")
+    cache.put("css selector", "#greeting", greeting)
+    cache.discard("css selector", "#greeting")
+    assert cache.get("css selector", "#greeting") is None
+    cache.put("css selector", "#greeting", greeting)
+    cache.invalidate()
+    assert cache.get("css selector", "#greeting") is None
+    assert cache.get_stats()["invalidations"] == 1
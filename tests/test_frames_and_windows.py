@@ -0,0 +1,91 @@
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def open_page_with_frame(remote_end):
+    open_page(remote_end, node("span", "Top", id="top"),
+              node("iframe", "", node("button", "Save", id="save"), node("li", "One", class_="item"),
+                   node("li", "Two", class_="item"), id="frame"),
+              node("li", "Top item", class_="item"))
+
+
+def test_leaves_the_frame_of_an_element_for_top_level_elements(remote_end, driver):
+    open_page_with_frame(remote_end)
+    Element.by_id("save").in_frame(Element.by_id("frame")).click()
+    assert Element.by_id("top").get_text() == "Top"
+    assert WebDriverSingleton.get_context_tracker().get_frame_path() == ()
+
+
+def test_only_switches_when_the_frame_changes(remote_end, driver):
+    open_page_with_frame(remote_end)
+    frame = Element.by_id("frame")
+    save = Element.by_id("save").in_frame(frame)
+    save.get_text()
+    remote_end.reset_counts()
+    save.get_text()
+    save.get_text()
+    assert remote_end.get_counts()["switchToFrame"] == 0
+    Element.by_id("top").get_text()
+    save.get_text()
+    # Back to the top-level document in one switch, then into the frame again
+    assert remote_end.get_counts()["switchToFrame"] == 2
+
+
+def test_collection_reads_enter_the_frame_every_time(remote_end, driver):
+    open_page_with_frame(remote_end)
+    items = Element.by_class_name("item").in_frame(Element.by_id("frame")).get_element_collection()
+    assert items.texts() == ["One", "Two"]
+    assert Element.by_id("top").get_text() == "Top"
+    assert items.texts() == ["One", "Two"]
+    assert Element.by_class_name("item").get_element_collection().texts() == ["Top item"]
+
+
+def test_elements_follow_a_frame_switched_to_by_hand(remote_end, driver):
+    open_page_with_frame(remote_end)
+    Element.by_id("frame").switch_frame()
+    assert Element.by_id("save").get_text() == "Save"
+    Page().switch_to_default_content()
+    assert Element.by_id("top").get_text() == "Top"
+
+
+def test_tracks_the_current_window(remote_end, driver):
+    open_page_with_frame(remote_end)
+    page = Page()
+    page.open_page_in_new_tab("http://test/page")
+    page.switch_to_last_window()
+    context_tracker = WebDriverSingleton.get_context_tracker()
+    assert context_tracker.get_current_window() == driver.current_window_handle
+    remote_end.reset_counts()
+    page.switch_to_last_window()
+    assert remote_end.get_counts()["switchToWindow"] == 0
+    page.switch_to_first_window()
+    assert context_tracker.get_current_window() == driver.window_handles[0]
+
+
+def test_snapshots_leave_out_frame_content(remote_end, driver):
+    open_page_with_frame(remote_end)
+    snapshot = Page().take_snapshot()
+    assert snapshot.is_present("id", "top")
+    assert not snapshot.is_present("id", "save")
+
+
+def test_sees_windows_the_page_opened_and_closed_by_itself(remote_end, driver):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    context_tracker = WebDriverSingleton.get_context_tracker()
+    first_window = context_tracker.get_current_window()
+    assert context_tracker.get_windows() == [first_window]
+    # Not through the wrapper, like a link with target=_blank
+    driver.execute_script("window.open('http://test/page');")
+    windows = context_tracker.get_windows()
+    assert len(windows) == 2 and windows[0] == first_window
+    Page().switch_to_last_window()
+    driver.close()
+    driver.switch_to.window(first_window)
+    assert context_tracker.get_windows() == [first_window]
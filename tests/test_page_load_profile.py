@@ -0,0 +1,71 @@
+import re
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.webdriver.PageLoadProfile import PageLoadProfile
+from src.selenium_wrapper.webdriver.WebDriverFactory import WebDriverFactory
+
+
+def record_cdp_commands(driver) -> list:
+    commands = []
+    driver.execute_cdp_cmd = lambda command, params: commands.append((command, params))
+    return commands
+
+
+def get_blocked_patterns(commands: list) -> list:
+    return [params["urls"] for command, params in commands if command == "Network.setBlockedURLs"][-1]
+
+
+# Like Network.setBlockedURLs, where * is the only wildcard
+def is_blocked(url: str, patterns: list) -> bool:
+    return any(re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) for pattern in patterns)
+
+
+def test_resource_patterns_match_urls_with_a_query(remote_end, driver):
+    commands = record_cdp_commands(driver)
+    PageLoadProfile("test", blocked_resource_types=("image", "stylesheet")).apply_to_driver(driver)
+    patterns = get_blocked_patterns(commands)
+    for url in ("http://test/logo.png", "http://test/logo.png?v=3", "http://test/site.css?v=1"):
+        assert is_blocked(url, patterns), url
+    assert not is_blocked("http://test/page", patterns)
+
+
+def test_resource_patterns_only_match_the_end_of_the_path(remote_end, driver):
+    commands = record_cdp_commands(driver)
+    PageLoadProfile("test", blocked_resource_types=("image", "media", "stylesheet")).apply_to_driver(driver)
+    patterns = get_blocked_patterns(commands)
+    for url in ("https://www.webmd.com/", "https://www.icons8.com/icons", "https://www.cssbattle.dev/?page=1",
+                "https://test/logo.png/details"):
+        assert not is_blocked(url, patterns), url
+
+
+def test_blocking_is_installed_in_every_window_switched_to(remote_end, driver, monkeypatch):
+    profile = PageLoadProfile("test", blocked_url_patterns=("*tracker*",))
+    monkeypatch.setattr(WebDriverFactory, "get_page_load_profile", staticmethod(lambda _: profile))
+    commands = record_cdp_commands(driver)
+    profile.apply_to_driver(driver)
+    remote_end.add_page("http://test/page", "Page", node("span", "Hello"))
+    page = Page()
+    page.open_page("http://test/page")
+    page.open_page_in_new_tab("http://test/page")
+    page.switch_to_last_window()
+    page.switch_to_first_window()
+    page.switch_to_last_window()
+    # Once at startup and once per window the wrapper switched to
+    assert [command for command, _ in commands].count("Network.setBlockedURLs") == 3
+
+
+def test_averages_browser_timings(remote_end, driver, monkeypatch):
+    monkeypatch.setattr(PageLoadProfile, "_PageLoadProfile__COLLECT_BROWSER_TIMINGS", True)
+    timings = iter([{"domContentLoaded": 100.0, "load": 200.0, "resources": 4},
+                    {"domContentLoaded": 300.0, "load": 400.0, "resources": 6}])
+    monkeypatch.setattr(driver, "execute_script", lambda script: next(timings))
+    profile = PageLoadProfile("test")
+    profile.record_navigation(driver, "http://test/first", 0.5)
+    profile.record_navigation(driver, "http://test/second", 1.5)
+    load_timings = profile.get_load_timings()
+    assert load_timings["navigations"] == 2
+    assert load_timings["average_seconds"] == 1.0
+    assert load_timings["average_dom_content_loaded_ms"] == 200.0
+    assert load_timings["average_load_event_ms"] == 300.0
+    assert load_timings["average_resources"] == 5
@@ -0,0 +1,31 @@
+import os
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def test_make_screenshot_returns_once_written(remote_end, driver, tmp_path):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    assert Page().make_screenshot(str(tmp_path / "page.png")) is True
+    assert os.path.getsize(tmp_path / "page.png") > 0
+    assert Element.by_id("greeting").make_screenshot(str(tmp_path / "greeting.png")) is True
+    assert os.path.getsize(tmp_path / "greeting.png") > 0
+
+
+def test_make_screenshot_returns_false_when_it_cannot_write(remote_end, driver, tmp_path):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    (tmp_path / "file").write_text("")
+    assert Page().make_screenshot(str(tmp_path / "file" / "page.png")) is False
+
+
+def test_make_screenshot_async_writes_in_the_background(remote_end, driver, tmp_path):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    future = Page().make_screenshot_async(str(tmp_path / "page.png"))
+    assert future.result(timeout=5) == str(tmp_path / "page.png")
+    assert os.path.exists(tmp_path / "page.png")
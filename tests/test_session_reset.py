@@ -0,0 +1,58 @@
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.SessionReset import get_origin
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+
+
+def record_navigations(driver, monkeypatch) -> list:
+    navigations = []
+    get = driver.get
+    monkeypatch.setattr(driver, "get", lambda url: (navigations.append(url), get(url))[1])
+    return navigations
+
+
+def test_clears_every_visited_origin(remote_end, driver, monkeypatch):
+    remote_end.add_page("http://first.test/page", "First", node("span", "First", id="first"))
+    remote_end.add_page("http://second.test/page", "Second", node("span", "Second", id="second"))
+    page = Page()
+    page.open_page("http://first.test/page")
+    page.open_page("http://second.test/page")
+    navigations = record_navigations(driver, monkeypatch)
+    remote_end.reset_counts()
+    WebDriverSingleton.reset_session()
+    # The current origin is cleared in place, the other one from a page of its own
+    assert navigations == ["http://first.test/", "about:blank"]
+    counts = remote_end.get_counts()
+    assert counts["w3cExecuteScriptAsync"] == 2
+    assert counts["deleteAllCookies"] == 2
+    assert driver.current_url == "about:blank"
+
+
+def test_closes_other_windows_and_clears_their_origins(remote_end, driver, monkeypatch):
+    remote_end.add_page("http://first.test/page", "First")
+    remote_end.add_page("http://tab.test/page", "Tab")
+    page = Page()
+    page.open_page("http://first.test/page")
+    page.open_page_in_new_tab("http://tab.test/page")
+    navigations = record_navigations(driver, monkeypatch)
+    WebDriverSingleton.reset_session()
+    assert len(driver.window_handles) == 1
+    assert navigations == ["http://tab.test/", "about:blank"]
+
+
+def test_releases_held_input(remote_end, driver):
+    remote_end.add_page("http://first.test/page", "First", node("button", "Drag", id="handle"))
+    Page().open_page("http://first.test/page")
+    Element.by_id("handle").mouse_down()
+    remote_end.reset_counts()
+    WebDriverSingleton.reset_session()
+    assert remote_end.get_counts()["clearActionState"] == 1
+    # The queued step was dropped together with the rest of the driver state
+    assert WebDriverSingleton.get_action_batch().get_pending_steps() == ()
+
+
+def test_get_origin():
+    assert get_origin("https://example.com:8443/a?b#c") == "https://example.com:8443"
+    assert get_origin("about:blank") is None
+    assert get_origin(None) is None
@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+from selenium import webdriver
+from selenium.common import SessionNotCreatedException
+
+from src.selenium_wrapper.webdriver.WebDriverFactory import DriverBinaryCache, WebDriverFactory
+
+STALE_DRIVER = "/drivers/chromedriver-old"
+CURRENT_DRIVER = "/drivers/chromedriver-new"
+
+
+class FakeService:
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def start(self):
+        pass
+
+
+class FakeCommandExecutor:
+
+    def execute(self, command, params):
+        return {"value": None}
+
+
+class FakeDriver:
+    started_with = []
+
+    def __init__(self, service: FakeService, options):
+        FakeDriver.started_with.append(service.path)
+        if service.path == STALE_DRIVER:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 1")
+        self.command_executor = FakeCommandExecutor()
+
+
+class FakeDriverManager:
+    installs = 0
+
+    def install(self) -> str:
+        FakeDriverManager.installs += 1
+        return CURRENT_DRIVER
+
+
+@pytest.fixture
+def driver_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("DRIVER_PATH", raising=False)
+    monkeypatch.delenv("DRIVER_OFFLINE", raising=False)
+    monkeypatch.setattr(DriverBinaryCache, "_DriverBinaryCache__CACHE_FILE", str(tmp_path / "drivers.json"))
+    monkeypatch.setattr(DriverBinaryCache, "_DriverBinaryCache__MANAGERS", {"chrome": FakeDriverManager})
+    monkeypatch.setattr(DriverBinaryCache, "_DriverBinaryCache__entries",
+                        {"chrome": {"path": STALE_DRIVER, "version": "1.0", "resolved_at": time.time()}})
+    monkeypatch.setattr(DriverBinaryCache, "_DriverBinaryCache__served_from_cache", set())
+    monkeypatch.setattr(os, "access", lambda path, mode: True)
+    monkeypatch.setattr(WebDriverFactory, "_WebDriverFactory__get_browser",
+                        staticmethod(lambda: ("chrome", FakeDriver, FakeService, webdriver.ChromeOptions())))
+    FakeDriver.started_with = []
+    FakeDriverManager.installs = 0
+
+
+def test_resolves_again_when_the_cached_driver_is_outdated(driver_cache):
+    driver = WebDriverFactory.get_web_driver()
+    assert isinstance(driver, FakeDriver)
+    assert FakeDriver.started_with == [STALE_DRIVER, CURRENT_DRIVER]
+    assert FakeDriverManager.installs == 1
+    assert DriverBinaryCache.resolve("chrome") == CURRENT_DRIVER
+
+
+def test_does_not_resolve_a_fresh_driver_again(driver_cache):
+    assert DriverBinaryCache.resolve("chrome") == STALE_DRIVER
+    assert DriverBinaryCache.invalidate("chrome")
+    assert DriverBinaryCache.resolve("chrome") == CURRENT_DRIVER
+    # Just resolved: a session that fails with it fails for another reason
+    assert not DriverBinaryCache.invalidate("chrome")
+
+
+def test_keeps_the_cache_offline(driver_cache, monkeypatch):
+    monkeypatch.setenv("DRIVER_OFFLINE", "true")
+    with pytest.raises(SessionNotCreatedException):
+        WebDriverFactory.get_web_driver()
+    assert FakeDriverManager.installs == 0
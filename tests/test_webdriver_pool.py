@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+from src.selenium_wrapper.webdriver.WebDriverPool import WebDriverPool
+from src.selenium_wrapper.webdriver.WebDriverSingleton import WebDriverSingleton
+from tests.conftest import quit_driver, start_driver
+
+
+@pytest.fixture
+def pool(remote_end):
+    remote_end.add_page("http://test/page", "Page", node("span", "Hello", id="greeting"))
+    pool = WebDriverPool(size=2, driver_factory=lambda: start_driver(remote_end))
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def shared_driver(remote_end):
+    WebDriverSingleton.driver = start_driver(remote_end)
+    yield WebDriverSingleton.driver
+    quit_driver(WebDriverSingleton.driver)
+    WebDriverSingleton.driver = None
+
+
+def test_binds_the_checked_out_driver(pool, shared_driver):
+    with pool.driver() as driver:
+        assert WebDriverSingleton.get_driver() is driver
+    assert WebDriverSingleton.get_driver() is shared_driver
+    assert pool.get_metrics()["idle"] == 1
+
+
+def test_workers_use_their_own_drivers(pool):
+    greeting = Element.by_id("greeting")
+    seen = []
+
+    def work():
+        with pool.driver() as driver:
+            Page().open_page("http://test/page")
+            assert greeting.get_text() == "Hello"
+            seen.append(driver)
+
+    workers = [threading.Thread(target=work) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(seen) == 2 and seen[0] is not seen[1]
+
+
+def test_closed_driver_is_replaced_from_the_pool(pool, shared_driver):
+    with pool.driver() as driver:
+        Page.close_browser()
+        replacement = WebDriverSingleton.get_driver()
+        assert replacement is not shared_driver
+        assert replacement is not driver
+        Page().open_page("http://test/page")
+        assert Element.by_id("greeting").get_text() == "Hello"
+    metrics = pool.get_metrics()
+    assert metrics["idle"] == 1 and metrics["in_use"] == 0 and metrics["live"] == 1
+
+
+def test_closed_driver_without_replacement_raises(remote_end, shared_driver):
+    token = WebDriverSingleton.bind_driver(start_driver(remote_end))
+    try:
+        WebDriverSingleton.close_driver()
+        with pytest.raises(RuntimeError):
+            WebDriverSingleton.get_driver()
+    finally:
+        WebDriverSingleton.unbind_driver(token)
+    assert WebDriverSingleton.get_driver() is shared_driver
+
+
+def test_reset_after_closing_the_bound_driver_leaves_the_shared_one(remote_end, shared_driver):
+    token = WebDriverSingleton.bind_driver(start_driver(remote_end))
+    try:
+        WebDriverSingleton.close_driver()
+        remote_end.reset_counts()
+        WebDriverSingleton.reset_session()
+        assert remote_end.get_total_commands() == 0
+    finally:
+        WebDriverSingleton.unbind_driver(token)
@@ -0,0 +1,72 @@
+import time
+
+from benchmarks.FakeRemoteEnd import node
+from src.selenium_wrapper.Page import Page
+from src.selenium_wrapper.element.Element import Element
+
+
+def open_page(remote_end, *body):
+    remote_end.add_page("http://test/page", "Page", *body)
+    Page().open_page("http://test/page")
+
+
+def test_reuses_the_located_web_element(remote_end, driver):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    greeting = Element.by_id("greeting")
+    remote_end.reset_counts()
+    assert greeting.get_text() == "Hello"
+    assert greeting.get_text() == "Hello"
+    assert greeting.get_attribute("id") == "greeting"
+    assert remote_end.get_counts()["findElement"] == 1
+    assert greeting.get_saved_round_trips() >= 2
+
+
+def test_locates_a_stale_element_again(remote_end, driver):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    greeting = Element.by_id("greeting")
+    assert greeting.get_text() == "Hello"
+    # Reloads the document behind the wrapper's back, so the cached handle goes stale
+    driver.refresh()
+    assert greeting.get_text() == "Hello"
+
+
+def test_is_present_does_not_wait(remote_end, driver):
+    open_page(remote_end, node("span", "Hello", id="greeting"))
+    assert Element.by_id("greeting").is_present()
+    assert not Element.by_id("missing").is_present()
+
+
+def test_clicks_until_the_outcome_the_given_number_of_times(remote_end, driver):
+    open_page(remote_end, node("button", "Show", id="show"), node("span", "Hidden", id="hidden", displayed=False))
+    remote_end.reset_counts()
+    # The backoff between attempts must not use up the attempts, even without any time for the outcome
+    assert not Element.by_id("show").click_until_other_element_is_visible(Element.by_id("hidden"), 0, 3)
+    assert remote_end.get_counts()["actions"] == 3
+    assert Element.by_id("show").click_until_other_element_is_invisible(Element.by_id("hidden"), 0.1, 3)
+
+
+def test_slow_clicks_do_not_use_up_the_attempts(remote_end, driver):
+    open_page(remote_end, node("button", "Show", id="show"), node("span", "Hidden", id="hidden", displayed=False))
+    remote_end.reset_counts()
+    remote_end.command_latencies["actions"] = 0.2
+    assert not Element.by_id("show").click_until_other_element_is_visible(Element.by_id("hidden"), 0, 3)
+    assert remote_end.get_counts()["actions"] == 3
+
+
+def test_clicking_until_the_outcome_has_a_deadline(remote_end, driver):
+    open_page(remote_end, node("button", "Show", id="show"), node("span", "Hidden", id="hidden", displayed=False))
+    started_at = time.monotonic()
+    assert not Element.by_id("show").click_until_other_element_is_visible(Element.by_id("hidden"), 0.2, 3)
+    # 3 attempts of 0.2 seconds, at most 0.15 and 0.3 seconds of backoff between them and a few round trips
+    assert time.monotonic() - started_at < 0.2 * 3 + 0.45 + 0.2
+
+
+def test_slices_a_collection_into_a_list_of_elements(remote_end, driver):
+    open_page(remote_end, node("ul", "", *(node("li", text, class_="item") for text in ("A", "B", "C"))))
+    items = Element.by_class_name("item").get_element_collection()
+    remote_end.reset_counts()
+    assert [item.get_text() for item in items[1:3]] == ["B", "C"]
+    assert [item.get_text() for item in items[::-2]] == ["C", "A"]
+    assert items[5:] == []
+    assert items[-1].get_text() == "C"
+    assert remote_end.get_counts()["findElements"] == 1